@@ -0,0 +1,331 @@
+import json
+import math
+import os
+import tempfile
+import time
+from array import array
+from collections import deque
+
+import numpy as np
+import snap
+
+from connectivity import UnionFind
+from graph import RandomGraph
+from traversal import bfs_events, dfs_events, Discover
+
+DEFAULT_CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend_calibration.json')
+
+
+def canonical_labels(labels) -> np.ndarray:
+    """
+    Renumber component labels by first appearance, so that equal partitions get equal label arrays whatever
+    numbering the backend used.
+
+    Parameters:
+    - labels (array-like): Any per-vertex component labels.
+
+    Returns:
+    - np.ndarray: Labels 0..n_components-1, component 0 holding vertex 0, the next new component the next vertex...
+    """
+    _, first, inverse = np.unique(np.asarray(labels), return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first, kind='stable')] = np.arange(len(first))
+    return rank[inverse.reshape(-1)]
+
+
+class TraversalBackend:
+    """
+    Base class of the traversal implementations. Every backend answers the same queries on a RandomGraph with the
+    same result types, so callers (and the dispatcher) can swap them freely:
+
+    - bfs(random_graph, source) -> (parent, distance) int32 arrays, -1 for the root's parent and unreached vertices.
+    - dfs(random_graph, source) -> (parent, order): int32 parent array, and the reached vertices in preorder.
+    - components(random_graph) -> weakly connected component labels, numbered as canonical_labels does.
+
+    Parents of equal-length paths, and DFS orders, may differ between backends; distances and labels may not.
+
+    Attributes:
+    - name (str): Key of the backend in BACKENDS and in calibration files.
+    - operations (tuple): The queries the backend implements.
+    """
+    name = ''
+    operations = ('bfs', 'dfs', 'components')
+
+    def is_available(self) -> bool:
+        return True
+
+    def supports(self, operation) -> bool:
+        return operation in self.operations and self.is_available()
+
+    def run(self, operation, random_graph, *args):
+        if not self.supports(operation):
+            raise ValueError("Backend {!r} does not support {!r}".format(self.name, operation))
+        return getattr(self, operation)(random_graph, *args)
+
+    def __repr__(self):
+        return "{}(name={!r})".format(type(self).__name__, self.name)
+
+
+class PythonBackend(TraversalBackend):
+    """
+    The event-driven traversals of traversal.py over the adjacency lists: no per-level overhead, best for small graphs.
+    """
+    name = 'python'
+
+    @staticmethod
+    def _tree(events, n_nodes):
+        parent = np.full(n_nodes, -1, dtype=np.int32)
+        distance = np.full(n_nodes, -1, dtype=np.int32)
+        order = []
+        for event in events:
+            if isinstance(event, Discover):
+                parent[event.vertex] = event.parent
+                distance[event.vertex] = event.level
+                order.append(event.vertex)
+        return parent, distance, order
+
+    def bfs(self, random_graph, source):
+        parent, distance, _ = self._tree(bfs_events(random_graph.get_adjacency_list, source, random_graph.is_directed), random_graph.n_nodes)
+        return parent, distance
+
+    def dfs(self, random_graph, source):
+        parent, _, order = self._tree(dfs_events(random_graph.get_adjacency_list, source, random_graph.is_directed), random_graph.n_nodes)
+        return parent, np.array(order, dtype=np.int64)
+
+    def components(self, random_graph):
+        adjacency_list = random_graph.get_adjacency_list
+        reverse_adjacency_list = random_graph.get_reverse_adjacency_list if random_graph.is_directed else None
+        labels = [-1] * random_graph.n_nodes
+        for root in range(random_graph.n_nodes):
+            if labels[root] != -1:
+                continue
+            labels[root] = root
+            queue = deque([root])
+            while queue:
+                v = queue.popleft()
+                neighbours = adjacency_list[v] if reverse_adjacency_list is None else adjacency_list[v] + reverse_adjacency_list[v]
+                for adj_n in neighbours:
+                    if labels[adj_n] == -1:
+                        labels[adj_n] = root
+                        queue.append(adj_n)
+        return canonical_labels(labels)
+
+
+class NumpyBackend(TraversalBackend):
+    """
+    Vectorized traversals over the CSR: one numpy step per BFS level and bulk union-find for components. Per-level
+    overhead makes it slower on tiny graphs and much faster on large ones.
+    """
+    name = 'numpy'
+
+    def bfs(self, random_graph, source):
+        return random_graph.get_csr.bfs_tree(source)
+
+    def dfs(self, random_graph, source):
+        # DFS is inherently sequential: an explicit stack over the CSR arrays, with the next arc to scan kept per
+        # vertex, in compact typed arrays read through memoryviews
+        csr = random_graph.get_csr
+        indptr = np.ascontiguousarray(csr.indptr, dtype=np.int64)
+        next_arc = array('q', indptr[:csr.n_nodes].tobytes())
+        indptr = memoryview(indptr)
+        indices = memoryview(np.ascontiguousarray(csr.indices, dtype=np.int64))
+        parent = array('i', [-1]) * csr.n_nodes
+        discovered = bytearray(csr.n_nodes)
+        discovered[source] = 1
+        order = [source]
+        stack = [source]
+        while stack:
+            v = stack[-1]
+            arc = next_arc[v]
+            if arc < indptr[v + 1]:
+                next_arc[v] = arc + 1
+                w = indices[arc]
+                if not discovered[w]:
+                    discovered[w] = 1
+                    parent[w] = v
+                    order.append(w)
+                    stack.append(w)
+            else:
+                stack.pop()
+        return np.frombuffer(parent, dtype=np.int32).copy(), np.array(order, dtype=np.int64)
+
+    def components(self, random_graph):
+        components = UnionFind(random_graph.n_nodes)
+        components.union_edges(random_graph.get_edge_array)
+        return canonical_labels(components.labels())
+
+
+class SnapBackend(TraversalBackend):
+    """
+    Snap.py's native C++ routines: GetBfsTree and GetShortPathAll for BFS, GetWccs for components. Snap.py has no
+    DFS tree routine.
+    """
+    name = 'snap'
+    operations = ('bfs', 'components')
+
+    def is_available(self) -> bool:
+        return hasattr(snap.TUNGraph, 'GetBfsTree') and hasattr(snap.TUNGraph, 'GetWccs')
+
+    def bfs(self, random_graph, source):
+        graph = random_graph.graph
+        parent = np.full(random_graph.n_nodes, -1, dtype=np.int32)
+        distance = np.full(random_graph.n_nodes, -1, dtype=np.int32)
+        for edge in graph.GetBfsTree(source, True, False).Edges():
+            parent[edge.GetDstNId()] = edge.GetSrcNId()
+        _, distances = graph.GetShortPathAll(source, random_graph.is_directed)
+        for node in distances:
+            distance[node] = distances[node]
+        return parent, distance
+
+    def components(self, random_graph):
+        labels = np.full(random_graph.n_nodes, -1, dtype=np.int64)
+        for label, component in enumerate(random_graph.graph.GetWccs()):
+            labels[list(component)] = label
+        return canonical_labels(labels)
+
+
+BACKENDS = {backend.name: backend for backend in (PythonBackend(), NumpyBackend(), SnapBackend())}
+
+
+def get_backend(name) -> TraversalBackend:
+    """
+    Returns:
+    - TraversalBackend: The backend registered under name: 'python', 'numpy' or 'snap'.
+    """
+    if name not in BACKENDS:
+        raise ValueError("Unknown backend {!r}. Use one of {}".format(name, sorted(BACKENDS)))
+    return BACKENDS[name]
+
+
+class BackendDispatcher:
+    """
+    Picks the fastest backend for a query on a given graph, from timings measured on this machine.
+
+    Calibration times every available backend on random graphs of several sizes and stores the timings as JSON.
+    A query then goes to the backend that was fastest on the calibration graph nearest to the queried one, in
+    (log nodes, log average degree) space. Without calibration data, graphs of at least default_threshold vertices
+    go to the numpy backend and smaller ones to the python backend.
+
+    It serves whole-graph queries from scripts and benchmarks. Graph3D keeps using the event generators, since it
+    animates every step of its traversals and needs the events rather than just the final arrays.
+
+    Parameters:
+    - path (str): Calibration file, loaded if it exists.
+    - default_threshold (int): Vertex count from which the numpy backend is preferred without calibration data.
+
+    Example Usage:
+    ```python
+    dispatcher = BackendDispatcher()
+    if not dispatcher.timings:
+        dispatcher.calibrate()
+    parent, distance = dispatcher.run('bfs', random_graph, 0)
+    print(dispatcher.select('bfs', random_graph.n_nodes, random_graph.n_edges))
+    ```
+
+    Attributes:
+    - timings (list): Calibration records, dicts with operation, backend, n_nodes, n_edges, is_directed, seconds.
+    """
+
+    def __init__(self, path=DEFAULT_CALIBRATION_PATH, default_threshold=2000):
+        self.path = path
+        self.default_threshold = default_threshold
+        self.timings = []
+        if path is not None and os.path.exists(path):
+            with open(path) as calibration_file:
+                self.timings = json.load(calibration_file)['timings']
+
+    def calibrate(self, sizes=((100, 300), (1000, 3000), (10000, 30000), (100000, 300000)), is_directed=False, repeats=3, save=True):
+        """
+        Time every available backend on every query for random graphs of the given sizes, replacing earlier timings
+        of the same sizes and direction.
+
+        Parameters:
+        - sizes (iterable): (n_nodes, n_edges) pairs.
+        - is_directed (bool): Direction of the calibration graphs.
+        - repeats (int): Runs per measurement; the fastest one is kept.
+        - save (bool): True to write the timings to the calibration file.
+
+        Returns:
+        - list: The new calibration records.
+        """
+        records = []
+        for n_nodes, n_edges in sizes:
+            random_graph = RandomGraph(n_nodes, n_edges, is_directed=is_directed)
+            # Build every representation up front: they are cached by the graph and shared by all later queries
+            representations = ('adjacency_list', 'csr', 'edge_array') + (('reverse_adjacency_list',) if is_directed else ())
+            for representation in representations:
+                getattr(random_graph, 'get_' + representation)
+            for operation, args in (('bfs', (0,)), ('dfs', (0,)), ('components', ())):
+                for backend in BACKENDS.values():
+                    if not backend.supports(operation):
+                        continue
+                    best = math.inf
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        backend.run(operation, random_graph, *args)
+                        best = min(best, time.perf_counter() - start)
+                    records.append({'operation': operation, 'backend': backend.name, 'n_nodes': n_nodes,
+                                    'n_edges': n_edges, 'is_directed': is_directed, 'seconds': best})
+        measured = {(record['n_nodes'], record['n_edges'], record['is_directed']) for record in records}
+        self.timings = [record for record in self.timings
+                        if (record['n_nodes'], record['n_edges'], record['is_directed']) not in measured] + records
+        if save and self.path is not None:
+            self.save()
+        return records
+
+    def save(self, path=None):
+        """
+        Write the timings to the calibration file, atomically so that a crash never leaves a truncated file.
+        """
+        path = path or self.path
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as calibration_file:
+                json.dump({'timings': self.timings}, calibration_file, indent=1)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @staticmethod
+    def _position(n_nodes, n_edges):
+        return math.log(max(n_nodes, 1)), math.log(max(n_edges, 1) / max(n_nodes, 1) + 1)
+
+    def select(self, operation, n_nodes, n_edges, is_directed=False) -> TraversalBackend:
+        """
+        Parameters:
+        - operation (str): 'bfs', 'dfs' or 'components'.
+        - n_nodes (int): Size of the graph to query.
+        - n_edges (int): Number of edges of the graph to query.
+        - is_directed (bool): Direction of the graph; timings of the other direction are used if there are none.
+
+        Returns:
+        - TraversalBackend: The backend expected to answer fastest.
+        """
+        records = [record for record in self.timings
+                   if record['operation'] == operation and get_backend(record['backend']).supports(operation)]
+        records = [record for record in records if record['is_directed'] == is_directed] or records
+        if not records:
+            fallback = get_backend('numpy' if n_nodes >= self.default_threshold else 'python')
+            return fallback if fallback.supports(operation) else get_backend('python')
+        x, y = self._position(n_nodes, n_edges)
+        nearest = min(records, key=lambda record: math.dist((x, y), self._position(record['n_nodes'], record['n_edges'])))
+        candidates = [record for record in records
+                      if (record['n_nodes'], record['n_edges']) == (nearest['n_nodes'], nearest['n_edges'])]
+        return get_backend(min(candidates, key=lambda record: record['seconds'])['backend'])
+
+    def run(self, operation, random_graph, *args):
+        """
+        Answer a query with the backend selected for the graph.
+
+        Parameters:
+        - operation (str): 'bfs', 'dfs' or 'components'.
+        - random_graph (RandomGraph): The graph.
+        - args: Arguments of the query, e.g. the source vertex.
+
+        Returns:
+        - The result of the backend's query method.
+        """
+        backend = self.select(operation, random_graph.n_nodes, random_graph.n_edges, random_graph.is_directed)
+        return backend.run(operation, random_graph, *args)
@@ -0,0 +1,150 @@
+import numpy as np
+
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+class Bitset:
+    """
+    A packed set of integers in 0..size-1, one bit per element, for traversal state such as visited, discovered
+    or processed vertices.
+
+    Bits live in a bytearray, so scalar operations from pure-Python loops stay cheap, and a numpy view of the same
+    buffer serves the vectorized bulk operations. 100M vertices take 12.5 MB per set.
+
+    Parameters:
+    - size (int): Number of representable elements.
+
+    Example Usage:
+    ```python
+    visited = Bitset(random_graph.n_nodes)
+    if not visited.test_and_set(node):
+        ...  # first visit
+    visited.set_many(frontier)
+    print(visited.count())
+    ```
+    """
+    __slots__ = ('size', 'data', 'bits')
+
+    def __init__(self, size=0):
+        self.size = size
+        self.data = bytearray((size + 7) // 8)
+        self.bits = np.frombuffer(self.data, dtype=np.uint8)
+
+    @classmethod
+    def from_indices(cls, size, indices):
+        """
+        Build a bitset with the given elements set.
+
+        Parameters:
+        - size (int): Number of representable elements.
+        - indices (array-like): Elements to set.
+
+        Returns:
+        - Bitset: The new set.
+        """
+        bitset = cls(size)
+        bitset.set_many(indices)
+        return bitset
+
+    def __len__(self):
+        return self.size
+
+    def __reduce__(self):
+        # The numpy view must be rebuilt on top of the unpickled buffer rather than copied next to it
+        return (_bitset_from_bytes, (self.size, bytes(self.data)))
+
+    def __contains__(self, index):
+        return self.test(index)
+
+    def __repr__(self):
+        return "Bitset(size={}, count={})".format(self.size, self.count())
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    def test(self, index) -> bool:
+        """
+        Returns:
+        - bool: True if index is in the set.
+        """
+        return bool(self.data[index >> 3] & (1 << (index & 7)))
+
+    def set(self, index):
+        self.data[index >> 3] |= 1 << (index & 7)
+
+    def clear(self, index):
+        self.data[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def test_and_set(self, index) -> bool:
+        """
+        Add an element and tell whether it was already there, in a single lookup.
+
+        Parameters:
+        - index (int): The element.
+
+        Returns:
+        - bool: True if index was already in the set.
+        """
+        byte, mask = index >> 3, 1 << (index & 7)
+        value = self.data[byte]
+        if value & mask:
+            return True
+        self.data[byte] = value | mask
+        return False
+
+    def test_many(self, indices) -> np.ndarray:
+        """
+        Parameters:
+        - indices (array-like): Elements to test.
+
+        Returns:
+        - np.ndarray: A boolean array, True where the element is in the set.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        return (self.bits[indices >> 3] >> (indices & 7).astype(np.uint8)) & 1 == 1
+
+    def set_many(self, indices):
+        """
+        Add every element of an index array (duplicates allowed).
+
+        Parameters:
+        - indices (array-like): Elements to add.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        np.bitwise_or.at(self.bits, indices >> 3, (1 << (indices & 7)).astype(np.uint8))
+
+    def clear_many(self, indices):
+        """
+        Remove every element of an index array (duplicates allowed).
+
+        Parameters:
+        - indices (array-like): Elements to remove.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        np.bitwise_and.at(self.bits, indices >> 3, ~(1 << (indices & 7)).astype(np.uint8))
+
+    def clear_all(self):
+        self.bits[:] = 0
+
+    def count(self) -> int:
+        """
+        Returns:
+        - int: Number of elements in the set (population count).
+        """
+        bitwise_count = getattr(np, 'bitwise_count', None)
+        counts = bitwise_count(self.bits) if bitwise_count is not None else _POPCOUNT[self.bits]
+        return int(counts.sum(dtype=np.int64))
+
+    def nonzero(self) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: The elements in the set, in increasing order.
+        """
+        return np.flatnonzero(np.unpackbits(self.bits, bitorder='little')[:self.size])
+
+
+def _bitset_from_bytes(size, data):
+    bitset = Bitset(size)
+    bitset.data[:] = data
+    return bitset
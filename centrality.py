@@ -0,0 +1,281 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from checkpoint import atomic_dump, load_checkpoint
+from csr import CSRGraph
+
+
+class BetweennessResult:
+    """
+    Betweenness centrality of every vertex, exact or estimated from a sample of BFS sources.
+
+    Scores follow the usual unnormalized convention: the sum over pairs (s, t) of the fraction of shortest s-t paths
+    through the vertex, each unordered pair counted once in undirected graphs.
+
+    Attributes:
+    - scores (np.ndarray): Betweenness of every vertex, scaled up from the sample when estimated.
+    - n_sources (int): Number of BFS sources accumulated.
+    - is_exact (bool): True if every vertex was a source.
+    - epsilon (float): Additive error bound on the normalized scores, 0 when exact.
+    - delta (float): Probability that some normalized score falls outside the error bound.
+    - is_directed (bool): Direction of the graph, which sets the normalization.
+    """
+    __slots__ = ('scores', 'n_sources', 'is_exact', 'epsilon', 'delta', 'is_directed')
+
+    def __init__(self, scores, n_sources, is_directed, epsilon=0.0, delta=0.0):
+        self.scores = scores
+        self.n_sources = n_sources
+        self.is_directed = is_directed
+        self.is_exact = n_sources == len(scores)
+        self.epsilon = 0.0 if self.is_exact else epsilon
+        self.delta = 0.0 if self.is_exact else delta
+
+    def __repr__(self):
+        return "BetweennessResult(sources={}/{}, epsilon={:.4f}, delta={})".format(
+            self.n_sources, len(self.scores), self.epsilon, self.delta)
+
+    @property
+    def normalized(self) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: The scores divided by the number of pairs that can pass through a vertex, in [0, 1].
+        """
+        n_nodes = len(self.scores)
+        if n_nodes < 3:
+            return np.zeros(n_nodes)
+        pairs = (n_nodes - 1) * (n_nodes - 2) / (1 if self.is_directed else 2)
+        return self.scores / pairs
+
+    def top_k(self, k):
+        """
+        Parameters:
+        - k (int): Number of vertices.
+
+        Returns:
+        - tuple: (vertices, scores) of the k most central vertices, in decreasing order of score.
+        """
+        k = min(k, len(self.scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        candidates = np.argpartition(-self.scores, k - 1)[:k]
+        vertices = candidates[np.lexsort((candidates, -self.scores[candidates]))]
+        return vertices, self.scores[vertices]
+
+
+def _dependencies(csr, source):
+    # Brandes on one BFS: count shortest paths level by level, keeping the arcs of the shortest-path DAG, then
+    # push dependencies back up from the deepest level. Both passes are vectorized per level
+    distance = np.full(csr.n_nodes, -1, dtype=np.int64)
+    sigma = np.zeros(csr.n_nodes)
+    distance[source] = 0
+    sigma[source] = 1.0
+    frontier = np.array([source], dtype=np.int64)
+    dag = []
+    level = 0
+    while frontier.size > 0:
+        sources, targets = csr.gather(frontier)
+        unseen = distance[targets] == -1
+        distance[targets[unseen]] = level + 1
+        on_path = distance[targets] == level + 1
+        sources, targets = sources[on_path], targets[on_path]
+        np.add.at(sigma, targets, sigma[sources])
+        dag.append((sources, targets))
+        frontier = np.unique(targets)
+        level += 1
+    delta = np.zeros(csr.n_nodes)
+    for sources, targets in reversed(dag):
+        np.add.at(delta, sources, sigma[sources] / sigma[targets] * (1.0 + delta[targets]))
+    delta[source] = 0.0
+    return delta
+
+
+def _accumulate(csr, sources):
+    # Sum and sum of squares of the per-source dependencies, the latter for the variance-based error bound
+    total = np.zeros(csr.n_nodes)
+    squares = np.zeros(csr.n_nodes)
+    for source in sources:
+        delta = _dependencies(csr, int(source))
+        total += delta
+        squares += delta * delta
+    return total, squares
+
+
+def _init_worker(indptr, indices, is_directed):
+    global _worker_csr
+    _worker_csr = CSRGraph(indptr, indices, is_directed)
+
+
+def _accumulate_in_worker(sources):
+    return _accumulate(_worker_csr, sources)
+
+
+class _Accumulator:
+    # Runs batches of sources in this process or in a process pool, and keeps the running sums
+    def __init__(self, csr, n_workers):
+        self.csr = csr
+        self.n_workers = n_workers
+        self.total = np.zeros(csr.n_nodes)
+        self.squares = np.zeros(csr.n_nodes)
+        self.count = 0
+        self.pool = None
+        if n_workers > 1:
+            self.pool = ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=(csr.indptr, csr.indices, csr.is_directed))
+
+    def add(self, sources):
+        if self.pool is None or len(sources) < 2:
+            results = [_accumulate(self.csr, sources)]
+        else:
+            results = self.pool.map(_accumulate_in_worker, np.array_split(sources, min(self.n_workers, len(sources))))
+        for total, squares in results:
+            self.total += total
+            self.squares += squares
+        self.count += len(sources)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def _hoeffding(n_nodes, n_sources, delta):
+    # Error bound on the mean of n_sources [0, 1] samples, for all n_nodes vertices at once (union bound)
+    return math.sqrt(math.log(2 * n_nodes / delta) / (2 * n_sources))
+
+
+def _empirical_bernstein(mean, squares, n_sources, delta):
+    # Maurer-Pontil bound on the mean of [0, 1] samples from their sample variance, per vertex
+    if n_sources < 2:
+        return np.ones_like(mean)
+    variance = np.maximum(squares / n_sources - mean * mean, 0.0) * n_sources / (n_sources - 1)
+    log_term = math.log(2 / delta)
+    return np.sqrt(2 * variance * log_term / n_sources) + 7 * log_term / (3 * (n_sources - 1))
+
+
+def betweenness_centrality(csr, n_sources=None, epsilon=None, delta=0.1, n_workers=1, batch_size=None, seed=None) -> BetweennessResult:
+    """
+    Compute or estimate betweenness centrality with Brandes' algorithm: one BFS per source counts shortest paths,
+    then dependencies are accumulated back from the deepest level.
+
+    Exact betweenness needs a BFS from every vertex. With sampling, sources are drawn uniformly without
+    replacement and the dependencies scaled by n_nodes / n_sources. A source contributes at most n_nodes - 2 to any
+    vertex, so normalized scores are means of [0, 1] samples:
+    - with n_sources fixed, Hoeffding's inequality over all vertices bounds the error (reported as epsilon);
+    - with epsilon given, the sample is doubled round after round until every vertex's empirical Bernstein bound
+      (tighter for the low-variance majority of vertices) or the Hoeffding bound falls below epsilon. Round i spends
+      delta / 2^i of the failure probability, so the bound holds for the final round whenever it stops. The number
+      of sources depends on epsilon and log(n_nodes), not on n_nodes itself.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+    - n_sources (int): Number of sampled sources. None with epsilon None for the exact scores.
+    - epsilon (float): Target additive error on the normalized scores, for adaptive sampling.
+    - delta (float): Allowed probability that some normalized score is off by more than epsilon.
+    - n_workers (int): Number of worker processes, each accumulating a slice of every batch. None for every core.
+    - batch_size (int): Sources of the first adaptive round, None for 8 per worker (at least 32).
+    - seed (int): Seed of the source sampling.
+
+    Returns:
+    - BetweennessResult: Scores, with the error bound they were computed under.
+
+    Example Usage:
+    ```python
+    result = betweenness_centrality(random_graph.get_csr, epsilon=0.01, n_workers=None)
+    hubs, scores = result.top_k(10)
+    ```
+    """
+    n_nodes = csr.n_nodes
+    if n_nodes == 0:
+        return BetweennessResult(np.zeros(0), 0, csr.is_directed)
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(n_nodes)
+    n_workers = n_workers or os.cpu_count()
+    accumulator = _Accumulator(csr, n_workers)
+    scale = 1.0 if csr.is_directed else 0.5
+    try:
+        if epsilon is None:
+            n_sources = n_nodes if n_sources is None else min(n_sources, n_nodes)
+            accumulator.add(order[:n_sources])
+            bound = _hoeffding(n_nodes, n_sources, delta) if 0 < n_sources < n_nodes else 0.0
+        else:
+            batch_size = batch_size or max(32, 8 * n_workers)
+            # Bounds apply to the mean of dependencies / (n - 2); normalized scores are that mean * n / (n - 1)
+            target = epsilon * (n_nodes - 1) / n_nodes
+            width = max(n_nodes - 2, 1)
+            round_index = 0
+            bound = math.inf
+            while accumulator.count < n_nodes and bound > target:
+                round_index += 1
+                # Progressive sampling: every round doubles the sample, so few rounds share delta
+                accumulator.add(order[accumulator.count:accumulator.count + max(batch_size, accumulator.count)])
+                count = accumulator.count
+                round_delta = delta / 2 ** round_index
+                mean = accumulator.total / width / count
+                bernstein = _empirical_bernstein(mean, accumulator.squares / width ** 2, count, round_delta / (2 * n_nodes))
+                bound = min(float(bernstein.max()), _hoeffding(n_nodes, count, round_delta / 2))
+            n_sources = accumulator.count
+            bound = 0.0 if n_sources == n_nodes else bound
+    finally:
+        accumulator.close()
+    scores = accumulator.total * (n_nodes / max(n_sources, 1)) * scale
+    epsilon = bound * n_nodes / (n_nodes - 1) if n_nodes > 1 else 0.0
+    return BetweennessResult(scores, n_sources, csr.is_directed, epsilon, delta)
+
+
+class BetweennessCache:
+    """
+    Betweenness results keyed by graph hash and parameters, in memory and optionally on disk, so that scenes and
+    scripts working on the same graph compute it once.
+
+    Parameters:
+    - directory (str): Where to keep results across runs, None for an in-memory cache only.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.results = {}
+
+    @staticmethod
+    def key(graph_hash, n_sources=None, epsilon=None, delta=0.1, seed=None) -> str:
+        return '{}-k{}-e{}-d{}-s{}'.format(graph_hash, n_sources, epsilon, delta, seed)
+
+    def _path(self, key):
+        return os.path.join(self.directory, 'betweenness-{}.pkl'.format(key))
+
+    def get(self, key):
+        if key not in self.results and self.directory is not None:
+            result = load_checkpoint(self._path(key))
+            if result is not None:
+                self.results[key] = result
+        return self.results.get(key)
+
+    def put(self, key, result):
+        self.results[key] = result
+        if self.directory is not None:
+            atomic_dump(result, self._path(key))
+
+
+DEFAULT_CACHE = BetweennessCache()
+
+
+def graph_betweenness(random_graph, n_sources=None, epsilon=None, delta=0.1, n_workers=1, seed=None, cache=DEFAULT_CACHE) -> BetweennessResult:
+    """
+    Betweenness centrality of a RandomGraph, looked up by graph hash before being computed. Unseeded estimates are
+    cached too: the first one computed is reused.
+
+    Parameters:
+    - random_graph (RandomGraph): The graph.
+    - n_sources, epsilon, delta, n_workers, seed: As for betweenness_centrality.
+    - cache (BetweennessCache): Where to look results up and store them, None to always compute.
+
+    Returns:
+    - BetweennessResult: The scores.
+    """
+    key = BetweennessCache.key(random_graph.get_graph_hash, n_sources, epsilon, delta, seed)
+    result = cache.get(key) if cache is not None else None
+    if result is None:
+        result = betweenness_centrality(random_graph.get_csr, n_sources, epsilon, delta, n_workers, seed=seed)
+        if cache is not None:
+            cache.put(key, result)
+    return result
@@ -0,0 +1,150 @@
+import os
+import pickle
+import tempfile
+import time
+
+
+def atomic_dump(obj, path):
+    """
+    Pickle an object so that path always holds either the previous or the new complete checkpoint, never a torn one.
+
+    The data goes to a temporary file in the same directory, is flushed to disk and then renamed over path.
+
+    Parameters:
+    - obj (object): The object to save.
+    - path (str): Destination file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself (POSIX only)
+        directory_handle = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory_handle)
+        finally:
+            os.close(directory_handle)
+
+
+def load_checkpoint(path, default=None):
+    """
+    Load a checkpoint written with atomic_dump.
+
+    Parameters:
+    - path (str): The checkpoint file.
+    - default (object): Value returned if there is no checkpoint yet.
+
+    Returns:
+    - object: The unpickled checkpoint, or default.
+    """
+    if not os.path.exists(path):
+        return default
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+class SweepCheckpoint:
+    """
+    Progress of a benchmark sweep, saved atomically to disk so that a restarted run skips the finished work.
+
+    Every entry of the sweep has a key (e.g. a test name or a graph size). Finished entries keep their result;
+    in-flight entries keep a partial state, such as a traversal queue and status arrays, saved at most once per
+    interval seconds.
+
+    Parameters:
+    - path (str): The checkpoint file. An existing checkpoint is loaded.
+    - interval (float): Minimum number of seconds between two saves of partial states.
+
+    Example Usage:
+    ```python
+    sweep = SweepCheckpoint('sweep.ckpt')
+    for n_nodes, n_edges in sizes:
+        key = '{}x{}'.format(n_nodes, n_edges)
+        if not sweep.is_finished(key):
+            sweep.mark_finished(key, run_benchmark(n_nodes, n_edges, sweep))
+    print(sweep.results())
+    ```
+    """
+
+    def __init__(self, path, interval=60.0):
+        self.path = path
+        self.interval = interval
+        self.state = load_checkpoint(path, {'finished': {}, 'partial': {}})
+        self._last_save = time.monotonic()
+
+    def __repr__(self):
+        return "SweepCheckpoint(path={!r}, finished={}, in_flight={})".format(
+            self.path, len(self.state['finished']), len(self.state['partial']))
+
+    def save(self):
+        atomic_dump(self.state, self.path)
+        self._last_save = time.monotonic()
+
+    def is_finished(self, key) -> bool:
+        return key in self.state['finished']
+
+    def result(self, key):
+        """
+        Returns:
+        - object: The result stored by mark_finished for key.
+        """
+        return self.state['finished'][key]
+
+    def results(self) -> dict:
+        return dict(self.state['finished'])
+
+    def mark_finished(self, key, result=None):
+        """
+        Record the result of an entry, drop its partial state and save immediately.
+
+        Parameters:
+        - key (hashable): The entry.
+        - result (object): Its result, e.g. an execution time.
+        """
+        self.state['finished'][key] = result
+        self.state['partial'].pop(key, None)
+        self.save()
+
+    def partial(self, key, default=None):
+        """
+        Returns:
+        - object: The last partial state saved for key, or default.
+        """
+        return self.state['partial'].get(key, default)
+
+    def save_partial(self, key, get_state, force=False) -> bool:
+        """
+        Save the partial state of an in-flight entry if interval seconds passed since the last save.
+
+        Parameters:
+        - key (hashable): The entry.
+        - get_state (callable): Returns the state to save. Only called when a save is due, so building the state
+          may be expensive.
+        - force (bool): True to save regardless of the interval.
+
+        Returns:
+        - bool: True if the state was saved.
+        """
+        if not force and time.monotonic() - self._last_save < self.interval:
+            return False
+        self.state['partial'][key] = get_state()
+        self.save()
+        return True
+
+    def reset(self):
+        """
+        Forget all progress and delete the checkpoint file.
+        """
+        self.state = {'finished': {}, 'partial': {}}
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,166 @@
+import numpy as np
+
+
+class UnionFind:
+    """
+    Disjoint-set forest over the vertices 0..n_nodes-1, with path compression and union by rank.
+
+    Bulk unions over edge arrays are vectorized (root hooking plus pointer jumping), single unions are incremental,
+    so the structure can be built once for a graph and kept up to date as edges are added.
+
+    Parameters:
+    - n_nodes (int): Number of vertices.
+
+    Example Usage:
+    ```python
+    components = UnionFind(random_graph.n_nodes)
+    components.union_edges(random_graph.get_edge_array)
+    components.union(3, 7)
+    print(components.n_components, components.roots())
+    ```
+
+    Attributes:
+    - parent (np.ndarray): Parent pointer of each vertex, roots point to themselves.
+    - rank (np.ndarray): Upper bound on the height of the tree below each root.
+    - n_components (int): Current number of disjoint sets.
+    """
+
+    def __init__(self, n_nodes=0):
+        self.parent = np.arange(n_nodes, dtype=np.int64)
+        self.rank = np.zeros(n_nodes, dtype=np.int8)
+        self.n_components = n_nodes
+
+    def __len__(self):
+        return len(self.parent)
+
+    def __repr__(self):
+        return "UnionFind(nodes={}, components={})".format(len(self), self.n_components)
+
+    def add_node(self):
+        """
+        Append a new singleton vertex.
+
+        Returns:
+        - int: The index of the new vertex.
+        """
+        node = len(self.parent)
+        self.parent = np.append(self.parent, node)
+        self.rank = np.append(self.rank, np.int8(0))
+        self.n_components += 1
+        return node
+
+    def find(self, node):
+        """
+        Get the representative of a vertex, compressing the path on the way.
+
+        Parameters:
+        - node (int): The vertex.
+
+        Returns:
+        - int: The root of the set containing node.
+        """
+        parent = self.parent
+        root = int(node)
+        while parent[root] != root:
+            root = int(parent[root])
+        while parent[node] != root:
+            parent[node], node = root, int(parent[node])
+        return root
+
+    def union(self, source, target):
+        """
+        Merge the sets containing two vertices, hooking the lower-rank root under the other.
+
+        Parameters:
+        - source (int): First vertex.
+        - target (int): Second vertex.
+
+        Returns:
+        - bool: True if two different sets were merged.
+        """
+        root_s, root_t = self.find(source), self.find(target)
+        if root_s == root_t:
+            return False
+        if self.rank[root_s] < self.rank[root_t]:
+            root_s, root_t = root_t, root_s
+        self.parent[root_t] = root_s
+        if self.rank[root_s] == self.rank[root_t]:
+            self.rank[root_s] += 1
+        self.n_components -= 1
+        return True
+
+    def _compress(self):
+        # Pointer jumping until every vertex points straight at its root
+        parent = self.parent
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        self.parent = parent
+        return parent
+
+    def union_edges(self, edges):
+        """
+        Merge the end vertices of every edge in one vectorized pass.
+
+        Each round hooks the larger root of every unmerged edge under the smallest root it touches and then flattens
+        the forest by pointer jumping; pointers only ever go to smaller indices, so no cycle can appear.
+
+        Parameters:
+        - edges (np.ndarray): An (n_edges, 2) integer array of (source, target) rows.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        parent = self._compress()
+        while len(edges) > 0:
+            root_s, root_t = parent[edges[:, 0]], parent[edges[:, 1]]
+            pending = root_s != root_t
+            if not pending.any():
+                break
+            root_s, root_t = root_s[pending], root_t[pending]
+            edges = edges[pending]
+            np.minimum.at(parent, np.maximum(root_s, root_t), np.minimum(root_s, root_t))
+            parent = self._compress()
+
+        # Every tree now has height at most one, which is all the rank needs to bound
+        is_root = parent == np.arange(len(parent))
+        self.rank = np.zeros(len(parent), dtype=np.int8)
+        self.rank[np.unique(parent[~is_root])] = 1
+        self.n_components = int(is_root.sum())
+
+    def labels(self) -> np.ndarray:
+        """
+        Get the root of every vertex.
+
+        Returns:
+        - np.ndarray: An array where index i holds the representative of vertex i.
+        """
+        return self._compress().copy()
+
+    def component_ids(self) -> np.ndarray:
+        """
+        Get dense component labels.
+
+        Returns:
+        - np.ndarray: An array where index i holds the component of vertex i, numbered 0..n_components-1.
+        """
+        return np.unique(self._compress(), return_inverse=True)[1]
+
+    def roots(self) -> np.ndarray:
+        """
+        Get one vertex per component, its representative.
+
+        Returns:
+        - np.ndarray: The roots, in increasing order.
+        """
+        return np.flatnonzero(self.parent == np.arange(len(self.parent)))
+
+    def component_sizes(self) -> dict:
+        """
+        Get the size of every component.
+
+        Returns:
+        - dict: A dictionary with roots as keys and component sizes as values.
+        """
+        roots, sizes = np.unique(self._compress(), return_counts=True)
+        return dict(zip(roots.tolist(), sizes.tolist()))
@@ -0,0 +1,212 @@
+import json
+import os
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Compressed sparse row adjacency of a graph: the neighbours of vertex v are indices[indptr[v]:indptr[v + 1]],
+    sorted in increasing order.
+
+    Undirected graphs store every edge in both directions. The two arrays can be saved to a directory and loaded
+    back memory-mapped, so large graphs are paged in on demand instead of being rebuilt.
+
+    Parameters:
+    - indptr (np.ndarray): Offsets of each vertex's neighbour range, of length n_nodes + 1.
+    - indices (np.ndarray): Concatenated neighbour lists.
+    - is_directed (bool): True for directed graphs, False for undirected graphs.
+
+    Example Usage:
+    ```python
+    csr = CSRGraph.from_graph(random_graph)
+    csr.save('graph_csr')
+    csr = CSRGraph.load('graph_csr')
+    parent, distance = csr.bfs_tree(0)
+    ```
+    """
+
+    def __init__(self, indptr, indices, is_directed=False):
+        self.indptr = indptr
+        self.indices = indices
+        self.is_directed = is_directed
+
+    @classmethod
+    def from_edge_array(cls, edges, n_nodes, is_directed=False):
+        """
+        Build the CSR from an edge array.
+
+        Parameters:
+        - edges (np.ndarray): An (n_edges, 2) integer array of (source, target) rows.
+        - n_nodes (int): Number of vertices, IDs being 0..n_nodes-1.
+        - is_directed (bool): True for directed graphs, False for undirected graphs.
+
+        Returns:
+        - CSRGraph: The graph in CSR form.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        sources, targets = edges[:, 0], edges[:, 1]
+        if not is_directed:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+        order = np.lexsort((targets, sources))
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_nodes), out=indptr[1:])
+        return cls(indptr, targets[order], is_directed)
+
+    @classmethod
+    def from_graph(cls, random_graph):
+        """
+        Build the CSR of a RandomGraph.
+
+        Parameters:
+        - random_graph (RandomGraph): The graph.
+
+        Returns:
+        - CSRGraph: The graph in CSR form.
+        """
+        return cls.from_edge_array(random_graph.get_edge_array, random_graph.n_nodes, random_graph.is_directed)
+
+    def __repr__(self):
+        graph_type = "Directed" if self.is_directed else "Undirected"
+        return f"CSR Graph ({graph_type}): Nodes={self.n_nodes}, Arcs={self.n_arcs}"
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_arcs(self) -> int:
+        """
+        Returns:
+        - int: Number of stored neighbour entries (twice the number of edges for undirected graphs).
+        """
+        return len(self.indices)
+
+    def neighbors(self, node) -> np.ndarray:
+        """
+        Get the sorted neighbours of a vertex.
+
+        Parameters:
+        - node (int): The vertex.
+
+        Returns:
+        - np.ndarray: A view of its neighbour range.
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def degree(self) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: The out-degree of every vertex.
+        """
+        return np.diff(self.indptr)
+
+    def reverse(self):
+        """
+        Get the CSR of the transposed graph, i.e. the in-neighbours of every vertex.
+
+        Returns:
+        - CSRGraph: The reversed graph, self for undirected graphs.
+        """
+        if not self.is_directed:
+            return self
+        sources = np.repeat(np.arange(self.n_nodes), self.degree())
+        return CSRGraph.from_edge_array(np.column_stack([self.indices, sources]), self.n_nodes, True)
+
+    def to_adjacency_list(self) -> list:
+        """
+        Returns:
+        - list of lists: The same graph as an adjacency list, as built by RandomGraph.create_adjacency_list.
+        """
+        return [self.neighbors(node).tolist() for node in range(self.n_nodes)]
+
+    def gather(self, frontier):
+        """
+        Collect every arc leaving a set of vertices, vectorized over their neighbour ranges.
+
+        Parameters:
+        - frontier (np.ndarray): Source vertices.
+
+        Returns:
+        - tuple: (sources, targets) arrays with one entry per arc.
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        targets = self.indices[offsets + np.arange(offsets.size)]
+        return np.repeat(frontier, counts), targets
+
+    def bfs_tree(self, source, max_depth=None):
+        """
+        Run a level-synchronous breadth-first search with one vectorized step per level.
+
+        Parameters:
+        - source (int): Root of the search.
+        - max_depth (int): Stop after this many levels, None to explore everything reachable.
+
+        Returns:
+        - tuple: (parent, distance) int32 arrays, -1 for the root's parent and for unreached vertices.
+        """
+        parent = np.full(self.n_nodes, -1, dtype=np.int32)
+        distance = np.full(self.n_nodes, -1, dtype=np.int32)
+        distance[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while frontier.size > 0 and (max_depth is None or level < max_depth):
+            sources, targets = self.gather(frontier)
+            unseen = distance[targets] == -1
+            targets, first = np.unique(targets[unseen], return_index=True)
+            parent[targets] = sources[unseen][first]
+            level += 1
+            distance[targets] = level
+            frontier = targets
+        return parent, distance
+
+    def save(self, path):
+        """
+        Save the CSR arrays to a directory.
+
+        Parameters:
+        - path (str): Directory to write indptr.npy, indices.npy and meta.json into.
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'indptr.npy'), self.indptr)
+        np.save(os.path.join(path, 'indices.npy'), self.indices)
+        with open(os.path.join(path, 'meta.json'), 'w') as meta_file:
+            json.dump({'is_directed': self.is_directed}, meta_file)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a CSR saved with save().
+
+        Parameters:
+        - path (str): Directory the CSR was saved to.
+        - mmap (bool): True to memory-map the arrays read-only instead of reading them into memory.
+
+        Returns:
+        - CSRGraph: The loaded graph.
+        """
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(path, 'meta.json')) as meta_file:
+            meta = json.load(meta_file)
+        return cls(np.load(os.path.join(path, 'indptr.npy'), mmap_mode=mmap_mode),
+                   np.load(os.path.join(path, 'indices.npy'), mmap_mode=mmap_mode),
+                   meta['is_directed'])
+
+
+def path_from_parents(parent, target) -> list:
+    """
+    Rebuild the path from the root of a parent array to a vertex.
+
+    Parameters:
+    - parent (array-like): Parent of each vertex, -1 for the root.
+    - target (int): The end vertex.
+
+    Returns:
+    - list: Vertices from the root to target.
+    """
+    path = [int(target)]
+    while parent[path[-1]] != -1:
+        path.append(int(parent[path[-1]]))
+    return path[::-1]
@@ -0,0 +1,224 @@
+import numpy as np
+
+from csr import path_from_parents
+from triangles import undirected_csr
+
+
+class DiameterBounds:
+    """
+    Lower and upper bounds on the diameter and radius of a connected component.
+
+    Attributes:
+    - lower (int): Diameter lower bound, the length of a shortest path actually found.
+    - upper (int): Diameter upper bound.
+    - radius_lower (int): Radius lower bound.
+    - radius_upper (int): Radius upper bound.
+    - endpoints (tuple): Two vertices at distance lower from each other.
+    - n_bfs (int): Number of BFS runs used so far by the estimator.
+    """
+    __slots__ = ('lower', 'upper', 'radius_lower', 'radius_upper', 'endpoints', 'n_bfs')
+
+    def __init__(self, lower, upper, radius_lower, radius_upper, endpoints, n_bfs):
+        self.lower = lower
+        self.upper = upper
+        self.radius_lower = radius_lower
+        self.radius_upper = radius_upper
+        self.endpoints = endpoints
+        self.n_bfs = n_bfs
+
+    @property
+    def is_exact(self) -> bool:
+        return self.lower == self.upper
+
+    def __repr__(self):
+        return "DiameterBounds(diameter={}..{}, radius={}..{}, bfs={})".format(
+            self.lower, self.upper, self.radius_lower, self.radius_upper, self.n_bfs)
+
+
+class DiameterEstimator:
+    """
+    Bounds the diameter, radius and vertex eccentricities of a graph from a few BFS runs.
+
+    Every BFS from v gives the exact eccentricity of v, and for every other vertex w:
+    max(ecc(v) - d(v, w), d(v, w)) <= ecc(w) <= ecc(v) + d(v, w).
+    All queries share these per-vertex bounds, so each BFS tightens every later answer.
+
+    Distances are hop counts in the undirected graph, within the connected component of source.
+
+    Parameters:
+    - csr (CSRGraph): The graph; directed graphs are treated as undirected.
+    - source (int): A vertex of the component to analyse, None for a vertex of maximum degree.
+
+    Example Usage:
+    ```python
+    estimator = DiameterEstimator(random_graph.get_csr)
+    print(estimator.double_sweep())        # quick lower bound, 2 BFS
+    print(estimator.diameter(exact=True))  # iFUB, usually a handful more
+    print(estimator.n_bfs)
+    ```
+
+    Attributes:
+    - component (np.ndarray): Boolean mask of the vertices of the analysed component.
+    - eccentricity_lower (np.ndarray): Per-vertex eccentricity lower bounds, -1 outside the component.
+    - eccentricity_upper (np.ndarray): Per-vertex eccentricity upper bounds, -1 outside the component.
+    - n_bfs (int): Number of BFS runs so far.
+    """
+
+    def __init__(self, csr, source=None):
+        self.csr = undirected_csr(csr)
+        if self.csr.n_nodes == 0:
+            raise ValueError("Cannot bound the diameter of an empty graph")
+        self.n_bfs = 0
+        self.endpoints = (None, None)
+        self.lower = 0
+        if source is None:
+            source = int(np.argmax(self.csr.degree())) if self.csr.n_nodes > 0 else 0
+        _, distance = self._bfs(source, is_first=True)
+        self.component = distance >= 0
+
+    def _bfs(self, source, is_first=False):
+        # Run a BFS and tighten every bound with its distances
+        parent, distance = self.csr.bfs_tree(source)
+        self.n_bfs += 1
+        reached = distance >= 0
+        eccentricity = int(distance.max())
+        if is_first:
+            self.eccentricity_lower = np.where(reached, 0, -1)
+            self.eccentricity_upper = np.where(reached, np.iinfo(np.int64).max, -1)
+        lower = np.maximum(eccentricity - distance, distance)
+        self.eccentricity_lower[reached] = np.maximum(self.eccentricity_lower[reached], lower[reached])
+        self.eccentricity_upper[reached] = np.minimum(self.eccentricity_upper[reached], eccentricity + distance[reached])
+        if eccentricity > self.lower or self.endpoints[0] is None:
+            self.lower = eccentricity
+            self.endpoints = (source, int(np.argmax(distance)))
+        return parent, distance
+
+    def eccentricity(self, vertex) -> int:
+        """
+        Returns:
+        - int: The exact eccentricity of a vertex of the component, with one BFS if its bounds are not tight yet.
+        """
+        if self.eccentricity_lower[vertex] != self.eccentricity_upper[vertex]:
+            self._bfs(vertex)
+        return int(self.eccentricity_lower[vertex])
+
+    def bounds(self) -> DiameterBounds:
+        """
+        Returns:
+        - DiameterBounds: The current bounds, without running any BFS.
+        """
+        lower, upper = self.eccentricity_lower[self.component], self.eccentricity_upper[self.component]
+        return DiameterBounds(max(self.lower, int(lower.max())), int(min(upper.max(), 2 * self.radius_upper_bound())),
+                              int(lower.min()), int(upper.min()), self.endpoints, self.n_bfs)
+
+    def radius_upper_bound(self) -> int:
+        return int(self.eccentricity_upper[self.component].min())
+
+    def double_sweep(self, source=None) -> DiameterBounds:
+        """
+        Lower-bound the diameter with two BFS: the second starts from the farthest vertex found by the first.
+
+        Parameters:
+        - source (int): Start of the first sweep, None for the endpoint of the longest path found so far.
+
+        Returns:
+        - DiameterBounds: The updated bounds.
+        """
+        _, distance = self._bfs(self.endpoints[0] if source is None else source)
+        self._bfs(int(np.argmax(distance)))
+        return self.bounds()
+
+    def _sweep_midpoint(self, source):
+        # Double sweep from source and return the middle vertex of the long path it finds
+        _, distance = self._bfs(source)
+        parent, distance = self._bfs(int(np.argmax(distance)))
+        path = path_from_parents(parent, int(np.argmax(distance)))
+        return path[len(path) // 2]
+
+    def diameter(self, exact=True, max_bfs=None) -> DiameterBounds:
+        """
+        Bound or compute the diameter with iFUB (iterative fringe upper bound).
+
+        A 4-sweep picks a central vertex u. The vertices farthest from u are then checked level by level: the
+        eccentricity of any vertex closer than level i is at most 2(i - 1), so once the vertices of levels i and
+        above reach a larger eccentricity the diameter is known. Vertices whose eccentricity upper bound cannot beat
+        the current lower bound are skipped without a BFS.
+
+        Parameters:
+        - exact (bool): False to stop after the 4-sweep, with its lower bound and the current upper bound.
+        - max_bfs (int): Stop with bounds instead of the exact value after this many BFS runs in total.
+
+        Returns:
+        - DiameterBounds: The bounds, with lower == upper when exact.
+        """
+        middle = self._sweep_midpoint(self.endpoints[0])
+        center = self._sweep_midpoint(middle)
+        if not exact:
+            return self.bounds()
+        _, distance = self._bfs(center)
+        level = int(distance.max())
+        upper = min(2 * level, self.bounds().upper)
+        while upper > self.lower and level > 0:
+            fringe = np.flatnonzero(distance == level)
+            for vertex in fringe:
+                if self.eccentricity_upper[vertex] <= self.lower:
+                    continue
+                if max_bfs is not None and self.n_bfs >= max_bfs:
+                    return self._with_upper(upper)
+                self.eccentricity(int(vertex))
+            # Pairs inside the fringe can be 2 * level apart, so the test waits for the whole level
+            if self.lower > 2 * (level - 1):
+                return self._with_upper(self.lower)
+            level -= 1
+            upper = min(upper, max(2 * level, self.lower))
+        return self._with_upper(upper)
+
+    def _with_upper(self, upper):
+        bounds = self.bounds()
+        bounds.upper = min(bounds.upper, upper)
+        return bounds
+
+    def eccentricities(self, max_bfs=None) -> DiameterBounds:
+        """
+        Tighten every eccentricity bound, alternating BFS from the vertex with the largest upper bound and from
+        the one with the smallest lower bound (bounding diameters), until every eccentricity in the component is
+        exact or the BFS budget runs out. Diameter and radius are then exact too.
+
+        Parameters:
+        - max_bfs (int): Stop after this many BFS runs in total, None for no limit.
+
+        Returns:
+        - DiameterBounds: The final bounds; eccentricity_lower and eccentricity_upper hold the per-vertex ones.
+        """
+        pick_largest = True
+        while max_bfs is None or self.n_bfs < max_bfs:
+            open_vertices = np.flatnonzero(self.component & (self.eccentricity_lower != self.eccentricity_upper))
+            if len(open_vertices) == 0:
+                break
+            if pick_largest:
+                vertex = open_vertices[np.argmax(self.eccentricity_upper[open_vertices])]
+            else:
+                vertex = open_vertices[np.argmin(self.eccentricity_lower[open_vertices])]
+            self._bfs(int(vertex))
+            pick_largest = not pick_largest
+        return self.bounds()
+
+    def radius(self, max_bfs=None) -> DiameterBounds:
+        """
+        Bound or compute the radius by running BFS from the vertices with the smallest eccentricity lower bound
+        until one of them reaches it.
+
+        Parameters:
+        - max_bfs (int): Stop with bounds after this many BFS runs in total, None for no limit.
+
+        Returns:
+        - DiameterBounds: The bounds, with radius_lower == radius_upper when exact.
+        """
+        while max_bfs is None or self.n_bfs < max_bfs:
+            bounds = self.bounds()
+            if bounds.radius_lower == bounds.radius_upper:
+                break
+            candidates = np.flatnonzero(self.component & (self.eccentricity_lower == bounds.radius_lower)
+                                        & (self.eccentricity_upper != self.eccentricity_lower))
+            self._bfs(int(candidates[np.argmin(self.eccentricity_upper[candidates])]))
+        return self.bounds()
@@ -0,0 +1,195 @@
+import heapq
+
+from traversal import bfs_events, Discover
+
+
+class DynamicBFS:
+    """
+    A BFS tree (parent and distance arrays) kept exact while edges are inserted into or deleted from the graph.
+
+    Instead of rerunning the search after every change, each update repairs the tree locally:
+    - an insertion that shortens a distance propagates the decrease forward from the edge target only;
+    - deleting a tree edge invalidates the subtree below it, which is then reattached from its intact boundary
+      with a small Dijkstra-like pass restricted to that subtree.
+    The cost of an update is proportional to the vertices whose distance or parent changed and their incident
+    edges, not to V + E. Deleting a non-tree edge costs O(1).
+
+    Parameters:
+    - adjacency_list (list of lists): Adjacency list of the graph, indexed by vertex.
+    - root (int): Source of the BFS tree.
+    - is_directed (bool): True for directed graphs, False for undirected graphs.
+    - random_graph (RandomGraph): Optional graph to mirror every edge update into.
+
+    Example Usage:
+    ```python
+    dynamic = DynamicBFS.from_graph(random_graph, root=0)
+    dynamic.add_edge(3, 7)
+    dynamic.remove_edge(0, 1)
+    print(dynamic.distance[7], dynamic.path_to(7))
+    ```
+
+    Attributes:
+    - parent (list): Parent of each vertex in the BFS tree, -1 for the root and unreachable vertices.
+    - distance (list): Hop distance from the root, -1 for unreachable vertices.
+    """
+
+    UNREACHABLE = -1
+
+    def __init__(self, adjacency_list, root, is_directed=False, random_graph=None):
+        n_nodes = len(adjacency_list)
+        self.root = root
+        self.is_directed = is_directed
+        self.random_graph = random_graph
+        self.adjacency = [set(neighbours) for neighbours in adjacency_list]
+        if is_directed:
+            self.reverse_adjacency = [set() for _ in range(n_nodes)]
+            for source, neighbours in enumerate(adjacency_list):
+                for target in neighbours:
+                    self.reverse_adjacency[target].add(source)
+        else:
+            self.reverse_adjacency = self.adjacency
+
+        self.parent = [-1] * n_nodes
+        self.distance = [self.UNREACHABLE] * n_nodes
+        self.children = [set() for _ in range(n_nodes)]
+        for event in bfs_events(adjacency_list, root, is_directed):
+            if isinstance(event, Discover):
+                self._attach(event.vertex, event.parent, event.level)
+
+    @classmethod
+    def from_graph(cls, random_graph, root):
+        """
+        Build the BFS tree of a RandomGraph, mirroring later updates into that graph.
+
+        Parameters:
+        - random_graph (RandomGraph): The graph.
+        - root (int): Source of the BFS tree.
+
+        Returns:
+        - DynamicBFS: The dynamic tree.
+        """
+        return cls(random_graph.get_adjacency_list, root, random_graph.is_directed, random_graph)
+
+    def __repr__(self):
+        reached = sum(1 for d in self.distance if d != self.UNREACHABLE)
+        return "DynamicBFS(root={}, reached={}/{})".format(self.root, reached, len(self.distance))
+
+    def _attach(self, node, parent, distance):
+        if self.parent[node] != -1:
+            self.children[self.parent[node]].discard(node)
+        self.parent[node] = parent
+        self.distance[node] = distance
+        if parent != -1:
+            self.children[parent].add(node)
+
+    def _relax_from(self, source, target):
+        # Propagate a distance decrease starting at the edge (source, target)
+        changed = 0
+        pending = [(source, target)]
+        while pending:
+            next_pending = []
+            for source, target in pending:
+                candidate = self.distance[source] + 1
+                if self.distance[target] != self.UNREACHABLE and self.distance[target] <= candidate:
+                    continue
+                self._attach(target, source, candidate)
+                changed += 1
+                next_pending.extend((target, adj_n) for adj_n in self.adjacency[target])
+            pending = next_pending
+        return changed
+
+    def add_edge(self, source, target):
+        """
+        Insert an edge and propagate any distance decrease it causes.
+
+        Parameters:
+        - source (int): Source vertex.
+        - target (int): Target vertex.
+
+        Returns:
+        - int: Number of vertices whose distance changed.
+        """
+        self.adjacency[source].add(target)
+        if self.is_directed:
+            self.reverse_adjacency[target].add(source)
+        else:
+            self.adjacency[target].add(source)
+        if self.random_graph is not None:
+            self.random_graph.add_edge(source, target)
+
+        changed = 0
+        for u, v in ((source, target),) if self.is_directed else ((source, target), (target, source)):
+            if self.distance[u] != self.UNREACHABLE:
+                changed += self._relax_from(u, v)
+        return changed
+
+    def remove_edge(self, source, target):
+        """
+        Delete an edge and repair the subtree hanging from it, if it was a tree edge.
+
+        Parameters:
+        - source (int): Source vertex.
+        - target (int): Target vertex.
+
+        Returns:
+        - int: Number of vertices that had to be reattached or became unreachable.
+        """
+        self.adjacency[source].discard(target)
+        if self.is_directed:
+            self.reverse_adjacency[target].discard(source)
+        else:
+            self.adjacency[target].discard(source)
+        if self.random_graph is not None:
+            self.random_graph.del_edge(source, target)
+
+        if self.parent[target] == source:
+            return self._repair(target)
+        if not self.is_directed and self.parent[source] == target:
+            return self._repair(source)
+        return 0
+
+    def _repair(self, subtree_root):
+        # Detach the whole subtree: none of its distances can be trusted any more
+        affected = [subtree_root]
+        for node in affected:
+            affected.extend(self.children[node])
+        affected_set = set(affected)
+        self.children[self.parent[subtree_root]].discard(subtree_root)
+        for node in affected:
+            self.parent[node] = -1
+            self.distance[node] = self.UNREACHABLE
+            self.children[node].clear()
+
+        # Seed each detached vertex with its best intact in-neighbour, then settle the subtree in distance order
+        heap = []
+        for node in affected:
+            for adj_n in self.reverse_adjacency[node]:
+                if adj_n not in affected_set and self.distance[adj_n] != self.UNREACHABLE:
+                    heap.append((self.distance[adj_n] + 1, node, adj_n))
+        heapq.heapify(heap)
+        while heap:
+            distance, node, parent = heapq.heappop(heap)
+            if self.distance[node] != self.UNREACHABLE:
+                continue
+            self._attach(node, parent, distance)
+            for adj_n in self.adjacency[node]:
+                if adj_n in affected_set and self.distance[adj_n] == self.UNREACHABLE:
+                    heapq.heappush(heap, (distance + 1, adj_n, node))
+        return len(affected)
+
+    def path_to(self, target):
+        """
+        Get the tree path from the root to a vertex.
+
+        Parameters:
+        - target (int): The end vertex.
+
+        Returns:
+        - list: Vertices from the root to target, empty if target is unreachable.
+        """
+        if self.distance[target] == self.UNREACHABLE:
+            return []
+        path = [target]
+        while self.parent[path[-1]] != -1:
+            path.append(self.parent[path[-1]])
+        return path[::-1]
@@ -0,0 +1,155 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from collections import Counter
+
+LOGGER_NAME = 'bfs_dfs'
+
+# Sampler of the running EventLogging, applied by log_event before any log record is built
+_sampling = None
+
+
+def get_event_logger(name=None) -> logging.Logger:
+    """
+    Get the logger of the project, or one of its children (e.g. 'scene' for 'bfs_dfs.scene').
+
+    Returns:
+    - logging.Logger: The logger. It is silent until an EventLogging is started.
+    """
+    logger = logging.getLogger(LOGGER_NAME if name is None else '{}.{}'.format(LOGGER_NAME, name))
+    if name is None and not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def log_event(logger, event, level=logging.DEBUG, **fields):
+    """
+    Log a structured event. Costs a single level check when the level is disabled, and a counter increment when
+    the event is sampled out, so it can sit on hot paths.
+
+    Parameters:
+    - logger (logging.Logger): The logger.
+    - event (str): Name of the event, e.g. 'update' or 'redraw'. Sampling counts every name separately.
+    - level (int): Logging level.
+    - fields: JSON-serializable values attached to the event.
+    """
+    if logger.isEnabledFor(level) and (_sampling is None or _sampling.keep(event, level)):
+        logger.log(level, event, extra={'fields': fields})
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep 1 in every sample_every records of each event name. Records at WARNING and above always pass.
+
+    Records from log_event were already sampled before being built and pass through; plain logger calls are
+    sampled here. The counts are shared by every thread that logs, e.g. a buffered_events producer and the main
+    thread, and updated under a lock.
+
+    Parameters:
+    - sample_every (int): Sampling period, 1 to keep everything.
+    """
+
+    def __init__(self, sample_every=1):
+        super().__init__()
+        self.sample_every = sample_every
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def keep(self, event, level=logging.DEBUG) -> bool:
+        if self.sample_every <= 1 or level >= logging.WARNING:
+            return True
+        with self._lock:
+            count = self.counts[event]
+            self.counts[event] = count + 1
+        return count % self.sample_every == 0
+
+    def filter(self, record):
+        return hasattr(record, 'fields') or self.keep(record.msg, record.levelno)
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """
+    Format every record as one JSON object per line: time, level, logger, event and the structured fields.
+    """
+
+    def format(self, record):
+        entry = {'time': record.created, 'level': record.levelname, 'logger': record.name, 'event': record.getMessage()}
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Format every record as 'time level logger event key=value ...'.
+    """
+
+    def format(self, record):
+        fields = ' '.join('{}={}'.format(key, value) for key, value in getattr(record, 'fields', {}).items())
+        return '{} {} {} {} {}'.format(self.formatTime(record), record.levelname, record.name, record.getMessage(), fields).rstrip()
+
+
+class EventLogging:
+    """
+    Routes the project's structured events to a file or stream through a background writer thread.
+
+    Records are filtered (level and 1-in-N sampling) in the calling thread, then put on an unbounded queue; a
+    logging.handlers.QueueListener thread formats and writes them, so terminal or disk I/O never blocks the
+    traversal.
+
+    Parameters:
+    - path (str): Output file, None for stderr.
+    - level (int): Minimum level of the records to keep, e.g. logging.DEBUG for per-step events.
+    - sample_every (int): Keep 1 in every sample_every records of each event name below WARNING.
+    - json_lines (bool): True for JSON lines, False for plain text.
+    - name (str): Logger to attach to, None for the project's root logger.
+
+    Example Usage:
+    ```python
+    with EventLogging('events.jsonl', level=logging.DEBUG, sample_every=100):
+        scene.render()
+    ```
+    """
+
+    def __init__(self, path=None, level=logging.INFO, sample_every=1, json_lines=True, name=None):
+        self.logger = get_event_logger(name)
+        self.level = level
+        self.queue = queue.SimpleQueue()
+        self.handler = logging.handlers.QueueHandler(self.queue)
+        self.sampling = SamplingFilter(sample_every)
+        self.handler.addFilter(self.sampling)
+        self.output = logging.FileHandler(path, encoding='utf-8') if path is not None else logging.StreamHandler(sys.stderr)
+        self.output.setFormatter(JSONLinesFormatter() if json_lines else TextFormatter())
+        self.listener = logging.handlers.QueueListener(self.queue, self.output)
+        self._previous_level = None
+
+    def start(self):
+        global _sampling
+        _sampling = self.sampling
+        self._previous_level = self.logger.level
+        self.logger.setLevel(self.level)
+        self.logger.addHandler(self.handler)
+        self.listener.start()
+        return self
+
+    def stop(self):
+        """
+        Detach from the logger, then flush every queued record and close the output.
+        """
+        global _sampling
+        if _sampling is self.sampling:
+            _sampling = None
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self._previous_level)
+        self.listener.stop()
+        self.output.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
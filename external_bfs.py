@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from bitset import Bitset
+from csr import CSRGraph
+
+
+class ExternalBFSResult:
+    """
+    Output of an out-of-core BFS.
+
+    Attributes:
+    - distance (np.memmap): Hop distance of every vertex from the source, -1 if unreachable, stored on disk.
+    - parent (np.memmap): BFS parent of every vertex, -1 for the source and unreachable vertices, stored on disk.
+    - levels (list): One dict per level with the frontier size, number of vertices discovered, number of sorted
+      runs spilled and the bytes read and written for adjacency, frontiers and runs.
+    """
+
+    def __init__(self, distance, parent, levels):
+        self.distance = distance
+        self.parent = parent
+        self.levels = levels
+
+    def __repr__(self):
+        return "ExternalBFSResult(levels={}, reached={}, bytes_read={}, bytes_written={})".format(
+            len(self.levels), sum(level['discovered'] for level in self.levels) + 1,
+            sum(level['bytes_read'] for level in self.levels), sum(level['bytes_written'] for level in self.levels))
+
+
+class ExternalBFS:
+    """
+    Breadth-first search over a CSR kept on disk, for graphs whose adjacency does not fit in memory.
+
+    Only a visited Bitset (one bit per vertex) and bounded buffers live in memory:
+    - each level's frontier is a sorted file, read in blocks, so neighbour ranges are read from the memory-mapped
+      CSR in increasing offset order, i.e. sequentially;
+    - newly discovered vertices of every block are deduplicated against the visited set, sorted and spilled as a run;
+    - the runs are merged block-wise into the next sorted frontier file.
+    Distances and parents are written to memory-mapped files in the work directory.
+
+    Parameters:
+    - csr_path (str): Directory of a CSR written with CSRGraph.save.
+    - work_dir (str): Directory for frontiers, runs and outputs. A temporary directory if None.
+    - memory_limit (int): Approximate number of bytes the in-memory buffers may use per block.
+
+    Example Usage:
+    ```python
+    random_graph.get_csr.save('graph_csr')
+    result = ExternalBFS('graph_csr', memory_limit=64 * 1024 ** 2).run(source=0)
+    for level in result.levels:
+        print(level)
+    ```
+    """
+
+    def __init__(self, csr_path, work_dir=None, memory_limit=64 * 1024 ** 2):
+        self.csr = CSRGraph.load(csr_path, mmap=True)
+        self.work_dir = work_dir if work_dir is not None else tempfile.mkdtemp(prefix='external_bfs_')
+        os.makedirs(self.work_dir, exist_ok=True)
+        # Each gathered arc holds a source, a target and a few temporaries of 8 bytes each
+        self.arc_budget = max(memory_limit // 48, 1)
+        self.block_size = max(memory_limit // 32, 1)
+
+    def _path(self, name):
+        return os.path.join(self.work_dir, name)
+
+    def _frontier_blocks(self, frontier_path, stats):
+        # Yield consecutive slices of the sorted frontier holding at most arc_budget arcs each
+        frontier = np.load(frontier_path, mmap_mode='r')
+        for start in range(0, len(frontier), self.block_size):
+            block = np.asarray(frontier[start:start + self.block_size])
+            stats['bytes_read'] += block.nbytes
+            arcs = np.cumsum(self.csr.indptr[block + 1] - self.csr.indptr[block])
+            stats['bytes_read'] += 2 * block.nbytes
+            cuts = np.searchsorted(arcs, np.arange(self.arc_budget, arcs[-1] if len(arcs) else 0, self.arc_budget), side='right')
+            for piece in np.split(block, cuts):
+                if len(piece) > 0:
+                    yield piece
+
+    def _merge_runs(self, run_paths, output_path, stats):
+        # Block-wise k-way merge of disjoint sorted runs: everything up to the smallest block tail is final
+        runs = [np.load(path, mmap_mode='r') for path in run_paths]
+        total = sum(len(run) for run in runs)
+        frontier = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.int64, shape=(total,))
+        positions = [0] * len(runs)
+        block = max(self.block_size // max(len(runs), 1), 1)
+        written = 0
+        while written < total:
+            blocks = [(i, np.asarray(run[positions[i]:positions[i] + block])) for i, run in enumerate(runs) if positions[i] < len(run)]
+            threshold = min(values[-1] for _, values in blocks)
+            chunk = []
+            for i, values in blocks:
+                take = np.searchsorted(values, threshold, side='right')
+                chunk.append(values[:take])
+                positions[i] += take
+            chunk = np.sort(np.concatenate(chunk))
+            frontier[written:written + len(chunk)] = chunk
+            written += len(chunk)
+            stats['bytes_read'] += chunk.nbytes
+            stats['bytes_written'] += chunk.nbytes
+        frontier.flush()
+        # Close the memory maps before deleting their files, which Windows refuses otherwise
+        del frontier, runs
+        for path in run_paths:
+            os.remove(path)
+        return total
+
+    def run(self, source) -> ExternalBFSResult:
+        """
+        Run the search.
+
+        Parameters:
+        - source (int): Root of the search.
+
+        Returns:
+        - ExternalBFSResult: Memory-mapped distances and parents plus per-level I/O statistics.
+        """
+        n_nodes = self.csr.n_nodes
+        visited = Bitset(n_nodes)
+        distance = np.lib.format.open_memmap(self._path('distance.npy'), mode='w+', dtype=np.int32, shape=(n_nodes,))
+        parent = np.lib.format.open_memmap(self._path('parent.npy'), mode='w+', dtype=np.int64, shape=(n_nodes,))
+        distance[:] = -1
+        parent[:] = -1
+        distance[source] = 0
+        visited.set(source)
+
+        frontier_path = self._path('frontier_0.npy')
+        np.save(frontier_path, np.array([source], dtype=np.int64))
+        frontier_size = 1
+        levels = []
+        level = 0
+        while frontier_size > 0:
+            stats = {'level': level, 'frontier': frontier_size, 'discovered': 0, 'runs': 0,
+                     'bytes_read': 0, 'bytes_written': 0}
+            run_paths = []
+            for block in self._frontier_blocks(frontier_path, stats):
+                sources, targets = self.csr.gather(block)
+                stats['bytes_read'] += targets.nbytes
+                unseen = ~visited.test_many(targets)
+                targets, first = np.unique(targets[unseen], return_index=True)
+                if len(targets) == 0:
+                    continue
+                visited.set_many(targets)
+                distance[targets] = level + 1
+                parent[targets] = sources[unseen][first]
+                run_path = self._path('run_{}_{}.npy'.format(level, len(run_paths)))
+                np.save(run_path, targets)
+                run_paths.append(run_path)
+                stats['discovered'] += len(targets)
+                stats['bytes_written'] += targets.nbytes + len(targets) * (distance.itemsize + parent.itemsize)
+
+            stats['runs'] = len(run_paths)
+            os.remove(frontier_path)
+            level += 1
+            frontier_path = self._path('frontier_{}.npy'.format(level))
+            frontier_size = self._merge_runs(run_paths, frontier_path, stats)
+            levels.append(stats)
+        os.remove(frontier_path)
+        distance.flush()
+        parent.flush()
+        return ExternalBFSResult(distance, parent, levels)
+
+    def cleanup(self):
+        """
+        Delete the work directory and everything in it, outputs included.
+        """
+        shutil.rmtree(self.work_dir, ignore_errors=True)
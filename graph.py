@@ -1,6 +1,14 @@
+import hashlib
 import snap
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from graph_summary import GraphSummary
+from connectivity import UnionFind
+from centrality import BetweennessResult, graph_betweenness
+from csr import CSRGraph
+from scc import SCCResult, strongly_connected_components
+from triangles import ClusteringResult, count_triangles, estimate_clustering
 
 
 class RandomGraph:
@@ -24,6 +32,10 @@ class RandomGraph:
     - is_directed (bool): True for directed graphs, False for undirected graphs.
     - graph (Snap.py graph object): The Snap.py graph representing the random graph.
     - n_degree (dict): A dictionary to store the degree distribution of nodes.
+    - weights (np.ndarray or None): Optional edge weights, aligned with the edge IDs (positions in get_edges).
+
+    Derived representations (edge array, adjacency list, summary statistics...) are memoized and dropped whenever the
+    graph is mutated through add_node, add_edge or del_edge.
     """
 
     def __init__(self, n_nodes=0, n_edges=0, is_directed=False, verbose = False):
@@ -50,6 +62,37 @@ class RandomGraph:
             self.graph = snap.GenRndGnm(snap.TUNGraph, self.n_nodes, self.n_edges)
         
         self.n_degree = {}
+        self.weights = None
+        self._cache = {}
+        self._edges_given = False
+
+    @classmethod
+    def from_edges(cls, n_nodes, edges, is_directed=False, verbose=False):
+        """
+        Build a graph with nodes 0..n_nodes-1 and the given edges instead of random ones, e.g. to rebuild a traced
+        graph.
+
+        Parameters:
+        - n_nodes (int): The number of nodes in the graph.
+        - edges (iterable): The (source node, target node) pairs.
+        - is_directed (bool): True for directed graphs, False for undirected graphs.
+
+        Returns:
+        - RandomGraph: The graph. Until its first mutation, get_edges keeps the order of edges, so edge IDs match
+          those of the graph the edges came from.
+        """
+        random_graph = cls(0, 0, is_directed, verbose)
+        random_graph.graph = snap.TNGraph.New() if is_directed else snap.TUNGraph.New()
+        for node in range(n_nodes):
+            random_graph.graph.AddNode(node)
+        edges = [(int(source), int(target)) for source, target in edges]
+        for source, target in edges:
+            random_graph.graph.AddEdge(source, target)
+        random_graph.n_nodes = random_graph.graph.GetNodes()
+        random_graph.n_edges = random_graph.graph.GetEdges()
+        random_graph.edges = edges
+        random_graph._edges_given = True
+        return random_graph
 
     def __repr__(self):
         """
@@ -58,6 +101,106 @@ class RandomGraph:
         graph_type = "Directed" if self.is_directed else "Undirected"
         return f"Random Snap Graph ({graph_type}): Nodes={self.n_nodes}, Edges={self.n_edges}"
 
+    def _invalidate(self):
+        """
+        Drop every representation derived from the Snap.py graph after a mutation.
+        """
+        self._cache.clear()
+        self._edges_given = False
+        for attribute in ('nodes', 'edges'):
+            if hasattr(self, attribute):
+                delattr(self, attribute)
+
+    def release_representations(self, keep=()):
+        """
+        Drop derived representations that are no longer needed, to lower the memory footprint. They are rebuilt on
+        demand if accessed again.
+
+        Parameters:
+        - keep (iterable of str): Names of the representations to keep, among 'nodes', 'edges' and the memoized
+          ones ('edge_array', 'adjacency_list', 'csr', 'components'...). 'edges' is always kept for graphs built with
+          from_edges and not mutated since: their edge order defines the edge IDs and the order of the weights, and
+          Snap.py would list the edges in another order.
+        """
+        keep = set(keep)
+        if self._edges_given:
+            keep.add('edges')
+        for name in [name for name in self._cache if name not in keep]:
+            del self._cache[name]
+        for attribute in ('nodes', 'edges'):
+            if attribute not in keep and hasattr(self, attribute):
+                delattr(self, attribute)
+
+    def add_node(self, node_id=-1):
+        """
+        Add a node to the graph.
+
+        Parameters:
+        - node_id (int): ID of the new node, -1 to let Snap.py pick the next free ID.
+
+        Returns:
+        - int: The ID of the added node.
+        """
+        node_id = self.graph.AddNode(node_id)
+        self.n_nodes = self.graph.GetNodes()
+        components = self._cache.get('components')
+        self._invalidate()
+        if components is not None and node_id == len(components):
+            components.add_node()
+            self._cache['components'] = components
+        return node_id
+
+    def _edge_key(self, source, target):
+        return (source, target) if self.is_directed else (min(source, target), max(source, target))
+
+    def _realign_weights(self, weight_map):
+        # Edge IDs are positions in get_edges, which Snap.py may reorder after a mutation
+        if weight_map is not None:
+            self.weights = np.array([weight_map[self._edge_key(*edge)] for edge in self.get_edges], dtype=self.weights.dtype)
+
+    def _weight_map(self):
+        if self.weights is None:
+            return None
+        return {self._edge_key(*edge): weight for edge, weight in zip(self.get_edges, self.weights.tolist())}
+
+    def add_edge(self, source, target, weight=None):
+        """
+        Add an edge to the graph. Both end nodes must already exist.
+
+        Parameters:
+        - source (int): Source node ID.
+        - target (int): Target node ID.
+        - weight (float): Weight of the new edge, required if the graph has edge weights.
+        """
+        weight_map = self._weight_map()
+        if weight_map is not None:
+            if weight is None:
+                raise ValueError("The graph has edge weights, a weight is required for edge ({}, {})".format(source, target))
+            weight_map[self._edge_key(source, target)] = weight
+        self.graph.AddEdge(source, target)
+        self.n_edges = self.graph.GetEdges()
+        components = self._cache.get('components')
+        self._invalidate()
+        self._realign_weights(weight_map)
+        if components is not None:
+            # Connectivity only grows with insertions, so the union-find is updated instead of rebuilt
+            components.union(source, target)
+            self._cache['components'] = components
+
+    def del_edge(self, source, target):
+        """
+        Delete an edge from the graph.
+
+        Parameters:
+        - source (int): Source node ID.
+        - target (int): Target node ID.
+        """
+        weight_map = self._weight_map()
+        self.graph.DelEdge(source, target)
+        self.n_edges = self.graph.GetEdges()
+        self._invalidate()
+        self._realign_weights(weight_map)
+
     def set_nodes(self):
         """
         Set the list of nodes in the graph.
@@ -96,7 +239,73 @@ class RandomGraph:
             for EI in self.graph.Edges():
                 print("edge: (%d, %d)" % (EI.GetSrcNId(), EI.GetDstNId()))
         return self.edges
+
+    @property
+    def get_edge_array(self) -> np.ndarray:
+        """
+        Get the edges of the graph as an array, aligned with get_edges.
+
+        Returns:
+        - np.ndarray: An (n_edges, 2) integer array of (source node, target node) rows.
+        """
+        if 'edge_array' not in self._cache:
+            self._cache['edge_array'] = np.array(self.get_edges, dtype=np.int64).reshape(-1, 2)
+        return self._cache['edge_array']
     
+    @property
+    def get_graph_hash(self) -> str:
+        """
+        Get a fingerprint of the graph structure, independent of the order in which Snap.py lists the edges.
+
+        Returns:
+        - str: Hex SHA-1 digest of the direction, node count and sorted edge set.
+        """
+        if 'graph_hash' not in self._cache:
+            edges = self.get_edge_array
+            if not self.is_directed:
+                edges = np.sort(edges, axis=1)
+            edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+            digest = hashlib.sha1(np.array([self.is_directed, self.n_nodes], dtype='<i8').tobytes())
+            digest.update(edges.astype('<i8').tobytes())
+            self._cache['graph_hash'] = digest.hexdigest()
+        return self._cache['graph_hash']
+
+    def set_edge_weights(self, weights):
+        """
+        Set the edge weights of the graph.
+
+        Parameters:
+        - weights (array-like): One non-negative weight per edge, aligned with get_edges. None to drop the weights.
+        """
+        if weights is None:
+            self.weights = None
+            return
+        weights = np.asarray(weights)
+        if weights.shape != (len(self.get_edges),):
+            raise ValueError("Expected {} edge weights, got an array of shape {}".format(len(self.get_edges), weights.shape))
+        if weights.size > 0 and weights.min() < 0:
+            raise ValueError("Edge weights must be non-negative")
+        self.weights = weights
+
+    def generate_edge_weights(self, low=1, high=10, is_integer=True):
+        """
+        Assign uniformly random weights to the edges.
+
+        Parameters:
+        - low (float): Smallest weight.
+        - high (float): Largest weight (inclusive for integer weights).
+        - is_integer (bool): True for integer weights, False for real weights.
+
+        Returns:
+        - np.ndarray: The weights, aligned with get_edges.
+        """
+        if is_integer:
+            weights = np.random.randint(low, high + 1, size=len(self.get_edges))
+        else:
+            weights = np.random.uniform(low, high, size=len(self.get_edges))
+        self.set_edge_weights(weights)
+        return self.weights
+
     def create_adjacency_list(self):
         """
         Create an adjacency list from the edges data.
@@ -122,11 +331,130 @@ class RandomGraph:
         Returns:
         - list of lists: An adjacency list where each index indicates a vertex, and the item is a list of adjacent vertices.
         """
-        adjacency_list = self.create_adjacency_list()
+        if 'adjacency_list' not in self._cache:
+            self._cache['adjacency_list'] = self.create_adjacency_list()
+        adjacency_list = self._cache['adjacency_list']
         if self.verbose:
             print("Adjacency list for {} graph: {}".format(self.graph, adjacency_list))
         return adjacency_list
 
+    @property
+    def get_summary(self) -> GraphSummary:
+        """
+        Get the degree and connectivity statistics of the graph, computed once until the next mutation.
+
+        Returns:
+        - GraphSummary: The memoized summary.
+        """
+        if 'summary' not in self._cache:
+            self._cache['summary'] = GraphSummary(self)
+        return self._cache['summary']
+
+    def create_incidence_list(self):
+        """
+        Create an adjacency list that also records the edge ID (position in get_edges) of every adjacency.
+
+        Returns:
+        - list of lists: A list where each index indicates a vertex, and the item is a list of
+          (adjacent vertex, edge ID) pairs.
+        """
+        incidence_list: list = [[] for _ in range(self.n_nodes)]
+        for edge_id, (source, target) in enumerate(self.get_edges):
+            incidence_list[source].append((target, edge_id))
+            if not self.is_directed:
+                incidence_list[target].append((source, edge_id))
+        return incidence_list
+
+    @property
+    def get_incidence_list(self):
+        """
+        Get the incidence list of the graph, used by the weighted traversals to look weights up by edge ID.
+
+        Returns:
+        - list of lists: For each vertex, a list of (adjacent vertex, edge ID) pairs.
+        """
+        if 'incidence_list' not in self._cache:
+            self._cache['incidence_list'] = self.create_incidence_list()
+        return self._cache['incidence_list']
+
+    def create_edge_ids(self):
+        """
+        Create a lookup table from vertex pairs to edge IDs, so that edges can be found without scanning get_edges.
+
+        Returns:
+        - dict: (source, target) -> edge ID (position in get_edges), with (target, source) too for undirected graphs.
+          Parallel edges map to the first one.
+        """
+        edge_ids = {}
+        for edge_id, (source, target) in enumerate(self.get_edges):
+            edge_ids.setdefault((source, target), edge_id)
+            if not self.is_directed:
+                edge_ids.setdefault((target, source), edge_id)
+        return edge_ids
+
+    @property
+    def get_edge_ids(self) -> dict:
+        """
+        Get the lookup table from vertex pairs to edge IDs.
+
+        Returns:
+        - dict: The memoized (source, target) -> edge ID table, in both directions for undirected graphs.
+        """
+        if 'edge_ids' not in self._cache:
+            self._cache['edge_ids'] = self.create_edge_ids()
+        return self._cache['edge_ids']
+
+    def find_edge(self, source, target):
+        """
+        Parameters:
+        - source (int): Source node ID.
+        - target (int): Target node ID.
+
+        Returns:
+        - int: The ID of the edge (source, target), or of (target, source) in undirected graphs. None if there is
+          none.
+        """
+        return self.get_edge_ids.get((source, target))
+
+    @property
+    def get_csr(self) -> CSRGraph:
+        """
+        Get the compressed sparse row adjacency of the graph.
+
+        Returns:
+        - CSRGraph: The memoized CSR, with sorted neighbour ranges.
+        """
+        if 'csr' not in self._cache:
+            self._cache['csr'] = CSRGraph.from_graph(self)
+        return self._cache['csr']
+
+    def create_reverse_adjacency_list(self):
+        """
+        Create an adjacency list of incoming edges from the edges data.
+
+        Returns:
+        - list of lists: A list where each index indicates a vertex, and the item is a list of vertices with an edge
+          towards it. Same as the adjacency list for undirected graphs.
+        """
+        if not self.is_directed:
+            return self.get_adjacency_list
+        reverse_adjacency_list: list = [[] for _ in range(self.n_nodes)]
+        for source, target in self.get_edges:
+            reverse_adjacency_list[target].append(source)
+        return reverse_adjacency_list
+
+    @property
+    def get_reverse_adjacency_list(self):
+        """
+        Get the adjacency list of incoming edges for the graph.
+
+        Returns:
+        - list of lists: A list where each index indicates a vertex, and the item is a list of its in-neighbours.
+        """
+        if 'reverse_adjacency_list' not in self._cache:
+            self._cache['reverse_adjacency_list'] = self.create_reverse_adjacency_list()
+        return self._cache['reverse_adjacency_list']
+
     def get_degree_distribution(self):
         """
         Get the degree distribution of nodes in the graph.
@@ -134,8 +462,8 @@ class RandomGraph:
         Returns:
         - dict: A dictionary with node IDs as keys and their degrees as values.
         """
-        for node in self.graph.Nodes():
-            self.n_degree[node.GetId()] = node.GetDeg()
+        summary = self.get_summary
+        self.n_degree = dict(zip(summary.node_ids.tolist(), summary.degree.tolist()))
         return self.n_degree
 
     def get_average_degree(self):
@@ -145,18 +473,81 @@ class RandomGraph:
         Returns:
         - float: The average degree.
         """
-        if self.graph.GetNodes() == 0:
-            return 0
-        return 2 * self.graph.GetEdges() / self.graph.GetNodes()
+        return self.get_summary.average_degree
 
-    def get_clustering_coefficient(self):
+    def get_clustering(self, n_workers=1) -> ClusteringResult:
+        """
+        Get the exact triangle counts and clustering coefficients of the graph.
+
+        Parameters:
+        - n_workers (int): Number of worker processes used for the first computation, None for every core.
+
+        Returns:
+        - ClusteringResult: Per-vertex triangles and local coefficients, average clustering and transitivity.
+        """
+        if 'clustering' not in self._cache:
+            self._cache['clustering'] = count_triangles(self.get_csr, n_workers)
+        return self._cache['clustering']
+
+    def get_clustering_coefficient(self, approximate=False, epsilon=0.01, delta=0.01, n_workers=1):
         """
         Get the clustering coefficient of the graph.
 
+        Parameters:
+        - approximate (bool): True to estimate it by wedge sampling instead of counting every triangle.
+        - epsilon (float): Additive error bound of the estimate.
+        - delta (float): Probability that the estimate falls outside the error bound.
+        - n_workers (int): Number of worker processes for the exact count, None for every core.
+
+        Returns:
+        - float: The clustering coefficient (average of the local coefficients, as snap.GetClustCf).
+        """
+        if approximate:
+            return estimate_clustering(self.get_csr, epsilon, delta).average_clustering
+        return self.get_clustering(n_workers).average_clustering
+
+    @property
+    def get_components(self) -> UnionFind:
+        """
+        Get the union-find structure labelling the weakly connected components of the graph.
+
+        Returns:
+        - UnionFind: The components, kept up to date by add_node and add_edge.
+        """
+        if 'components' not in self._cache:
+            components = UnionFind(self.n_nodes)
+            components.union_edges(self.get_edge_array)
+            self._cache['components'] = components
+        return self._cache['components']
+
+    @property
+    def get_strongly_connected_components(self) -> SCCResult:
+        """
+        Get the strongly connected components of the graph and their condensation DAG. For undirected graphs they
+        are the connected components.
+
+        Returns:
+        - SCCResult: The memoized components, labelled in topological order.
+        """
+        if 'scc' not in self._cache:
+            self._cache['scc'] = strongly_connected_components(self.get_csr)
+        return self._cache['scc']
+
+    def get_betweenness_centrality(self, n_sources=None, epsilon=None, delta=0.1, n_workers=1, seed=None) -> BetweennessResult:
+        """
+        Get the betweenness centrality of the vertices, e.g. to pick traversal roots or highlight hubs.
+
+        Parameters:
+        - n_sources (int): Number of sampled BFS sources, None with epsilon None for the exact scores.
+        - epsilon (float): Target additive error on the normalized scores, for adaptive sampling.
+        - delta (float): Allowed probability that some normalized score is off by more than epsilon.
+        - n_workers (int): Number of worker processes, None for every core.
+        - seed (int): Seed of the source sampling.
+
         Returns:
-        - float: The clustering coefficient.
+        - BetweennessResult: The scores, cached per graph hash and parameters across graphs and scenes.
         """
-        return snap.GetClustCf(self.graph)
+        return graph_betweenness(self, n_sources, epsilon, delta, n_workers, seed)
 
     def get_number_of_connected_components(self):
         """
@@ -165,7 +556,7 @@ class RandomGraph:
         Returns:
         - int: The number of connected components.
         """
-        return snap.GetWccs(self.graph)
+        return self.get_components.n_components
     
     def plot_graph(self, filename = 'graph_edges.txt', graph_title = 'List of edges'):
         return snap.DrawGViz(self.graph, snap.gvlDot, filename, graph_title)
@@ -0,0 +1,106 @@
+from functools import cached_property
+
+import numpy as np
+
+
+class GraphSummary:
+    """
+    Degree and connectivity statistics of a RandomGraph, computed with vectorized passes over its edge array.
+
+    Instances are memoized by RandomGraph.get_summary and dropped whenever the graph is mutated, so repeated
+    queries after the first one only read precomputed arrays.
+
+    Parameters:
+    - random_graph (RandomGraph): The graph to summarize.
+
+    Attributes:
+    - node_ids (np.ndarray): Node IDs, aligned with every per-vertex array below.
+    - in_degree (np.ndarray): In-degree of each node (equal to degree for undirected graphs).
+    - out_degree (np.ndarray): Out-degree of each node (equal to degree for undirected graphs).
+    - degree (np.ndarray): Total degree of each node.
+    - degree_histogram (np.ndarray): Number of nodes for each degree value, indexed by degree.
+    """
+
+    def __init__(self, random_graph):
+        self.random_graph = random_graph
+        self.node_ids = np.asarray(random_graph.get_nodes, dtype=np.int64)
+        edges = random_graph.get_edge_array
+        size = int(self.node_ids.max()) + 1 if len(self.node_ids) > 0 else 0
+
+        out_counts = np.bincount(edges[:, 0], minlength=size)
+        in_counts = np.bincount(edges[:, 1], minlength=size)
+        self.degree = (out_counts + in_counts)[self.node_ids]
+        if random_graph.is_directed:
+            self.out_degree = out_counts[self.node_ids]
+            self.in_degree = in_counts[self.node_ids]
+        else:
+            self.out_degree = self.in_degree = self.degree
+        self.degree_histogram = np.bincount(self.degree) if len(self.degree) > 0 else np.zeros(0, dtype=np.int64)
+
+    def __repr__(self):
+        return "GraphSummary(nodes={}, edges={}, max_degree={}, average_degree={:.3f})".format(
+            len(self.node_ids), len(self.random_graph.get_edge_array), self.max_degree, self.average_degree)
+
+    @cached_property
+    def max_degree(self) -> int:
+        """
+        Returns:
+        - int: The largest total degree in the graph, 0 for an empty graph.
+        """
+        return int(self.degree.max()) if len(self.degree) > 0 else 0
+
+    @cached_property
+    def max_degree_vertices(self) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: IDs of every node whose total degree equals max_degree.
+        """
+        return self.node_ids[self.degree == self.max_degree]
+
+    @cached_property
+    def average_degree(self) -> float:
+        """
+        Returns:
+        - float: The average total degree.
+        """
+        return float(self.degree.mean()) if len(self.degree) > 0 else 0
+
+    @cached_property
+    def n_components(self) -> int:
+        """
+        Returns:
+        - int: The number of weakly connected components.
+        """
+        return self.random_graph.get_components.n_components
+
+    def degree_percentiles(self, percentiles=(50, 90, 99)) -> dict:
+        """
+        Get percentiles of the total degree distribution.
+
+        Parameters:
+        - percentiles (iterable of float): Percentiles to compute, between 0 and 100.
+
+        Returns:
+        - dict: A dictionary with percentiles as keys and degree values as values.
+        """
+        percentiles = list(percentiles)
+        if len(self.degree) == 0:
+            return {p: 0 for p in percentiles}
+        return dict(zip(percentiles, np.percentile(self.degree, percentiles).tolist()))
+
+    def as_dict(self) -> dict:
+        """
+        Get the scalar statistics, e.g. for a dashboard or a report.
+
+        Returns:
+        - dict: Number of nodes and edges, degree extremes, average, percentiles and component count.
+        """
+        return {
+            'n_nodes': len(self.node_ids),
+            'n_edges': len(self.random_graph.get_edge_array),
+            'max_degree': self.max_degree,
+            'max_degree_vertices': self.max_degree_vertices.tolist(),
+            'average_degree': self.average_degree,
+            'degree_percentiles': self.degree_percentiles(),
+            'n_components': self.n_components,
+        }
@@ -0,0 +1,216 @@
+import contextlib
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """
+    Estimate the bytes held by an object and everything it references, counting shared objects once.
+
+    Follows containers, numpy arrays (including their buffers) and plain objects with __dict__ or __slots__.
+
+    Parameters:
+    - obj (object): The object to measure.
+    - seen (set): IDs of objects already counted, or that must not be counted (e.g. a back-reference to a parent).
+
+    Returns:
+    - int: Size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, np.ndarray):
+            # Arrays that own their buffer already include it in getsizeof, views and memory maps do not
+            size += sys.getsizeof(item) if item.base is None else sys.getsizeof(item) + item.nbytes
+            continue
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            if hasattr(item, '__dict__'):
+                pending.append(item.__dict__)
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    pending.append(getattr(item, slot))
+    return size
+
+
+def graph_memory_breakdown(random_graph) -> dict:
+    """
+    Break the memory of a RandomGraph down by representation.
+
+    Parameters:
+    - random_graph (RandomGraph): The graph.
+
+    Returns:
+    - dict: Bytes per structure: snap_graph (None if Snap.py cannot report it), node_list, edge_list, weights and
+      one entry per memoized representation (adjacency_list, csr, summary...).
+    """
+    seen = {id(random_graph)}
+    get_mem_used = getattr(random_graph.graph, 'GetMemUsed', None)
+    breakdown = {
+        'snap_graph': int(get_mem_used()) if get_mem_used is not None else None,
+        'node_list': deep_sizeof(random_graph.nodes, seen) if hasattr(random_graph, 'nodes') else 0,
+        'edge_list': deep_sizeof(random_graph.edges, seen) if hasattr(random_graph, 'edges') else 0,
+        'weights': deep_sizeof(random_graph.weights, seen) if random_graph.weights is not None else 0,
+    }
+    for name, representation in random_graph._cache.items():
+        breakdown[name] = deep_sizeof(representation, seen)
+    return breakdown
+
+
+def mobjects_sizeof(mobjects) -> int:
+    """
+    Estimate the bytes held by manim mobjects: their objects plus the point arrays of their whole family.
+
+    Parameters:
+    - mobjects (list): The mobjects, e.g. Graph3D.nodes_3d.
+
+    Returns:
+    - int: Size in bytes.
+    """
+    size = 0
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            size += sys.getsizeof(member) + member.points.nbytes
+    return size
+
+
+def scene_memory_breakdown(scene) -> dict:
+    """
+    Break the memory of a Graph3D scene down by structure, on top of its graph's breakdown.
+
+    Parameters:
+    - scene (Graph3D): The scene.
+
+    Returns:
+    - dict: Bytes for the traversal status arrays, coordinates and node/edge mobjects.
+    """
+    return {
+        'parent': deep_sizeof(scene.parent),
+        'node_status': deep_sizeof(scene.node_status),
+        'edge_status': deep_sizeof(scene.edge_status),
+        'node_coordinates': deep_sizeof(scene.node_coordinates),
+        'node_mobjects': mobjects_sizeof(scene.nodes_3d),
+        'edge_mobjects': mobjects_sizeof(scene.edges_3d),
+    }
+
+
+def peak_rss() -> int:
+    """
+    Returns:
+    - int: Peak resident set size of the process since it started, in bytes. It never decreases, so it is not a
+      per-phase figure: a phase only shows whether it raised the lifetime peak.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryReport:
+    """
+    Collects per-phase memory peaks and per-structure breakdowns. Phases may be nested; an outer phase's peak
+    includes those of its inner phases.
+
+    Example Usage:
+    ```python
+    report = MemoryReport()
+    with report.track('generation'):
+        random_graph = RandomGraph(n_nodes=1000, n_edges=5000)
+    report.add_breakdown('graph', graph_memory_breakdown(random_graph))
+    print(report)
+    ```
+
+    Attributes:
+    - phases (list): One dict per tracked phase, in the order they end, with its duration, tracemalloc peak and the
+      process peak RSS when it ended.
+    - breakdowns (dict): Named structure breakdowns, in bytes.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.breakdowns = {}
+        # Absolute tracemalloc peaks of the open phases, saved before an inner phase resets the peak
+        self._open_peaks = []
+
+    @contextlib.contextmanager
+    def track(self, phase):
+        """
+        Record the Python allocation peak (tracemalloc) of a block, and the process lifetime peak RSS at its end.
+
+        Parameters:
+        - phase (str): Name of the phase, e.g. 'generation', 'traversal' or 'rendering'.
+        """
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        outer_peak = tracemalloc.get_traced_memory()[1]
+        self._open_peaks = [max(peak, outer_peak) for peak in self._open_peaks]
+        tracemalloc.reset_peak()
+        start_current, _ = tracemalloc.get_traced_memory()
+        self._open_peaks.append(start_current)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._open_peaks.pop())
+            self.phases.append({
+                'phase': phase,
+                'seconds': time.perf_counter() - start,
+                'tracemalloc_peak': peak - start_current,
+                'tracemalloc_retained': current - start_current,
+                'peak_rss': peak_rss(),
+            })
+            if started_tracing:
+                tracemalloc.stop()
+
+    def add_breakdown(self, name, breakdown):
+        """
+        Store a structure breakdown.
+
+        Parameters:
+        - name (str): Name of the breakdown, e.g. 'graph' or 'scene'.
+        - breakdown (dict): Bytes per structure.
+        """
+        self.breakdowns[name] = breakdown
+
+    def as_dict(self) -> dict:
+        return {'phases': self.phases, 'breakdowns': self.breakdowns}
+
+    def __str__(self):
+        lines = ['{:<20}{:>12}{:>18}{:>18}{:>24}'.format('phase', 'seconds', 'tracemalloc peak', 'retained',
+                                                          'process peak RSS')]
+        for phase in self.phases:
+            lines.append('{:<20}{:>12.3f}{:>18}{:>18}{:>24}'.format(
+                phase['phase'], phase['seconds'], _format_bytes(phase['tracemalloc_peak']),
+                _format_bytes(phase['tracemalloc_retained']), _format_bytes(phase['peak_rss'])))
+        for name, breakdown in self.breakdowns.items():
+            lines.append('')
+            lines.append('{:<32}{:>16}'.format(name, 'bytes'))
+            for structure, size in breakdown.items():
+                lines.append('  {:<30}{:>16}'.format(structure, _format_bytes(size)))
+        return '\n'.join(lines)
+
+
+def _format_bytes(size):
+    if size is None:
+        return 'n/a'
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(size) < 1024 or unit == 'GiB':
+            return '{:.1f} {}'.format(size, unit) if unit != 'B' else '{} B'.format(size)
+        size /= 1024
@@ -0,0 +1,196 @@
+import multiprocessing
+import multiprocessing.connection
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from csr import CSRGraph
+
+
+class SharedArrays:
+    """
+    Numpy arrays backed by multiprocessing.shared_memory blocks, so worker processes can map them without copies.
+
+    Parameters:
+    - specs (dict): name -> (shared memory block name, shape, dtype), as returned by the specs attribute of the
+      creating instance.
+
+    Attributes:
+    - arrays (dict): name -> np.ndarray view on the shared block.
+    - specs (dict): What another process needs to attach to the same blocks.
+    """
+
+    def __init__(self, specs):
+        self.specs = specs
+        self.blocks = {}
+        self.arrays = {}
+        self._is_owner = False
+        for name, (block_name, shape, dtype) in specs.items():
+            self.blocks[name] = shared_memory.SharedMemory(name=block_name)
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=self.blocks[name].buf)
+
+    @classmethod
+    def create(cls, arrays):
+        """
+        Copy arrays into new shared memory blocks.
+
+        Parameters:
+        - arrays (dict): name -> array-like.
+
+        Returns:
+        - SharedArrays: The owner of the blocks, which unlinks them on close.
+        """
+        shared = cls({})
+        shared._is_owner = True
+        try:
+            for name, array in arrays.items():
+                array = np.asarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                shared.blocks[name] = block
+                shared.arrays[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                shared.arrays[name][...] = array
+                shared.specs[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            shared.close()
+            raise
+        return shared
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def close(self):
+        """
+        Release the views and blocks; the creating instance also frees the memory.
+        """
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            if self._is_owner:
+                block.unlink()
+        self.blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _frontier_slice(indptr, frontier, rank, n_workers):
+    # Every worker computes the same cuts, splitting the frontier on its cumulative degree so slices have similar work
+    arcs = np.cumsum(indptr[frontier + 1] - indptr[frontier])
+    targets = arcs[-1] * np.arange(1, n_workers) / n_workers
+    cuts = np.concatenate([[0], np.searchsorted(arcs, targets, side='right'), [len(frontier)]])
+    return frontier[cuts[rank]:cuts[rank + 1]]
+
+
+def _bfs_worker(rank, n_workers, specs, barrier, max_depth, timeout):
+    shared = SharedArrays(specs)
+    try:
+        csr = CSRGraph(shared['indptr'], shared['indices'], True)
+        parent, distance, owner, counts = shared['parent'], shared['distance'], shared['owner'], shared['counts']
+        frontiers = (shared['frontier_a'], shared['frontier_b'])
+        size, level = 1, 0
+        while size > 0 and (max_depth is None or level < max_depth):
+            # Expand: claim every unseen neighbour by writing a parent. Concurrent claims of the same vertex all write
+            # a vertex of the current level, so whichever write lands last is a valid BFS parent
+            mine = _frontier_slice(csr.indptr, frontiers[level % 2][:size], rank, n_workers)
+            owner[mine] = rank
+            sources, targets = csr.gather(mine)
+            unseen = distance[targets] == -1
+            targets = targets[unseen]
+            parent[targets] = sources[unseen]
+            barrier.wait(timeout)
+
+            # Settle: after the barrier parent is stable, and exactly one worker owns the parent each claim settled on
+            candidates = np.unique(targets)
+            won = candidates[owner[parent[candidates]] == rank]
+            distance[won] = level + 1
+            counts[rank] = len(won)
+            barrier.wait(timeout)
+
+            # Publish: every worker writes its new vertices at its prefix offset of the next frontier
+            offset = int(counts[:rank].sum())
+            frontiers[(level + 1) % 2][offset:offset + len(won)] = won
+            size = int(counts.sum())
+            level += 1
+            barrier.wait(timeout)
+    except BaseException:
+        # Release the other workers instead of leaving them blocked on the barrier
+        barrier.abort()
+        raise
+    finally:
+        shared.close()
+
+
+def parallel_bfs(csr, source, n_workers=None, max_depth=None, timeout=600.0):
+    """
+    Run one level-synchronous breadth-first search across several processes sharing the graph and the search state.
+
+    The CSR, parent, distance and frontier arrays live in shared memory. Every level, each worker expands a slice of
+    the frontier balanced by arc count and claims unseen neighbours by writing their parent; after a barrier, each
+    worker settles the vertices whose parent belongs to its slice, so every vertex joins the next frontier exactly
+    once; after another barrier, workers copy their vertices into the next frontier at prefix-sum offsets.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+    - source (int): Root of the search.
+    - n_workers (int): Number of worker processes, None for every core. 1 runs CSRGraph.bfs_tree in this process.
+    - max_depth (int): Stop after this many levels, None to explore everything reachable.
+    - timeout (float): Seconds a worker waits at a level barrier for the others before giving up, None to wait
+      forever.
+
+    Returns:
+    - tuple: (parent, distance) int32 arrays as returned by CSRGraph.bfs_tree, -1 for the root's parent and for
+      unreached vertices. Ties between parents of the same level may be broken differently.
+
+    Example Usage:
+    ```python
+    parent, distance = parallel_bfs(random_graph.get_csr, 0, n_workers=16)
+    print(path_from_parents(parent, 42))
+    ```
+    """
+    n_workers = n_workers or os.cpu_count()
+    if n_workers <= 1:
+        return csr.bfs_tree(source, max_depth)
+
+    n_nodes = csr.n_nodes
+    distance = np.full(n_nodes, -1, dtype=np.int32)
+    distance[source] = 0
+    frontier = np.zeros(n_nodes, dtype=np.int64)
+    frontier[0] = source
+    with SharedArrays.create({
+        'indptr': np.asarray(csr.indptr, dtype=np.int64),
+        'indices': np.asarray(csr.indices, dtype=np.int64),
+        # 64-bit parents: aligned word-sized stores, so concurrent claims never tear
+        'parent': np.full(n_nodes, -1, dtype=np.int64),
+        'distance': distance,
+        'owner': np.zeros(n_nodes, dtype=np.int32),
+        'counts': np.zeros(n_workers, dtype=np.int64),
+        'frontier_a': frontier,
+        'frontier_b': np.zeros(n_nodes, dtype=np.int64),
+    }) as shared:
+        barrier = multiprocessing.Barrier(n_workers)
+        workers = [multiprocessing.Process(target=_bfs_worker, args=(rank, n_workers, shared.specs, barrier, max_depth, timeout), daemon=True)
+                   for rank in range(n_workers)]
+        for worker in workers:
+            worker.start()
+        # Wake up whenever a worker exits: if one died (exception, signal, out of memory), the others would wait
+        # at the barrier for it, so break the barrier to release them
+        pending = workers
+        while pending:
+            multiprocessing.connection.wait([worker.sentinel for worker in pending])
+            pending = [worker for worker in pending if worker.exitcode is None]
+            if any(worker.exitcode not in (None, 0) for worker in workers):
+                barrier.abort()
+                for worker in pending:
+                    worker.join(timeout=5)
+                    if worker.is_alive():
+                        worker.terminate()
+                        worker.join()
+                break
+        failed = [worker.exitcode for worker in workers if worker.exitcode != 0]
+        if failed:
+            raise RuntimeError("Parallel BFS failed: {} of {} workers exited with codes {}".format(len(failed), n_workers, failed))
+        return shared['parent'].astype(np.int32), shared['distance'].copy()
@@ -0,0 +1,159 @@
+import contextlib
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class PhaseProfiler:
+    """
+    Named, nestable phase timers with optional per-phase cProfile or sampling-profiler capture.
+
+    Timers always run. A phase entered several times (e.g. one redraw per traversal event) accumulates its calls
+    and time. Nested phases form paths such as 'traversal;redraw', and self time excludes the nested phases.
+
+    Parameters:
+    - mode (str): None for timers only; 'cprofile' for one deterministic cProfile per phase path; 'sampling' for a
+      background thread that samples the profiled thread's Python stack every interval seconds, with low overhead
+      on long runs.
+    - interval (float): Sampling period in seconds, for mode='sampling'.
+
+    Example Usage:
+    ```python
+    profiler = PhaseProfiler(mode='sampling')
+    scene = Graph3D(n_nodes=200, n_edges=400, profiler=profiler)
+    scene.render()
+    print(profiler)
+    profiler.write('profiles', 'Graph3D')  # Graph3D.folded for flamegraph.pl/speedscope, Graph3D.txt summary
+    ```
+
+    Attributes:
+    - phases (dict): Per phase path, a dict with its number of calls, total (inclusive) and self seconds.
+    - samples (Counter): Folded stacks ('phase;...;function (file:line)') and their sample counts, mode='sampling'.
+    - profiles (dict): cProfile.Profile per phase path, mode='cprofile'.
+    """
+
+    def __init__(self, mode=None, interval=0.005):
+        if mode not in (None, 'cprofile', 'sampling'):
+            raise ValueError("Unknown profiling mode {!r}. Use None, 'cprofile' or 'sampling'".format(mode))
+        self.mode = mode
+        self.interval = interval
+        self.phases = {}
+        self.samples = Counter()
+        self.profiles = {}
+        self._stack = ()
+        self._children = []
+        self._thread_id = None
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Time a block as the phase name, nested under the phases already entered.
+
+        Parameters:
+        - name (str): Name of the phase, e.g. 'generation', 'traversal' or 'redraw'.
+        """
+        outer = self._stack
+        path = outer + (name,)
+        key = ';'.join(path)
+        if not outer:
+            self._start_capture()
+        if self.mode == 'cprofile':
+            if outer:
+                self.profiles[';'.join(outer)].disable()
+            self.profiles.setdefault(key, cProfile.Profile()).enable()
+        self._stack = path
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            self._stack = outer
+            if self.mode == 'cprofile':
+                self.profiles[key].disable()
+                if outer:
+                    self.profiles[';'.join(outer)].enable()
+            stats = self.phases.setdefault(key, {'calls': 0, 'total': 0.0, 'self': 0.0})
+            stats['calls'] += 1
+            stats['total'] += elapsed
+            stats['self'] += elapsed - children
+            if self._children:
+                self._children[-1] += elapsed
+            else:
+                self._stop_capture()
+
+    def _start_capture(self):
+        self._thread_id = threading.get_ident()
+        if self.mode == 'sampling' and self._sampler is None:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample, name='phase-sampler', daemon=True)
+            self._sampler.start()
+
+    def _stop_capture(self):
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample(self):
+        while not self._stop_sampling.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            path = self._stack
+            if frame is None or not path:
+                continue
+            functions = []
+            while frame is not None:
+                code = frame.f_code
+                functions.append('{} ({}:{})'.format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+            self.samples[';'.join(path + tuple(reversed(functions)))] += 1
+
+    def folded(self) -> list:
+        """
+        Get the profile as folded stacks, the input format of flamegraph.pl, speedscope and inferno.
+
+        Returns:
+        - list of str: 'frame;frame;... count' lines. Sampled stacks when mode='sampling', otherwise the phase
+          tree weighted by self time in microseconds.
+        """
+        if self.mode == 'sampling' and self.samples:
+            return ['{} {}'.format(stack, count) for stack, count in sorted(self.samples.items())]
+        return ['{} {}'.format(path, int(round(stats['self'] * 1e6))) for path, stats in sorted(self.phases.items())]
+
+    def write(self, directory, name):
+        """
+        Write the profile of a scene: name.folded (flame graph input), name.txt (summary table) and, for
+        mode='cprofile', one name.<phase path>.pstats file per phase (for pstats, snakeviz or gprof2dot).
+
+        Parameters:
+        - directory (str): Output directory, created if needed.
+        - name (str): Prefix of the files, e.g. the scene class name.
+
+        Returns:
+        - list of str: The written files.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = [os.path.join(directory, name + '.folded'), os.path.join(directory, name + '.txt')]
+        with open(paths[0], 'w') as file:
+            file.write('\n'.join(self.folded()) + '\n')
+        with open(paths[1], 'w') as file:
+            file.write(str(self) + '\n')
+        for key, profile in self.profiles.items():
+            paths.append(os.path.join(directory, '{}.{}.pstats'.format(name, key.replace(';', '.'))))
+            profile.dump_stats(paths[-1])
+        return paths
+
+    def __str__(self):
+        wall = sum(stats['total'] for path, stats in self.phases.items() if ';' not in path)
+        lines = ['{:<40}{:>10}{:>14}{:>14}{:>10}'.format('phase', 'calls', 'total (s)', 'self (s)', 'self %')]
+        for path, stats in sorted(self.phases.items()):
+            label = '  ' * path.count(';') + path.rsplit(';', 1)[-1]
+            share = 100 * stats['self'] / wall if wall > 0 else 0.0
+            lines.append('{:<40}{:>10}{:>14.3f}{:>14.3f}{:>9.1f}%'.format(label, stats['calls'], stats['total'], stats['self'], share))
+        return '\n'.join(lines)
@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from csr import CSRGraph, path_from_parents
+from graph import RandomGraph
+
+
+class BFSTreeCache:
+    """
+    Least-recently-used cache of BFS trees (parent and distance arrays) keyed by source vertex, bounded by memory.
+
+    Parameters:
+    - memory_budget (int): Maximum number of bytes held by the cached arrays.
+
+    Attributes:
+    - hits (int): Lookups answered from the cache.
+    - misses (int): Lookups that required a traversal.
+    - evictions (int): Trees dropped to stay within the memory budget.
+    """
+
+    def __init__(self, memory_budget=256 * 1024 ** 2):
+        self.memory_budget = memory_budget
+        self.trees = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.trees)
+
+    def get(self, source):
+        """
+        Look up the tree of a source, marking it as most recently used.
+
+        Parameters:
+        - source (int): The source vertex.
+
+        Returns:
+        - tuple or None: (parent, distance) arrays, None on a miss.
+        """
+        tree = self.trees.get(source)
+        if tree is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.trees.move_to_end(source)
+        return tree
+
+    def put(self, source, tree):
+        """
+        Store a tree, evicting the least recently used ones while over budget. Trees larger than the whole budget
+        are not cached.
+
+        Parameters:
+        - source (int): The source vertex.
+        - tree (tuple): (parent, distance) arrays.
+        """
+        size = sum(array.nbytes for array in tree)
+        if size > self.memory_budget:
+            return
+        if source in self.trees:
+            self.nbytes -= sum(array.nbytes for array in self.trees.pop(source))
+        self.trees[source] = tree
+        self.nbytes += size
+        while self.nbytes > self.memory_budget:
+            _, evicted = self.trees.popitem(last=False)
+            self.nbytes -= sum(array.nbytes for array in evicted)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_metrics(self) -> dict:
+        """
+        Returns:
+        - dict: Hits, misses, hit rate, evictions, number of cached trees and bytes used.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate, 'evictions': self.evictions,
+                'trees': len(self.trees), 'bytes': self.nbytes, 'memory_budget': self.memory_budget}
+
+
+class QueryService:
+    """
+    Answers distance, path and k-hop neighbourhood queries against one loaded graph.
+
+    BFS trees are computed in a worker thread so the event loop keeps accepting requests, cached per source, and
+    concurrent requests for the same uncached source share a single traversal.
+
+    Parameters:
+    - csr (CSRGraph): The graph, possibly memory-mapped with CSRGraph.load.
+    - memory_budget (int): Memory budget of the BFS tree cache, in bytes.
+    """
+
+    def __init__(self, csr, memory_budget=256 * 1024 ** 2):
+        self.csr = csr
+        self.cache = BFSTreeCache(memory_budget)
+        self.in_flight = {}
+        self.batched = 0
+
+    async def get_tree(self, source):
+        """
+        Get the BFS tree of a source, from the cache, from a traversal already running, or by running one.
+
+        Parameters:
+        - source (int): The source vertex.
+
+        Returns:
+        - tuple: (parent, distance) arrays.
+        """
+        tree = self.cache.get(source)
+        if tree is not None:
+            return tree
+        if source in self.in_flight:
+            self.batched += 1
+            # Shielded, so that a cancelled requester does not cancel the traversal the others wait for
+            return await asyncio.shield(self.in_flight[source])
+
+        future = asyncio.get_running_loop().run_in_executor(None, self.csr.bfs_tree, source)
+        self.in_flight[source] = future
+        future.add_done_callback(lambda done: self._finish_tree(source, done))
+        return await asyncio.shield(future)
+
+    def _finish_tree(self, source, future):
+        # Runs when the traversal ends, even if every requester was cancelled meanwhile (e.g. clients disconnected)
+        del self.in_flight[source]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(source, future.result())
+
+    def _check_vertex(self, node):
+        if not 0 <= node < self.csr.n_nodes:
+            raise ValueError("Vertex {} is not in the graph (0..{})".format(node, self.csr.n_nodes - 1))
+        return node
+
+    async def distance(self, source, target) -> int:
+        """
+        Returns:
+        - int: Hop distance from source to target, -1 if target is unreachable.
+        """
+        _, distance = await self.get_tree(self._check_vertex(source))
+        return int(distance[self._check_vertex(target)])
+
+    async def path(self, source, target) -> list:
+        """
+        Returns:
+        - list: A shortest path from source to target, empty if target is unreachable.
+        """
+        parent, distance = await self.get_tree(self._check_vertex(source))
+        if distance[self._check_vertex(target)] == -1:
+            return []
+        return path_from_parents(parent, target)
+
+    async def neighborhood(self, source, k) -> list:
+        """
+        Returns:
+        - list: Every vertex at most k hops away from source, source included.
+        """
+        _, distance = await self.get_tree(self._check_vertex(source))
+        return np.flatnonzero((distance >= 0) & (distance <= k)).tolist()
+
+    def get_metrics(self) -> dict:
+        """
+        Returns:
+        - dict: Cache metrics plus the number of requests that joined an in-flight traversal.
+        """
+        return dict(self.cache.get_metrics(), batched=self.batched, in_flight=len(self.in_flight))
+
+    async def handle(self, request) -> dict:
+        """
+        Answer one decoded request.
+
+        Parameters:
+        - request (dict): {"op": "distance" | "path" | "neighborhood" | "metrics", "source": int, "target": int,
+          "k": int}, plus an optional "id" echoed back.
+
+        Returns:
+        - dict: The response, with an "error" key if the request could not be answered.
+        """
+        if not isinstance(request, dict):
+            return {'id': None, 'error': 'Request must be a JSON object, got {}'.format(type(request).__name__)}
+        response = {'id': request.get('id')}
+        try:
+            op = request.get('op')
+            if op == 'distance':
+                response['distance'] = await self.distance(int(request['source']), int(request['target']))
+            elif op == 'path':
+                response['path'] = await self.path(int(request['source']), int(request['target']))
+            elif op == 'neighborhood':
+                response['neighborhood'] = await self.neighborhood(int(request['source']), int(request['k']))
+            elif op == 'metrics':
+                response['metrics'] = self.get_metrics()
+            else:
+                raise ValueError("Unknown op {!r}".format(op))
+        except (KeyError, TypeError, ValueError) as error:
+            response['error'] = str(error)
+        return response
+
+
+async def _serve_connection(service, reader, writer):
+    # One JSON request per line; each is answered in its own task so requests sharing a source get batched
+    lock = asyncio.Lock()
+
+    async def answer(line):
+        try:
+            response = await service.handle(json.loads(line))
+        except json.JSONDecodeError as error:
+            response = {'id': None, 'error': str(error)}
+        except Exception as error:
+            # Every line gets an answer, or the client would wait for it forever
+            response = {'id': None, 'error': 'Internal error: {}'.format(error)}
+        async with lock:
+            writer.write((json.dumps(response) + '\n').encode())
+            await writer.drain()
+
+    tasks = set()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        task = asyncio.create_task(answer(line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    writer.close()
+
+
+async def serve(service, host='127.0.0.1', port=8765):
+    """
+    Serve queries over TCP, one JSON object per line in each direction, until cancelled.
+
+    Parameters:
+    - service (QueryService): The service answering the queries.
+    - host (str): Interface to listen on.
+    - port (int): Port to listen on.
+    """
+    server = await asyncio.start_server(lambda reader, writer: _serve_connection(service, reader, writer), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local shortest-path query server.')
+    parser.add_argument('--graph-dir', help='Directory of a CSR saved with CSRGraph.save, memory-mapped on load.')
+    parser.add_argument('--n-nodes', type=int, default=1000)
+    parser.add_argument('--n-edges', type=int, default=5000)
+    parser.add_argument('--directed', action='store_true')
+    parser.add_argument('--memory-budget-mb', type=int, default=256)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.graph_dir:
+        csr = CSRGraph.load(args.graph_dir)
+    else:
+        csr = RandomGraph(args.n_nodes, args.n_edges, is_directed=args.directed).get_csr
+    print(csr)
+    asyncio.run(serve(QueryService(csr, args.memory_budget_mb * 1024 ** 2), args.host, args.port))
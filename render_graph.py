@@ -1,3 +1,5 @@
+import contextlib
+import logging
 import os
 import sys
 from typing import Callable, Iterable, Sequence
@@ -15,9 +17,19 @@ from manim.utils.utils import draw_point_in_function, slides_text, add_plane, _g
 from manim.camera.camera import Camera
 from manim.constants import ORIGIN, PI, TAU
 import snap
+from csr import path_from_parents
 from graph import RandomGraph
+from profiling import PhaseProfiler
+from event_logging import get_event_logger, log_event
+from memory_report import MemoryReport, graph_memory_breakdown, scene_memory_breakdown
+from sampling import HiddenEventCounter, RenderSample, sample_for_rendering
+from shortest_paths import astar, bidirectional_bfs, euclidean_weights, weighted_shortest_paths
+from traversal_trace import TraceEdge, TraceReader, TraceWriter
+from traversal import bfs_events, dfs_events, bfs_forest_events, dfs_forest_events, BackEdge, Discover, EdgeEvent, Finish
 import numpy as np
 
+event_logger = get_event_logger('scene')
+
 class Node(Sphere):
     def __init__(self,
         radius: float = 0.2,
@@ -80,6 +92,19 @@ class Graph3D(ThreeDScene):
         n_edges: int = 100, 
         is_bfs_search: bool = True,
         is_directed: bool = False,
+        is_full_forest: bool = False,
+        back_edge_color = YELLOW,
+        memory_report: MemoryReport = None,
+        is_low_memory: bool = False,
+        random_graph: RandomGraph = None,
+        node_coordinates: list = None,
+        trace_path: str = None,
+        replay_path: str = None,
+        profiler: PhaseProfiler = None,
+        profile_dir: str = None,
+        sample_size: int = None,
+        sample_method: str = 'snowball',
+        sample_root: int = None,
         **kwargs):
         
         super().__init__(
@@ -89,23 +114,101 @@ class Graph3D(ThreeDScene):
 
         self._n_nodes = n_nodes
         self._n_edges = n_edges
-        self.random_graph = RandomGraph(self._n_nodes, self._n_edges, is_directed=is_directed)
+        self.memory_report = memory_report
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.is_low_memory = is_low_memory
+        # trace_path records the traversal events, replay_path animates a recorded trace instead of traversing
+        self.trace_path = trace_path
+        self.replay_path = replay_path
+        with self._track_phase('generation'):
+            if random_graph is None:
+                random_graph = RandomGraph(self._n_nodes, self._n_edges, is_directed=is_directed)
+            self.random_graph = random_graph
         self.is_bfs_search = is_bfs_search
+        self.is_full_forest = is_full_forest
+        self.back_edge_color = back_edge_color
 
         if len(self.random_graph.get_nodes) > 0:
+            # Graphs larger than sample_size traverse in full but only draw a sample; the rest is counted per level
+            self.sample: RenderSample = None
+            self.sample_root = sample_root
+            self.hidden_events: HiddenEventCounter = None
+            self.hidden_text = None
+            if sample_size is not None and sample_size < len(self.random_graph.get_nodes):
+                if self.sample_root is None:
+                    self.sample_root = random.choice(self.random_graph.get_nodes) if is_bfs_search else 0
+                with self._track_phase('sampling'):
+                    self.sample = sample_for_rendering(self.random_graph, sample_size, sample_method, self.sample_root)
+                    if self.sample.local_node(self.sample_root) is None:
+                        # Degree samples ignore the root: start from a drawn vertex so the traversal is visible
+                        vertices = self.sample.vertices.tolist()
+                        self.sample_root = random.choice(vertices) if is_bfs_search else vertices[0]
+                    self.hidden_events = HiddenEventCounter(len(self.random_graph.get_nodes))
             self.parent : list = [-1 for _ in range (len(self.random_graph.get_nodes))]
-            self.node_status: list[str] = ['U' for _ in range(len(self.random_graph.get_nodes))]
-            self.edge_status: list[str] = ['U' for _ in range(len(self.random_graph.get_edges))]
-            self.node_coordinates: list[list] = self._generate_sparse_coordinates(len(self.random_graph.get_nodes))
+            self.node_status: list[str] = ['U' for _ in range(len(self._drawn_nodes))]
+            self.edge_status: list[str] = ['U' for _ in range(len(self._drawn_edges))]
+            with self._track_phase('layout'):
+                if node_coordinates is None:
+                    node_coordinates = self._generate_sparse_coordinates(len(self.random_graph.get_nodes))
+                self.node_coordinates: list[list] = [list(map(float, coordinates)) for coordinates in node_coordinates]
 
         else:
             raise ValueError('Number of nodes in graph must be at least 1. Please provide a different value for n_nodes')        
-        self.queue = []
         self.nodes_3d: list[VMobject] = []
         self.edges_3d: list[VMobject] = []
         
         self.redraw = None
 
+    @classmethod
+    def from_trace(cls, replay_path: str, **kwargs):
+        # Rebuild the traced graph and layout from the trace itself: no generation and no traversal
+        with TraceReader(replay_path) as reader:
+            if reader.edges is None:
+                raise ValueError('Trace {} does not embed its graph. Pass random_graph and replay_path instead'.format(replay_path))
+            random_graph = RandomGraph.from_edges(reader.n_nodes, reader.edges, reader.is_directed)
+            coordinates = reader.coordinates
+        return cls(n_nodes=reader.n_nodes, n_edges=reader.n_edges, is_directed=reader.is_directed, random_graph=random_graph,
+                   node_coordinates=coordinates, replay_path=replay_path, **kwargs)
+
+    @contextlib.contextmanager
+    def _track_phase(self, phase: str, is_repeated: bool = False):
+        # Per-phase timings and memory peaks are only recorded when a PhaseProfiler or MemoryReport was given.
+        # Repeated phases (one per event or path) are only timed: a memory report entry per call would be useless
+        with contextlib.ExitStack() as stack:
+            if self.profiler is not None:
+                stack.enter_context(self.profiler.phase(phase))
+            if self.memory_report is not None and not is_repeated:
+                stack.enter_context(self.memory_report.track(phase))
+            yield
+
+    @property
+    def _drawn_nodes(self) -> list:
+        # Original IDs of the vertices on screen
+        return self.random_graph.get_nodes if self.sample is None else self.sample.vertices.tolist()
+
+    @property
+    def _drawn_edges(self) -> list:
+        # Original IDs of the edges on screen
+        return range(len(self.random_graph.get_edges)) if self.sample is None else self.sample.edge_ids.tolist()
+
+    def _drawn_node(self, node):
+        # Index of a vertex in nodes_3d and node_status, None if it is not drawn
+        return node if self.sample is None else self.sample.local_node(node)
+
+    def _drawn_edge(self, edge):
+        # Index of an edge in edges_3d and edge_status, None if it is not drawn
+        return edge if self.sample is None else self.sample.local_edge(edge)
+
+    def _is_drawn(self, event) -> bool:
+        if self.sample is None:
+            return True
+        if isinstance(event, (Discover, Finish)):
+            return self.sample.node_index[event.vertex] >= 0
+        if isinstance(event, EdgeEvent):
+            return self.sample.node_index[event.source] >= 0 and self.sample.node_index[event.target] >= 0
+        return True
+
     def _generate_sparse_coordinates(self, n_nodes = 0, cube_size = 2.5):
         # Implement your algorithm to generate sparse 3D coordinates here
         # For example, you can use random coordinates within a specific range
@@ -121,23 +224,23 @@ class Graph3D(ThreeDScene):
         return coordinates
     
     def draw_initial_map(self):
-        # Create as many nodes objects as nodes are in random_graph
-        for idx in range(len(self.random_graph.get_nodes)):
+        # Create as many nodes objects as nodes are drawn: every node of random_graph unless it is sampled
+        for idx in self._drawn_nodes:
             node = Node(label=str(idx))
             node.set_x(0)
             node.set_y(0)
             node.set_z(0)
             self.nodes_3d.append(node)
 
-        for EI in self.random_graph.get_edges:
-            source, target = EI
+        for edge_id in self._drawn_edges:
+            source, target = self.random_graph.get_edges[edge_id]
             handle = np.array([1, 0, 0])
             edge = Edge(start_anchor= np.array(self.node_coordinates[source]), start_handle= np.array(self.node_coordinates[source]) + handle, end_anchor= np.array(self.node_coordinates[target]), end_handle= np.array(self.node_coordinates[target]) + handle)
             # Modify connecting points: start and end
             self.edges_3d.append(edge)
 
         # Animate the node spheres. At the beginning of the anim they appear in the origin and each move concurrently to their respective positions.
-        animations = [self.nodes_3d[node].animate.move_to(self.node_coordinates[node]) for node in self.random_graph.get_nodes]
+        animations = [self.nodes_3d[self._drawn_node(node)].animate.move_to(self.node_coordinates[node]) for node in self._drawn_nodes]
 
         node_animation = AnimationGroup(*animations)
         self.move_camera(phi=60 * DEGREES)
@@ -148,17 +251,18 @@ class Graph3D(ThreeDScene):
         self.play(node_animation)
 
         # Create animation for edges
-        animations_edges = [Create(self.edges_3d[edge]) for edge in range(len(self.random_graph.get_edges))]
+        animations_edges = [Create(edge) for edge in self.edges_3d]
         self.play(AnimationGroup(*animations_edges))
+        if self.sample is not None:
+            self._refresh_hidden_counters()
         # self.wait(5)   
             
     def _draw_graph(self):
-        cache_nodes = ['U' for _ in range(len(self.random_graph.get_nodes))]
-        cache_edges = ['U' for _ in range(len(self.random_graph.get_edges))]
+        cache_nodes = ['U' for _ in range(len(self.node_status))]
+        cache_edges = ['U' for _ in range(len(self.edge_status))]
         # Draw a map
         def redraw_map():
             nonlocal cache_nodes, cache_edges
-            print(cache_nodes, self.node_status)
             diff_nodes = diff_arrays(self.node_status, cache_nodes) # Mask function -> Compares two lists of str and returns a binary list
             diff_edges = diff_arrays(self.edge_status, cache_edges) # Mask function -> Compares two lists of str and returns a binary list
             if 1 in diff_nodes:
@@ -166,7 +270,7 @@ class Graph3D(ThreeDScene):
                 node = self.nodes_3d[idx_n]
                 node_animation = AnimationGroup(node.animate.set_fill(color="#FF4500", opacity=1), node.animate.set_stroke(color=ORANGE, opacity=1))
                 self.play(node_animation)
-                print(cache_nodes)
+                log_event(event_logger, 'redraw', node=idx_n, status=self.node_status[idx_n])
             else:
                 warnings.warn("Node status array not changed from previous state. Incorrect call to update graph.", UserWarning)
             if 1 in diff_edges:
@@ -187,84 +291,180 @@ class Graph3D(ThreeDScene):
             self.edge_status[edge] = 'D'
 
 
-        if is_first:
-            self.redraw = self._draw_graph()
-            self.redraw()
-        else:
-            self.redraw()
+        with self._track_phase('redraw', is_repeated=True):
+            if is_first:
+                self.redraw = self._draw_graph()
+                self.redraw()
+            else:
+                self.redraw()
 
     def _find_edge(self, start_node: int = None, end_node: int = None):
-        # Go search in self.random_graph.get_edges the tuple corresponding to (start_node, end_node) or viceversa
-        for tuple in self.random_graph.get_edges:
-            if tuple == (start_node, end_node):
-                return self.random_graph.get_edges.index((start_node, end_node))
-            if tuple == (end_node, start_node):
-                return self.random_graph.get_edges.index((end_node, start_node))
+        # Index of (start_node, end_node) or viceversa in self.random_graph.get_edges, through the graph's lookup
+        # table, so that traversals stay O(V + E) instead of scanning the edge list for every step
+        return self.random_graph.find_edge(start_node, end_node)
+
+    def _apply_event(self, event):
+        # Mirror a traversal event into the scene state and redraw. Events off the drawn sample are only counted
+        if isinstance(event, Discover) and event.parent != -1:
+            self.parent[event.vertex] = event.parent
+        if not self._is_drawn(event):
+            if self.hidden_events.record(event):
+                self._refresh_hidden_counters()
+            return
+        if isinstance(event, Discover):
+            if self.hidden_events is not None:
+                self.hidden_events.track(event)
+            node = self._drawn_node(event.vertex)
+            # With a sample, the parent (and so the tree edge) of a drawn vertex may not be drawn
+            edge = self._drawn_edge(self._find_edge(event.parent, event.vertex)) if event.parent != -1 else None
+            self._update(node=node, edge=edge if edge is not None else -1, node_status='D', is_first=self.redraw is None)
+        elif isinstance(event, Finish):
+            self._update(node=self._drawn_node(event.vertex), node_status='P', is_first=False)
+        elif isinstance(event, BackEdge):
+            self.on_back_edge(event)
+
+    def _refresh_hidden_counters(self):
+        # Replace the on-screen per-level counters of the events off the drawn sample
+        text = Text('\n'.join(self.hidden_events.lines()) or 'no hidden events', font_size=14).to_corner(UL)
+        if self.hidden_text is not None:
+            self.remove(self.hidden_text)
+        self.hidden_text = text
+        self.add_fixed_in_frame_mobjects(text)
+
+    def on_back_edge(self, event):
+        # Animation hook for DFS back edges (the edges closing a cycle). Override to restyle
+        edge = self._drawn_edge(self._find_edge(event.source, event.target))
+        if edge is not None and self.edges_3d:
+            self.play(self.edges_3d[edge].animate.set_stroke(color=self.back_edge_color, opacity=1))
+
+    def _forest_roots(self, start_node: int = None):
+        # One root per component, starting with the component of start_node. Directed graphs use one root per
+        # source of the condensation instead, skipping those start_node already reaches: every tree then starts
+        # where nothing can reach it, so the forest has as few trees as possible
+        if self.random_graph.is_directed:
+            scc = self.random_graph.get_strongly_connected_components
+            roots = scc.source_roots()
+            if start_node is not None:
+                roots = roots[~scc.reachable_vertices(start_node)[roots]]
+            roots = roots.tolist()
+        else:
+            roots = self.random_graph.get_components.roots().tolist()
+        if start_node is not None:
+            roots.insert(0, start_node)
+        return roots
 
     def do_bfs(self):
-        node = random.choice(self.random_graph.get_nodes)
-        print(node)
-        self.queue.append(node)
-        self._update(node = node, node_status='D', is_first=True)
-        while len(self.queue) > 0:
-            v = self.queue.pop(0)
-            for adj_n in self.random_graph.get_adjacency_list[v]:
-                if self.node_status[adj_n] == 'U':
-                    self.queue.append(adj_n)
-                    self.parent[adj_n] = v
-                    edge = self._find_edge(v, adj_n)
-                    self._update(node=adj_n, edge=edge, node_status='D', is_first=False)
-            self._update(node=v, node_status='P', is_first=False)
+        node = random.choice(self.random_graph.get_nodes) if self.sample is None else self.sample_root
+        log_event(event_logger, 'bfs_root', level=logging.INFO, node=node)
+        if self.is_full_forest:
+            events = bfs_forest_events(self.random_graph.get_adjacency_list, self._forest_roots(node), self.random_graph.is_directed)
+        else:
+            events = bfs_events(self.random_graph.get_adjacency_list, node, self.random_graph.is_directed)
+        self._run_events(events)
 
     def do_dfs(self, start_node: int = None):
-        node = start_node
-        self._update(node = start_node, node_status='D', is_first=True)
-        for adj_n in self.random_graph.get_adjacency_list[node]:
-            if self.node_status[adj_n] == 'U':
-                self.parent[adj_n] = node
-                edge = self._find_edge(node, adj_n)
-                self._update(node=adj_n, edge=edge, node_status='D', is_first=False)
-                self.do_dfs(adj_n)
-        self._update(node = node, node_status='P', is_first=False)
-        return
+        if self.is_full_forest:
+            events = dfs_forest_events(self.random_graph.get_adjacency_list, self._forest_roots(start_node), self.random_graph.is_directed)
+        else:
+            events = dfs_events(self.random_graph.get_adjacency_list, start_node, self.random_graph.is_directed)
+        self._run_events(events)
+
+    def _run_events(self, events):
+        if self.trace_path is None:
+            for event in events:
+                self._apply_event(event)
+            return
+        with TraceWriter(self.trace_path, self.random_graph, self.node_coordinates) as writer:
+            for event in events:
+                writer.write(event)
+                self._apply_event(event)
+
+    def replay_trace(self, replay_path: str = None, start: int = 0, stop: int = None):
+        # Animate a recorded traversal, optionally only the events in [start, stop)
+        with TraceReader(replay_path or self.replay_path) as reader:
+            if reader.graph_hash != self.random_graph.get_graph_hash:
+                raise ValueError('Trace was recorded on a different graph (hash {} instead of {})'.format(reader.graph_hash, self.random_graph.get_graph_hash))
+            for event in reader.iter_events(start, stop):
+                self._apply_event(event.event if isinstance(event, TraceEdge) else event)
     
+    def do_weighted_search(self, start_node: int = None, method: str = 'auto'):
+        # Weighted shortest path tree; draw_path then animates it like a BFS tree
+        if self.random_graph.weights is None:
+            raise ValueError('Graph has no edge weights. Call random_graph.set_edge_weights or generate_edge_weights first')
+        self.parent, distance = weighted_shortest_paths(self.random_graph.get_incidence_list, self.random_graph.weights, start_node, method)
+        return distance
+
     def _find_path(self, end: int = None):
-        path = []
-        # Recursive function to build the path from x to the root
-        def build_path(node):
-            if node == -1:
-                print("Root node reached.")
-                return
-            else:
-                build_path(self.parent[node])
-                path.append(node)
-                return
+        # Walk the parents up from end: a loop, as the tree of a very large graph can be deeper than the recursion limit
+        path = [] if end == -1 else path_from_parents(self.parent, end)
+        log_event(event_logger, 'path', end=end)
+        return path
 
-        build_path(end)
+    def draw_path(self, node_end: int = None, color = RED, path: list = None):
+        # Either a given path (e.g. from a single-pair search) or the tree path from the root to node_end
+        with self._track_phase('draw_path', is_repeated=True):
+            path_s_e = path if path is not None else self._find_path(node_end)
+            for idx in range(len(path_s_e) -1):
+                node_current, node_next = self._drawn_node(path_s_e[idx]), self._drawn_node(path_s_e[idx + 1])
+                edge_idx = self._drawn_edge(self._find_edge(path_s_e[idx], path_s_e[idx + 1]))
+                if None in (node_current, node_next, edge_idx):
+                    # Segment off the drawn sample
+                    continue
+                edge = self.edges_3d[edge_idx]
+                node_curr = self.nodes_3d[node_current]
+                node_next = self.nodes_3d[node_next] 
+                self.play(edge.animate.set_stroke(color=color, opacity=1), node_curr.animate.set_fill(color=color), node_next.animate.set_fill(color=color))
+
+    def draw_shortest_path(self, node_start: int = None, node_end: int = None, color = RED):
+        # Single-pair query: bidirectional BFS instead of a full traversal tree
+        path = bidirectional_bfs(self.random_graph.get_adjacency_list, node_start, node_end, self.random_graph.get_reverse_adjacency_list)
+        self.draw_path(color=color, path=path)
         return path
-        
-    def draw_path(self, node_end: int = None, color = RED):
-        path_s_e = self._find_path(node_end)
-        for idx in range(len(path_s_e) -1):
-            node_current, node_next = path_s_e[idx], path_s_e[idx + 1]
-            edge_idx = self._find_edge(node_current, node_next)
-            edge = self.edges_3d[edge_idx]
-            node_curr = self.nodes_3d[node_current]
-            node_next = self.nodes_3d[node_next] 
-            self.play(edge.animate.set_stroke(color=color, opacity=1), node_curr.animate.set_fill(color=color), node_next.animate.set_fill(color=color))
+
+    def draw_astar(self, node_start: int = None, node_end: int = None, color = RED, open_color = YELLOW, closed_color = GRAY):
+        # Point-to-point A* over Euclidean edge lengths, animating the open/closed sets and then the path found
+        weights = euclidean_weights(self.random_graph.get_edge_array, self.node_coordinates)
+        result = astar(self.random_graph.get_incidence_list, weights, self.node_coordinates, node_start, node_end, record_steps=True)
+        log_event(event_logger, 'astar', level=logging.INFO, expanded=result.expanded, n_nodes=len(self.random_graph.get_nodes))
+        for node, opened in result.steps:
+            animations = [self.nodes_3d[self._drawn_node(node)].animate.set_fill(color=closed_color, opacity=1)] if self._drawn_node(node) is not None else []
+            animations += [self.nodes_3d[self._drawn_node(adj_n)].animate.set_fill(color=open_color, opacity=1) for adj_n in opened if self._drawn_node(adj_n) is not None]
+            if animations:
+                self.play(AnimationGroup(*animations))
+        self.draw_path(color=color, path=result.path)
+        return result
 
     def construct(self):
         # Create initial map
-        self.draw_initial_map()
+        with self._track_phase('mobjects'):
+            self.draw_initial_map()
 
         # Execute search algorithm
-        if self.is_bfs_search:
-            self.do_bfs()
-        else:
-            self.do_dfs(start_node=0)
-
-        for end_node in self.random_graph.get_nodes: # Paint all paths from root node to every endpoint
-                self.draw_path(end_node, color=random_color())
+        with self._track_phase('traversal'):
+            if self.replay_path is not None:
+                self.replay_trace()
+            elif self.is_bfs_search:
+                self.do_bfs()
+            else:
+                self.do_dfs(start_node=0 if self.sample is None else self.sample_root)
+            if self.sample is not None:
+                self._refresh_hidden_counters()
+
+        if self.is_low_memory:
+            # Only the node and edge lists and the edge lookup are still needed to draw the paths
+            self.random_graph.release_representations(keep=('nodes', 'edges', 'edge_ids'))
+
+        with self._track_phase('rendering'):
+            for end_node in self._drawn_nodes: # Paint all paths from root node to every drawn endpoint
+                    self.draw_path(end_node, color=random_color())
+
+        if self.memory_report is not None:
+            self.memory_report.add_breakdown('graph', graph_memory_breakdown(self.random_graph))
+            self.memory_report.add_breakdown('scene', scene_memory_breakdown(self))
+        if self.profiler is not None:
+            log_event(event_logger, 'profile', level=logging.INFO, phases=self.profiler.phases)
+            if self.profile_dir is not None:
+                self.profiler.write(self.profile_dir, type(self).__name__)
 
 
 
@@ -0,0 +1,275 @@
+import numpy as np
+
+from csr import CSRGraph
+from triangles import undirected_csr
+
+
+def _levels(csr, start, visited, key=None):
+    # Levels of a BFS from start, in queue order. Children are grouped by the queue position of their first parent
+    # and, if key is given, sorted by key within a parent: Cuthill-McKee when key is the degree
+    visited[start] = True
+    frontier = np.array([start], dtype=np.int64)
+    levels = []
+    while frontier.size > 0:
+        levels.append(frontier)
+        sources, targets = csr.gather(frontier)
+        unseen = ~visited[targets]
+        positions = np.repeat(np.arange(len(frontier)), csr.indptr[frontier + 1] - csr.indptr[frontier])[unseen]
+        targets = targets[unseen]
+        if key is not None:
+            sort = np.lexsort((targets, key[targets], positions))
+            targets = targets[sort]
+        # Keep the first occurrence of every target, i.e. the one of its earliest parent
+        _, first = np.unique(targets, return_index=True)
+        frontier = targets[np.sort(first)]
+        visited[frontier] = True
+    return levels
+
+
+def _level_order(csr, start, visited, key=None):
+    return np.concatenate(_levels(csr, start, visited, key))
+
+
+def _pseudo_peripheral(csr, start, degree, scratch):
+    # One sweep: restart from a minimum-degree vertex of the farthest level, which tends to lower the bandwidth.
+    # The sweep marks a scratch mask and resets only what it touched, so it costs the size of the component
+    levels = _levels(csr, start, scratch)
+    for level in levels:
+        scratch[level] = False
+    last = levels[-1]
+    return int(last[np.argmin(degree[last])])
+
+
+def bfs_order(csr, source=None):
+    """
+    Order the vertices by BFS discovery, component after component, so that vertices visited together get
+    neighbouring IDs.
+
+    Parameters:
+    - csr (CSRGraph): The graph; directed graphs are ordered along their arcs.
+    - source (int): First root, None for vertex 0. Later components start from their smallest ID.
+
+    Returns:
+    - np.ndarray: order, with order[new ID] = original ID.
+    """
+    visited = np.zeros(csr.n_nodes, dtype=bool)
+    has_arcs = csr.degree() > 0
+    order = []
+    if source is not None:
+        order.append(_level_order(csr, source, visited))
+    for start in range(csr.n_nodes):
+        if not visited[start]:
+            # A vertex without arcs is a tree of its own: no BFS needed
+            order.append(_level_order(csr, start, visited) if has_arcs[start] else np.array([start], dtype=np.int64))
+            visited[start] = True
+    return np.concatenate(order) if order else np.zeros(0, dtype=np.int64)
+
+
+def reverse_cuthill_mckee(csr):
+    """
+    Order the vertices by reverse Cuthill-McKee: a BFS from a pseudo-peripheral vertex of every component, visiting
+    the unvisited neighbours of each vertex by increasing degree, then reversed. It keeps the bandwidth (largest ID
+    difference across an edge) small.
+
+    Parameters:
+    - csr (CSRGraph): The graph; directed graphs are ordered on their undirected view.
+
+    Returns:
+    - np.ndarray: order, with order[new ID] = original ID.
+    """
+    csr = undirected_csr(csr)
+    degree = csr.degree()
+    visited = np.zeros(csr.n_nodes, dtype=bool)
+    scratch = np.zeros(csr.n_nodes, dtype=bool)
+    by_degree = np.argsort(degree, kind='stable')
+    # Isolated vertices come first in degree order and are components of their own
+    isolated = by_degree[:np.count_nonzero(degree == 0)]
+    visited[isolated] = True
+    order = [isolated]
+    # Other components are started from their lowest-degree vertex first
+    for start in by_degree[len(isolated):].tolist():
+        if not visited[start]:
+            start = _pseudo_peripheral(csr, start, degree, scratch)
+            order.append(_level_order(csr, start, visited, key=degree))
+    return np.concatenate(order)[::-1].copy() if order else np.zeros(0, dtype=np.int64)
+
+
+def degree_order(csr, descending=True):
+    """
+    Order the vertices by degree, so that the hubs most traversals touch share a few cache lines.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+    - descending (bool): True to put the highest degrees first.
+
+    Returns:
+    - np.ndarray: order, with order[new ID] = original ID. Ties keep their original order.
+    """
+    degree = csr.degree()
+    return np.argsort(-degree if descending else degree, kind='stable')
+
+
+def locality(csr) -> dict:
+    """
+    Measure how far apart the IDs of adjacent vertices are.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+
+    Returns:
+    - dict: bandwidth (largest ID difference across an arc), average_gap (mean ID difference across an arc) and
+      average_log_gap (mean log2(1 + difference), a proxy for cache lines and compressed adjacency size).
+    """
+    if csr.n_arcs == 0:
+        return {'bandwidth': 0, 'average_gap': 0.0, 'average_log_gap': 0.0}
+    gaps = np.abs(np.repeat(np.arange(csr.n_nodes), csr.degree()) - csr.indices)
+    return {'bandwidth': int(gaps.max()), 'average_gap': float(gaps.mean()), 'average_log_gap': float(np.log2(1 + gaps).mean())}
+
+
+class Reordering:
+    """
+    A vertex relabelling, applied consistently to the CSR, coordinates, edge lists and traversal results.
+
+    Parameters:
+    - order (np.ndarray): order[new ID] = original ID.
+    - method (str): Name of the ordering, for reports.
+
+    Example Usage:
+    ```python
+    reordering = Reordering.compute(random_graph.get_csr, method='rcm')
+    csr = reordering.apply_csr(random_graph.get_csr)
+    print(reordering.report(random_graph.get_csr, csr))
+    parent, distance = csr.bfs_tree(reordering.rank[source])
+    parent, distance = reordering.parents_to_original(parent), reordering.to_original(distance)
+    ```
+
+    Attributes:
+    - order (np.ndarray): order[new ID] = original ID.
+    - rank (np.ndarray): rank[original ID] = new ID, the inverse permutation.
+    """
+    METHODS = {'bfs': bfs_order, 'rcm': reverse_cuthill_mckee, 'degree': degree_order}
+
+    def __init__(self, order, method=''):
+        self.order = np.asarray(order, dtype=np.int64)
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+        self.method = method
+
+    @classmethod
+    def compute(cls, csr, method='rcm'):
+        """
+        Parameters:
+        - csr (CSRGraph): The graph.
+        - method (str): 'bfs', 'rcm' (reverse Cuthill-McKee) or 'degree'.
+
+        Returns:
+        - Reordering: The relabelling.
+        """
+        if method not in cls.METHODS:
+            raise ValueError("Unknown ordering {!r}. Use one of {}".format(method, sorted(cls.METHODS)))
+        return cls(cls.METHODS[method](csr), method)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __repr__(self):
+        return "Reordering(method={!r}, nodes={})".format(self.method, len(self.order))
+
+    def apply_csr(self, csr) -> CSRGraph:
+        """
+        Returns:
+        - CSRGraph: The relabelled graph, with sorted neighbour ranges.
+        """
+        sources = self.rank[np.repeat(np.arange(csr.n_nodes), csr.degree())]
+        # Relabel the arcs as they are: undirected CSRs already hold both directions of every edge
+        relabelled = CSRGraph.from_edge_array(np.column_stack([sources, self.rank[csr.indices]]), csr.n_nodes, True)
+        relabelled.is_directed = csr.is_directed
+        return relabelled
+
+    def apply_coordinates(self, coordinates) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: Per-vertex rows (e.g. Graph3D.node_coordinates) in the new order.
+        """
+        return np.asarray(coordinates)[self.order]
+
+    def apply_edges(self, edges, weights=None):
+        """
+        Relabel an edge list and sort it by new (source, target), so that edge IDs follow the vertex order too.
+
+        Parameters:
+        - edges (np.ndarray): (n_edges, 2) edge array, e.g. RandomGraph.get_edge_array.
+        - weights (np.ndarray): Optional per-edge values to carry along.
+
+        Returns:
+        - tuple: (edges, edge_order, weights) where edge_order[new edge ID] = original edge ID, and weights is
+          None if none were given.
+        """
+        edges = self.rank[np.asarray(edges, dtype=np.int64).reshape(-1, 2)]
+        edge_order = np.lexsort((edges[:, 1], edges[:, 0]))
+        return edges[edge_order], edge_order, (None if weights is None else np.asarray(weights)[edge_order])
+
+    def to_original(self, values) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: A per-vertex array indexed by new IDs (distances, labels...) re-indexed by original IDs.
+        """
+        return np.asarray(values)[self.rank]
+
+    def original_ids(self, vertices) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: The original IDs of new vertex IDs; negative entries (e.g. -1 for none) are kept.
+        """
+        vertices = np.asarray(vertices)
+        return np.where(vertices >= 0, self.order[np.maximum(vertices, 0)], vertices)
+
+    def parents_to_original(self, parent) -> np.ndarray:
+        """
+        Returns:
+        - np.ndarray: A parent array of the relabelled graph as a parent array of the original graph.
+        """
+        return self.original_ids(self.to_original(parent))
+
+    def report(self, before, after=None) -> dict:
+        """
+        Compare the locality of the graph before and after the relabelling.
+
+        Parameters:
+        - before (CSRGraph): The original graph.
+        - after (CSRGraph): The relabelled graph, computed with apply_csr if None.
+
+        Returns:
+        - dict: The locality metrics before and after, and the reduction factors (before / after).
+        """
+        after = locality(self.apply_csr(before) if after is None else after)
+        before = locality(before)
+        return {'method': self.method, 'before': before, 'after': after,
+                'reduction': {key: (before[key] / after[key] if after[key] else float('inf')) for key in before}}
+
+
+def reorder_graph(random_graph, method='rcm', coordinates=None):
+    """
+    Relabel a RandomGraph before large traversals, so vertices visited together sit close in memory.
+
+    Parameters:
+    - random_graph (RandomGraph): The graph.
+    - method (str): 'bfs', 'rcm' (reverse Cuthill-McKee) or 'degree'.
+    - coordinates (np.ndarray): Optional per-vertex layout, e.g. Graph3D.node_coordinates.
+
+    Returns:
+    - tuple: (graph, reordering, edge_order, coordinates): the relabelled RandomGraph with its edges sorted by new
+      IDs and its weights carried along, the Reordering, edge_order[new edge ID] = original edge ID, and the
+      reordered coordinates (None if none were given).
+
+    Example Usage:
+    ```python
+    graph, reordering, edge_order, coordinates = reorder_graph(random_graph, 'rcm', scene.node_coordinates)
+    print(reordering.report(random_graph.get_csr, graph.get_csr))
+    ```
+    """
+    reordering = Reordering.compute(random_graph.get_csr, method)
+    edges, edge_order, weights = reordering.apply_edges(random_graph.get_edge_array, random_graph.weights)
+    graph = type(random_graph).from_edges(random_graph.n_nodes, edges, random_graph.is_directed, random_graph.verbose)
+    graph.set_edge_weights(weights)
+    return graph, reordering, edge_order, (None if coordinates is None else reordering.apply_coordinates(coordinates))
@@ -0,0 +1,258 @@
+import numpy as np
+
+from traversal import Discover, EdgeEvent, Finish
+
+
+class RenderSample:
+    """
+    A subgraph chosen to stand for the whole graph on screen: some vertices and every edge between them.
+
+    Parameters:
+    - vertices (array-like): Original IDs of the sampled vertices.
+    - edges (np.ndarray): (n_edges, 2) edge array of the whole graph, e.g. RandomGraph.get_edge_array.
+    - n_nodes (int): Number of vertices of the whole graph.
+    - method (str): Name of the sampler, for reports.
+
+    Attributes:
+    - vertices (np.ndarray): Sorted original IDs of the sampled vertices.
+    - edge_ids (np.ndarray): Original IDs of the edges with both endpoints sampled.
+    - node_index (np.ndarray): Position of every original vertex in vertices, -1 if not sampled.
+    - edge_index (np.ndarray): Position of every original edge in edge_ids, -1 if not sampled.
+    """
+
+    def __init__(self, vertices, edges, n_nodes, method=''):
+        self.vertices = np.unique(np.asarray(vertices, dtype=np.int64))
+        self.node_index = np.full(n_nodes, -1, dtype=np.int64)
+        self.node_index[self.vertices] = np.arange(len(self.vertices))
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.edge_ids = np.flatnonzero((self.node_index[edges[:, 0]] >= 0) & (self.node_index[edges[:, 1]] >= 0))
+        self.edge_index = np.full(len(edges), -1, dtype=np.int64)
+        self.edge_index[self.edge_ids] = np.arange(len(self.edge_ids))
+        self.method = method
+
+    def __repr__(self):
+        return "RenderSample(method={!r}, nodes={}/{}, edges={}/{})".format(
+            self.method, len(self.vertices), len(self.node_index), len(self.edge_ids), len(self.edge_index))
+
+    def local_node(self, vertex):
+        """
+        Returns:
+        - int: Position of an original vertex in the sample, None if it is not drawn.
+        """
+        index = self.node_index[vertex]
+        return int(index) if index >= 0 else None
+
+    def local_edge(self, edge):
+        """
+        Returns:
+        - int: Position of an original edge in the sample, None if it is not drawn (or edge is None).
+        """
+        if edge is None:
+            return None
+        index = self.edge_index[edge]
+        return int(index) if index >= 0 else None
+
+
+def snowball_sample(csr, size, seeds=None, rng=None) -> np.ndarray:
+    """
+    Sample the first vertices reached by a BFS: dense neighbourhoods that keep the local structure of the graph.
+
+    All the searches share one visited mask and stop as soon as size vertices are taken, so the cost is that of the
+    part of the graph explored, not of a full traversal per seed.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+    - size (int): Number of vertices to keep.
+    - seeds (iterable): Vertices to grow the snowball from, in order. None for random seeds. More seeds are drawn
+      when their components hold fewer than size vertices.
+    - rng (np.random.Generator): Random source for the seeds.
+
+    Returns:
+    - np.ndarray: The sampled vertices.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    size = min(size, csr.n_nodes)
+    taken = np.zeros(csr.n_nodes, dtype=bool)
+    seeds = iter([] if seeds is None else seeds)
+    # Extra seeds come from one random permutation, skipping the vertices already taken
+    candidates = None
+    position = 0
+    count = 0
+    while count < size:
+        seed = next(seeds, None)
+        if seed is None:
+            if candidates is None:
+                candidates = rng.permutation(csr.n_nodes)
+            while taken[candidates[position]]:
+                position += 1
+            seed = int(candidates[position])
+        if taken[seed]:
+            continue
+        frontier = np.array([seed], dtype=np.int64)
+        while frontier.size > 0 and count < size:
+            frontier = frontier[:size - count]
+            taken[frontier] = True
+            count += len(frontier)
+            _, targets = csr.gather(frontier)
+            frontier = np.unique(targets[~taken[targets]])
+    return np.flatnonzero(taken)
+
+
+def top_degree_sample(csr, size) -> np.ndarray:
+    """
+    Sample the vertices of highest degree: the hubs most paths run through.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+    - size (int): Number of vertices to keep.
+
+    Returns:
+    - np.ndarray: The sampled vertices.
+    """
+    return np.argsort(-csr.degree(), kind='stable')[:size]
+
+
+def level_sample(csr, source, size, rng=None) -> np.ndarray:
+    """
+    Sample vertices level by level of a BFS from source, so that the drawn traversal keeps the shape of the real
+    one: every level gets a share of the sample proportional to its size (at least one vertex), and within a level,
+    vertices whose BFS parent is sampled come first, so the drawn tree stays connected as far as possible.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+    - source (int): Root of the traversal being drawn.
+    - size (int): Number of vertices to keep, roughly: small levels are never dropped.
+    - rng (np.random.Generator): Random source for the choice within a level.
+
+    Returns:
+    - np.ndarray: The sampled vertices, within the component of source.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    parent, distance = csr.bfs_tree(source)
+    reached = np.count_nonzero(distance >= 0)
+    taken = np.zeros(csr.n_nodes, dtype=bool)
+    taken[source] = True
+    for level in range(1, int(distance.max()) + 1):
+        members = np.flatnonzero(distance == level)
+        quota = max(1, int(round(size * len(members) / reached)))
+        # Random order, then vertices hanging from the sample first
+        members = members[rng.permutation(len(members))]
+        members = members[np.argsort(~taken[parent[members]], kind='stable')]
+        taken[members[:quota]] = True
+    return np.flatnonzero(taken)
+
+
+def sample_for_rendering(random_graph, size, method='snowball', source=None, seed=None) -> RenderSample:
+    """
+    Choose the subgraph to draw for a graph too large to put on screen.
+
+    Parameters:
+    - random_graph (RandomGraph): The graph.
+    - size (int): Number of vertices to draw.
+    - method (str): 'snowball' (BFS neighbourhood of source), 'degree' (top-degree vertices) or 'level' (a share
+      of every BFS level from source).
+    - source (int): Traversal root for 'snowball' and 'level', None for a random vertex.
+    - seed (int): Seed of the random choices.
+
+    Returns:
+    - RenderSample: The sample, with mappings between original and drawn vertex and edge IDs.
+
+    Example Usage:
+    ```python
+    sample = sample_for_rendering(random_graph, 500, method='level', source=0)
+    print(sample)
+    ```
+    """
+    rng = np.random.default_rng(seed)
+    csr = random_graph.get_csr
+    if source is None:
+        source = int(rng.integers(csr.n_nodes))
+    if method == 'snowball':
+        vertices = snowball_sample(csr, size, [source], rng)
+    elif method == 'degree':
+        vertices = top_degree_sample(csr, size)
+    elif method == 'level':
+        vertices = level_sample(csr, source, size, rng)
+    else:
+        raise ValueError("Unknown sampling method {!r}. Use 'snowball', 'degree' or 'level'".format(method))
+    return RenderSample(vertices, random_graph.get_edge_array, csr.n_nodes, method)
+
+
+class HiddenEventCounter:
+    """
+    Per-level counts of the traversal events that happened outside the drawn sample.
+
+    Levels are the traversal depths of Discover events; Finish and edge events count at the level of the vertex
+    they leave.
+
+    Parameters:
+    - n_nodes (int): Number of vertices of the whole graph.
+    - refresh_every (int): Ask for a display refresh every refresh_every hidden events, besides every new level.
+
+    Attributes:
+    - discovered (list): Hidden Discover events per level.
+    - finished (list): Hidden Finish events per level.
+    - edges (list): Hidden edge scans per level.
+    - total (int): Hidden events so far.
+    """
+
+    def __init__(self, n_nodes, refresh_every=1000):
+        self.vertex_level = np.zeros(n_nodes, dtype=np.int32)
+        self.refresh_every = refresh_every
+        self.discovered = []
+        self.finished = []
+        self.edges = []
+        self.total = 0
+
+    def _at(self, level):
+        while len(self.discovered) <= level:
+            self.discovered.append(0)
+            self.finished.append(0)
+            self.edges.append(0)
+        return level
+
+    def track(self, event):
+        """
+        Remember the level of a drawn vertex, so the hidden edges leaving it are counted at the right level.
+        """
+        if isinstance(event, Discover):
+            self.vertex_level[event.vertex] = event.level
+
+    def record(self, event) -> bool:
+        """
+        Count a hidden event.
+
+        Returns:
+        - bool: True if the display should be refreshed: the event opened a new level, or refresh_every more
+          events were hidden.
+        """
+        n_levels = len(self.discovered)
+        if isinstance(event, Discover):
+            self.vertex_level[event.vertex] = event.level
+            level = self._at(event.level)
+            self.discovered[level] += 1
+        elif isinstance(event, Finish):
+            level = self._at(int(self.vertex_level[event.vertex]))
+            self.finished[level] += 1
+        elif isinstance(event, EdgeEvent):
+            level = self._at(int(self.vertex_level[event.source]))
+            self.edges[level] += 1
+        else:
+            return False
+        self.total += 1
+        return len(self.discovered) > n_levels or self.total % self.refresh_every == 0
+
+    def lines(self, max_levels=10) -> list:
+        """
+        Returns:
+        - list of str: One line per level for the on-screen counters, the deepest levels merged into the last one.
+        """
+        lines = []
+        for level in range(len(self.discovered)):
+            if level == max_levels - 1 and len(self.discovered) > max_levels:
+                lines.append('levels {}+: +{} vertices, {} finished, {} edges hidden'.format(
+                    level, sum(self.discovered[level:]), sum(self.finished[level:]), sum(self.edges[level:])))
+                break
+            lines.append('level {}: +{} vertices, {} finished, {} edges hidden'.format(
+                level, self.discovered[level], self.finished[level], self.edges[level]))
+        return lines
@@ -0,0 +1,314 @@
+import heapq
+import math
+from collections import deque
+
+import numpy as np
+
+
+def _walk_to_root(parents, node):
+    # Follow a parent dictionary from node back to the vertex whose parent is -1
+    path = []
+    while node != -1:
+        path.append(node)
+        node = parents[node]
+    return path
+
+
+def bidirectional_bfs(adjacency_list, source, target, reverse_adjacency_list=None):
+    """
+    Find a shortest (fewest hops) path between two vertices by growing a BFS from each end until they meet.
+
+    Every step expands one whole level of the smaller frontier, so the explored region stays close to two balls of
+    half the distance instead of one ball of the full distance.
+
+    Parameters:
+    - adjacency_list (list of lists): Adjacency list of the graph, indexed by vertex.
+    - source (int): Start vertex.
+    - target (int): End vertex.
+    - reverse_adjacency_list (list of lists): In-neighbours of each vertex, required for directed graphs.
+      Defaults to adjacency_list, which is correct for undirected graphs.
+
+    Returns:
+    - list: Vertices from source to target, ready for Graph3D.draw_path(path=...). Empty if target is unreachable.
+    """
+    if reverse_adjacency_list is None:
+        reverse_adjacency_list = adjacency_list
+    if source == target:
+        return [source]
+
+    parents_f, parents_b = {source: -1}, {target: -1}
+    depth_f, depth_b = {source: 0}, {target: 0}
+    frontier_f, frontier_b = [source], [target]
+    while frontier_f and frontier_b:
+        if len(frontier_f) <= len(frontier_b):
+            frontier, parents, depth, other_depth, adjacency = frontier_f, parents_f, depth_f, depth_b, adjacency_list
+        else:
+            frontier, parents, depth, other_depth, adjacency = frontier_b, parents_b, depth_b, depth_f, reverse_adjacency_list
+
+        # Finish the whole level before stopping: meeting points found in it can still differ in length
+        next_frontier = []
+        meeting, best_length = None, None
+        for v in frontier:
+            for adj_n in adjacency[v]:
+                if adj_n in parents:
+                    continue
+                parents[adj_n] = v
+                depth[adj_n] = depth[v] + 1
+                next_frontier.append(adj_n)
+                if adj_n in other_depth:
+                    length = other_depth[adj_n]
+                    if best_length is None or length < best_length:
+                        meeting, best_length = adj_n, length
+
+        if meeting is not None:
+            return _walk_to_root(parents_f, meeting)[::-1] + _walk_to_root(parents_b, meeting)[1:]
+
+        if frontier is frontier_f:
+            frontier_f = next_frontier
+        else:
+            frontier_b = next_frontier
+    return []
+
+
+def dijkstra(incidence_list, weights, source):
+    """
+    Single-source shortest paths with a binary heap and lazy deletion: stale heap entries are skipped when popped
+    instead of being decreased in place.
+
+    Parameters:
+    - incidence_list (list of lists): For each vertex, a list of (neighbour, edge ID) pairs.
+    - weights (array-like): Non-negative weight of each edge, indexed by edge ID.
+    - source (int): Start vertex.
+
+    Returns:
+    - tuple: (parent, distance) lists, -1 and inf for unreachable vertices.
+    """
+    n_nodes = len(incidence_list)
+    parent = [-1] * n_nodes
+    distance = [math.inf] * n_nodes
+    distance[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if d > distance[v]:
+            continue
+        for adj_n, edge in incidence_list[v]:
+            candidate = d + weights[edge]
+            if candidate < distance[adj_n]:
+                distance[adj_n] = candidate
+                parent[adj_n] = v
+                heapq.heappush(heap, (candidate, adj_n))
+    return parent, distance
+
+
+def dial(incidence_list, weights, source, max_weight=None):
+    """
+    Single-source shortest paths with Dial's bucket queue, for small non-negative integer weights.
+
+    Tentative distances live in max_weight + 1 circular buckets, so every queue operation is O(1) and the whole
+    search is O(V + E + V * max_weight) in the worst case.
+
+    Parameters:
+    - incidence_list (list of lists): For each vertex, a list of (neighbour, edge ID) pairs.
+    - weights (array-like): Non-negative integer weight of each edge, indexed by edge ID.
+    - source (int): Start vertex.
+    - max_weight (int): Largest edge weight, computed from weights if None.
+
+    Returns:
+    - tuple: (parent, distance) lists, -1 and inf for unreachable vertices.
+    """
+    n_nodes = len(incidence_list)
+    if max_weight is None:
+        max_weight = int(max(weights, default=0))
+    parent = [-1] * n_nodes
+    distance = [math.inf] * n_nodes
+    distance[source] = 0
+    buckets = [[] for _ in range(max_weight + 1)]
+    buckets[0].append(source)
+    pending = 1
+    d = 0
+    while pending:
+        bucket = buckets[d % len(buckets)]
+        while bucket:
+            v = bucket.pop()
+            pending -= 1
+            if distance[v] != d:
+                continue
+            for adj_n, edge in incidence_list[v]:
+                candidate = d + int(weights[edge])
+                if candidate < distance[adj_n]:
+                    distance[adj_n] = candidate
+                    parent[adj_n] = v
+                    buckets[candidate % len(buckets)].append(adj_n)
+                    pending += 1
+        d += 1
+    return parent, distance
+
+
+def zero_one_bfs(incidence_list, weights, source):
+    """
+    Single-source shortest paths for edge weights in {0, 1}, with a deque: 0-edges push to the front, 1-edges to
+    the back. Runs in O(V + E).
+
+    Parameters:
+    - incidence_list (list of lists): For each vertex, a list of (neighbour, edge ID) pairs.
+    - weights (array-like): Weight of each edge, 0 or 1, indexed by edge ID.
+    - source (int): Start vertex.
+
+    Returns:
+    - tuple: (parent, distance) lists, -1 and inf for unreachable vertices.
+    """
+    n_nodes = len(incidence_list)
+    parent = [-1] * n_nodes
+    distance = [math.inf] * n_nodes
+    distance[source] = 0
+    frontier = deque([source])
+    while frontier:
+        v = frontier.popleft()
+        for adj_n, edge in incidence_list[v]:
+            weight = weights[edge]
+            candidate = distance[v] + weight
+            if candidate < distance[adj_n]:
+                distance[adj_n] = candidate
+                parent[adj_n] = v
+                if weight == 0:
+                    frontier.appendleft(adj_n)
+                else:
+                    frontier.append(adj_n)
+    return parent, distance
+
+
+def weighted_shortest_paths(incidence_list, weights, source, method='auto', max_bucket_weight=64):
+    """
+    Single-source weighted shortest paths, picking the algorithm from the range of the weights.
+
+    Parameters:
+    - incidence_list (list of lists): For each vertex, a list of (neighbour, edge ID) pairs.
+    - weights (array-like): Non-negative weight of each edge, indexed by edge ID.
+    - source (int): Start vertex.
+    - method (str): 'auto', 'dijkstra', 'dial' or '0-1'. With 'auto', 0/1 weights use 0-1 BFS, integer weights up
+      to max_bucket_weight use Dial's buckets and anything else uses Dijkstra.
+    - max_bucket_weight (int): Largest integer weight for which 'auto' picks Dial's algorithm.
+
+    Returns:
+    - tuple: (parent, distance) lists, -1 and inf for unreachable vertices. parent can be assigned to
+      Graph3D.parent to animate paths with draw_path.
+    """
+    weights = np.asarray(weights)
+    if weights.size > 0 and weights.min() < 0:
+        raise ValueError("Edge weights must be non-negative, got minimum weight {}".format(weights.min()))
+    if method == 'auto':
+        is_integer = weights.size == 0 or bool(np.all(weights == np.round(weights)))
+        max_weight = weights.max() if weights.size > 0 else 0
+        if is_integer and max_weight <= 1:
+            method = '0-1'
+        elif is_integer and max_weight <= max_bucket_weight:
+            method = 'dial'
+        else:
+            method = 'dijkstra'
+
+    weight_list = weights.tolist()
+    if method == '0-1':
+        return zero_one_bfs(incidence_list, weight_list, source)
+    if method == 'dial':
+        return dial(incidence_list, [int(w) for w in weight_list], source)
+    if method == 'dijkstra':
+        return dijkstra(incidence_list, weight_list, source)
+    raise ValueError("Unknown shortest path method {!r}".format(method))
+
+
+class AStarResult:
+    """
+    Outcome of an A* query.
+
+    Attributes:
+    - path (list): Vertices from source to target, empty if target is unreachable.
+    - distance (float): Length of the path, inf if target is unreachable.
+    - expanded (int): Number of vertices taken off the open set and expanded.
+    - steps (list): One (vertex, opened) pair per expansion, where opened lists the vertices added to or improved
+      in the open set by it. Only recorded when requested, for animations.
+    """
+    __slots__ = ('path', 'distance', 'expanded', 'steps')
+
+    def __init__(self, path, distance, expanded, steps):
+        self.path = path
+        self.distance = distance
+        self.expanded = expanded
+        self.steps = steps
+
+    def __repr__(self):
+        return "AStarResult(hops={}, distance={:.3f}, expanded={})".format(max(len(self.path) - 1, 0), self.distance, self.expanded)
+
+
+def euclidean_weights(edges, coordinates) -> np.ndarray:
+    """
+    Weight every edge with the Euclidean distance between its end points.
+
+    Parameters:
+    - edges (array-like): An (n_edges, 2) array of (source, target) rows.
+    - coordinates (array-like): An (n_nodes, 3) array of vertex positions.
+
+    Returns:
+    - np.ndarray: One weight per edge, aligned with edges.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    coordinates = np.asarray(coordinates, dtype=float)
+    return np.linalg.norm(coordinates[edges[:, 0]] - coordinates[edges[:, 1]], axis=1)
+
+
+def astar(incidence_list, weights, coordinates, source, target, record_steps=False):
+    """
+    Point-to-point shortest path guided by the straight-line distance to the target.
+
+    With Euclidean edge weights the straight-line distance never overestimates the remaining path length, so the
+    heuristic is admissible (and consistent) and the returned path is optimal.
+
+    Parameters:
+    - incidence_list (list of lists): For each vertex, a list of (neighbour, edge ID) pairs.
+    - weights (array-like): Weight of each edge, at least the distance between its end points.
+    - coordinates (array-like): An (n_nodes, 3) array of vertex positions, e.g. Graph3D.node_coordinates.
+    - source (int): Start vertex.
+    - target (int): End vertex.
+    - record_steps (bool): True to record the open/closed set evolution for animations.
+
+    Returns:
+    - AStarResult: Path, length, number of expanded vertices and optional expansion steps.
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    heuristic = np.linalg.norm(coordinates - coordinates[target], axis=1).tolist()
+    weights = np.asarray(weights).tolist()
+    n_nodes = len(incidence_list)
+    parent = [-1] * n_nodes
+    distance = [math.inf] * n_nodes
+    closed = [False] * n_nodes
+    distance[source] = 0
+    open_heap = [(heuristic[source], source)]
+    expanded = 0
+    steps = [] if record_steps else None
+    while open_heap:
+        _, v = heapq.heappop(open_heap)
+        if closed[v]:
+            continue
+        closed[v] = True
+        expanded += 1
+        if v == target:
+            if record_steps:
+                steps.append((v, []))
+            break
+        opened = []
+        for adj_n, edge in incidence_list[v]:
+            candidate = distance[v] + weights[edge]
+            if not closed[adj_n] and candidate < distance[adj_n]:
+                distance[adj_n] = candidate
+                parent[adj_n] = v
+                heapq.heappush(open_heap, (candidate + heuristic[adj_n], adj_n))
+                opened.append(adj_n)
+        if record_steps:
+            steps.append((v, opened))
+
+    if distance[target] == math.inf:
+        return AStarResult([], math.inf, expanded, steps)
+    path = [target]
+    while parent[path[-1]] != -1:
+        path.append(parent[path[-1]])
+    return AStarResult(path[::-1], distance[target], expanded, steps)
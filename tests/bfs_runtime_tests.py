@@ -14,11 +14,18 @@ from manim import *
 from manim.camera.camera import Camera
 from manim.constants import ORIGIN, PI, TAU
 from graph import RandomGraph
+from event_logging import EventLogging, get_event_logger, log_event
+from traversal import dfs_events, Discover, Finish, NonTreeEdge
+from checkpoint import SweepCheckpoint
 import numpy as np
 from render_graph import Node, Edge
 
+event_logger = get_event_logger('benchmark')
+
 # Run multiples tests with different numbers of edges and nodes. Each experiment must be timestamped at the beginning
 # and at execution end. Measured times will be plotted in a graph for comparison.
+import atexit
+import logging
 import time
 import unittest
 
@@ -32,6 +39,8 @@ class Graph3D(ThreeDScene):
         n_edges: int = 100, 
         is_bfs_search: bool = True,
         is_directed: bool = False,
+        checkpoint: SweepCheckpoint = None,
+        checkpoint_key: str = None,
         **kwargs):
         
         super().__init__(
@@ -41,7 +50,15 @@ class Graph3D(ThreeDScene):
 
         self._n_nodes = n_nodes
         self._n_edges = n_edges
-        self.random_graph = RandomGraph(self._n_nodes, self._n_edges, is_directed=is_directed)
+        self.checkpoint = checkpoint
+        self.checkpoint_key = checkpoint_key
+        self.started = time.time()
+        # A checkpointed run of the same key resumes on the same graph, from the saved traversal state
+        state = checkpoint.partial(checkpoint_key) if checkpoint is not None else None
+        if state is not None:
+            self.random_graph = RandomGraph.from_edges(state['n_nodes'], state['edges'], is_directed=state['is_directed'])
+        else:
+            self.random_graph = RandomGraph(self._n_nodes, self._n_edges, is_directed=is_directed)
         self.is_bfs_search = is_bfs_search
 
         if len(self.random_graph.get_nodes) > 0:
@@ -57,6 +74,28 @@ class Graph3D(ThreeDScene):
         self.edges_3d: list[VMobject] = []
         
         self.redraw = None
+        self.elapsed = 0.0
+        if state is not None:
+            self.parent, self.node_status, self.edge_status = state['parent'], state['node_status'], state['edge_status']
+            self.queue, self.node_coordinates, self.elapsed = state['queue'], state['node_coordinates'], state['elapsed']
+
+    def _get_checkpoint_state(self):
+        return {
+            'n_nodes': self.random_graph.n_nodes,
+            'edges': self.random_graph.get_edges,
+            'is_directed': self.random_graph.is_directed,
+            'node_coordinates': self.node_coordinates,
+            'queue': self.queue,
+            'parent': self.parent,
+            'node_status': self.node_status,
+            'edge_status': self.edge_status,
+            'elapsed': self.elapsed + time.time() - self.started,
+        }
+
+    def _save_checkpoint(self):
+        # Called between two vertices, when the queue and status arrays are consistent
+        if self.checkpoint is not None:
+            self.checkpoint.save_partial(self.checkpoint_key, self._get_checkpoint_state)
 
     def _generate_sparse_coordinates(self, n_nodes = 0, cube_size = 2.5):
         # Implement your algorithm to generate sparse 3D coordinates here
@@ -110,7 +149,6 @@ class Graph3D(ThreeDScene):
         # Draw a map
         def redraw_map():
             nonlocal cache_nodes, cache_edges
-            print(cache_nodes, self.node_status)
             diff_nodes = diff_arrays(self.node_status, cache_nodes) # Mask function -> Compares two lists of str and returns a binary list
             diff_edges = diff_arrays(self.edge_status, cache_edges) # Mask function -> Compares two lists of str and returns a binary list
             if 1 in diff_nodes:
@@ -118,7 +156,7 @@ class Graph3D(ThreeDScene):
                 node = self.nodes_3d[idx_n]
                 node_animation = AnimationGroup(node.animate.set_fill(color="#FF4500", opacity=1), node.animate.set_stroke(color=ORANGE, opacity=1))
                 self.play(node_animation)
-                print(cache_nodes)
+                log_event(event_logger, 'redraw', node=idx_n, status=self.node_status[idx_n])
             else:
                 warnings.warn("Node status array not changed from previous state. Incorrect call to update graph.", UserWarning)
             if 1 in diff_edges:
@@ -138,7 +176,8 @@ class Graph3D(ThreeDScene):
         if edge > -1:
             self.edge_status[edge] = 'D'
         
-        print('Parent status: {}'.format(self.parent), 'Node status: {}'.format(self.node_status), 'Edge status: {}'.format(self.edge_status))
+        # One O(1) structured record per step instead of printing the whole state: O(V) output per call
+        log_event(event_logger, 'update', node=node, edge=edge, status=node_status, parent=self.parent[node] if node > -1 else -1)
 
 
         # if is_first:
@@ -156,10 +195,12 @@ class Graph3D(ThreeDScene):
                 return self.random_graph.get_edges.index((end_node, start_node))
 
     def do_bfs(self):
-        node = random.choice(self.random_graph.get_nodes)
-        self.queue.append(node)
-        self._update(node = node, node_status='D', is_first=True)
+        if len(self.queue) == 0:  # Otherwise resuming from a checkpoint
+            node = random.choice(self.random_graph.get_nodes)
+            self.queue.append(node)
+            self._update(node = node, node_status='D', is_first=True)
         while len(self.queue) > 0:
+            self._save_checkpoint()
             v = self.queue.pop(0)
             for adj_n in self.random_graph.get_adjacency_list[v]:
                 if self.node_status[adj_n] == 'U':
@@ -173,27 +214,27 @@ class Graph3D(ThreeDScene):
             self._update(node=v, node_status='P', is_first=False)
 
     def do_dfs(self, start_node: int = None):
-        node = start_node
-        self._update(node = start_node, node_status='D', is_first=True)
-        for adj_n in self.random_graph.get_adjacency_list[node]:
-            if self.node_status[adj_n] == 'U':
-                self.parent[adj_n] = node
-                edge = self._find_edge(node, adj_n)
-                self._update(node=adj_n, edge=edge, node_status='D', is_first=False)
-                self.do_dfs(adj_n)
-            if self.node_status[adj_n] == 'D':
-                edge = self._find_edge(node, adj_n)
-                self._update(edge = edge, is_first=False)
-                self.do_dfs(adj_n)
-        self._update(node = node, node_status='P', is_first=False)
-        return
+        # Linear-time DFS: every vertex is entered once and every edge scanned once
+        for event in dfs_events(self.random_graph.get_adjacency_list, start_node, self.random_graph.is_directed):
+            if isinstance(event, Discover):
+                if event.parent == -1:
+                    self._update(node=event.vertex, node_status='D', is_first=True)
+                else:
+                    self.parent[event.vertex] = event.parent
+                    edge = self._find_edge(event.parent, event.vertex)
+                    self._update(node=event.vertex, edge=edge, node_status='D', is_first=False)
+            elif isinstance(event, NonTreeEdge):
+                edge = self._find_edge(event.source, event.target)
+                self._update(edge=edge, is_first=False)
+            elif isinstance(event, Finish):
+                self._update(node=event.vertex, node_status='P', is_first=False)
     
     def _find_path(self, end: int = None):
         path = []
         # Recursive function to build the path from x to the root
         def build_path(node):
             if node == -1:
-                print("Root node reached.")
+                log_event(event_logger, 'path', end=end)
                 return
             else:
                 build_path(self.parent[node])
@@ -220,59 +261,80 @@ class Graph3D(ThreeDScene):
         else:
             self.do_dfs(start_node=0)
 
-def code_to_test(nodes: int = 0, edges: int = 0):
+def sweep_checkpoint():
+    # Resuming is opt-in: with BFS_SWEEP_CHECKPOINT=path, finished tests are skipped and an interrupted traversal
+    # resumes where it stopped. Delete the file (or call reset()) to start the sweep over.
+    path = os.environ.get('BFS_SWEEP_CHECKPOINT')
+    if not path:
+        return None
+    return SweepCheckpoint(path, interval=float(os.environ.get('BFS_SWEEP_CHECKPOINT_INTERVAL', 60)))
+
+def code_to_test(nodes: int = 0, edges: int = 0, sweep: SweepCheckpoint = None):
     # Replace with your actual code
-    graph = Graph3D(n_nodes = nodes, n_edges = edges, is_bfs_search=True)
+    key = '{}x{}'.format(nodes, edges)
+    if sweep is not None and sweep.is_finished(key):
+        return sweep.result(key)
+    graph = Graph3D(n_nodes = nodes, n_edges = edges, is_bfs_search=True, checkpoint=sweep, checkpoint_key=key)
     graph.render(preview=False)
+    # Includes the time spent before a crash when the run was resumed from a checkpoint
+    execution_time = graph.elapsed + time.time() - graph.started
+    if sweep is not None:
+        sweep.mark_finished(key, execution_time)
+    return execution_time
 
 def time_execution_decorator(func):
     def wrapper(*args, **kwargs):
         start_time = time.time()
-        func(*args, **kwargs)
+        execution_time = func(*args, **kwargs)
         end_time = time.time()
-        execution_time = end_time - start_time
+        if execution_time is None:
+            execution_time = end_time - start_time
         args[0].execution_times[func.__name__] = execution_time
     return wrapper
 
 class TestCodeExecutionTime(unittest.TestCase):
 
     execution_times = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sweep = sweep_checkpoint()
     
     @time_execution_decorator
     def test_execution_time_1(self):
-        code_to_test(10, 20)
+        return code_to_test(10, 20, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_2(self):
-        code_to_test(50, 100)
+        return code_to_test(50, 100, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_3(self):
-        code_to_test(100, 200)
+        return code_to_test(100, 200, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_4(self):
-        code_to_test(250, 500)
+        return code_to_test(250, 500, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_5(self):
-        code_to_test(500, 750)
+        return code_to_test(500, 750, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_6(self):
-        code_to_test(1250, 2500)
+        return code_to_test(1250, 2500, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_7(self):
-        code_to_test(3500, 7000)
+        return code_to_test(3500, 7000, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_8(self):
-        code_to_test(6250, 12500)
+        return code_to_test(6250, 12500, self.sweep)
 
     @time_execution_decorator
     def test_execution_time_9(self):
-        code_to_test(15000, 30000)
+        return code_to_test(15000, 30000, self.sweep)
 
 
     # @time_execution_decorator
@@ -292,7 +354,10 @@ class TestCodeExecutionTime(unittest.TestCase):
 
 
 if __name__ == "__main__":
-
+    # BFS_EVENT_LOG=events.jsonl logs 1 in BFS_EVENT_LOG_SAMPLE per-step events, written by a background thread
+    if os.environ.get('BFS_EVENT_LOG'):
+        event_logging = EventLogging(os.environ['BFS_EVENT_LOG'], level=logging.DEBUG, sample_every=int(os.environ.get('BFS_EVENT_LOG_SAMPLE', 1000)))
+        atexit.register(event_logging.start().stop)  # unittest.main exits the interpreter: flush the queue on the way out
     unittest.main()    
     # Print execution times after all tests have run
     print(TestCodeExecutionTime.execution_times)
\ No newline at end of file
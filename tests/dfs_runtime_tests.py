@@ -15,11 +15,17 @@ from manim import *
 from manim.camera.camera import Camera
 from manim.constants import ORIGIN, PI, TAU
 from graph import RandomGraph
+from event_logging import EventLogging, get_event_logger, log_event
+from traversal import dfs_events, Discover, Finish, NonTreeEdge
 import numpy as np
 from render_graph import Node, Edge
 
+event_logger = get_event_logger('benchmark')
+
 # Run multiples tests with different numbers of edges and nodes. Each experiment must be timestamped at the beginning
 # and at execution end. Measured times will be plotted in a graph for comparison.
+import atexit
+import logging
 import time
 import unittest
 
@@ -111,7 +117,6 @@ class Graph3D(ThreeDScene):
         # Draw a map
         def redraw_map():
             nonlocal cache_nodes, cache_edges
-            print(cache_nodes, self.node_status)
             diff_nodes = diff_arrays(self.node_status, cache_nodes) # Mask function -> Compares two lists of str and returns a binary list
             diff_edges = diff_arrays(self.edge_status, cache_edges) # Mask function -> Compares two lists of str and returns a binary list
             if 1 in diff_nodes:
@@ -119,7 +124,7 @@ class Graph3D(ThreeDScene):
                 node = self.nodes_3d[idx_n]
                 node_animation = AnimationGroup(node.animate.set_fill(color="#FF4500", opacity=1), node.animate.set_stroke(color=ORANGE, opacity=1))
                 self.play(node_animation)
-                print(cache_nodes)
+                log_event(event_logger, 'redraw', node=idx_n, status=self.node_status[idx_n])
             else:
                 warnings.warn("Node status array not changed from previous state. Incorrect call to update graph.", UserWarning)
             if 1 in diff_edges:
@@ -139,7 +144,8 @@ class Graph3D(ThreeDScene):
         if edge > -1:
             self.edge_status[edge] = 'D'
         
-        print('Parent status: {}'.format(self.parent), 'Node status: {}'.format(self.node_status), 'Edge status: {}'.format(self.edge_status))
+        # One O(1) structured record per step instead of printing the whole state: O(V) output per call
+        log_event(event_logger, 'update', node=node, edge=edge, status=node_status, parent=self.parent[node] if node > -1 else -1)
 
 
         # if is_first:
@@ -149,12 +155,9 @@ class Graph3D(ThreeDScene):
         #     self.redraw()
 
     def _find_edge(self, start_node: int = None, end_node: int = None):
-        # Go search in self.random_graph.get_edges the tuple corresponding to (start_node, end_node) or viceversa
-        for tuple in self.random_graph.get_edges:
-            if tuple == (start_node, end_node):
-                return self.random_graph.get_edges.index((start_node, end_node))
-            if tuple == (end_node, start_node):
-                return self.random_graph.get_edges.index((end_node, start_node))
+        # Index of (start_node, end_node) or viceversa in self.random_graph.get_edges, through the graph's lookup
+        # table: scanning the edge list for every step would dominate the measured DFS cost
+        return self.random_graph.find_edge(start_node, end_node)
 
     def do_bfs(self):
         node = random.choice(self.random_graph.get_nodes)
@@ -185,27 +188,27 @@ class Graph3D(ThreeDScene):
     #     self._update(node = node, node_status='P', is_first=False)
 
     def do_dfs(self, start_node: int = None):
-        self._update(node = start_node, node_status='D', is_first=True)
-        stack = [start_node]
-        while stack:
-            node = stack.pop()
-            for adj_n in self.random_graph.get_adjacency_list[node]:
-                if self.node_status[adj_n] == 'U':
-                    stack.append(adj_n)
-                    self.parent[adj_n] = node
-                    edge = self._find_edge(node, adj_n)
-                    self._update(node=adj_n, edge=edge, node_status='D', is_first=False)
-                elif self.node_status[adj_n] == 'D':
-                    edge = self._find_edge(node, adj_n)
-                    self._update(edge=edge, is_first=False)
-            self._update(node=node, node_status='P', is_first=False)
+        # Linear-time DFS: every vertex is entered once and every edge scanned once
+        for event in dfs_events(self.random_graph.get_adjacency_list, start_node, self.random_graph.is_directed):
+            if isinstance(event, Discover):
+                if event.parent == -1:
+                    self._update(node=event.vertex, node_status='D', is_first=True)
+                else:
+                    self.parent[event.vertex] = event.parent
+                    edge = self._find_edge(event.parent, event.vertex)
+                    self._update(node=event.vertex, edge=edge, node_status='D', is_first=False)
+            elif isinstance(event, NonTreeEdge):
+                edge = self._find_edge(event.source, event.target)
+                self._update(edge=edge, is_first=False)
+            elif isinstance(event, Finish):
+                self._update(node=event.vertex, node_status='P', is_first=False)
     
     def _find_path(self, end: int = None):
         path = []
         # Recursive function to build the path from x to the root
         def build_path(node):
             if node == -1:
-                print("Root node reached.")
+                log_event(event_logger, 'path', end=end)
                 return
             else:
                 build_path(self.parent[node])
@@ -302,7 +305,10 @@ class TestCodeExecutionTime(unittest.TestCase):
 
 
 if __name__ == "__main__":
-
+    # BFS_EVENT_LOG=events.jsonl logs 1 in BFS_EVENT_LOG_SAMPLE per-step events, written by a background thread
+    if os.environ.get('BFS_EVENT_LOG'):
+        event_logging = EventLogging(os.environ['BFS_EVENT_LOG'], level=logging.DEBUG, sample_every=int(os.environ.get('BFS_EVENT_LOG_SAMPLE', 1000)))
+        atexit.register(event_logging.start().stop)  # unittest.main exits the interpreter: flush the queue on the way out
     unittest.main()    
     # Print execution times after all tests have run
     print(TestCodeExecutionTime.execution_times)
\ No newline at end of file
@@ -0,0 +1,31 @@
+import numpy as np
+from csr import CSRGraph
+
+
+def random_edges(n_nodes, n_edges, seed):
+    """
+    Returns:
+    - np.ndarray: (n_edges, 2) uniformly random vertex pairs, self-loops and repeated pairs included.
+    """
+    return np.random.default_rng(seed).integers(0, n_nodes, size=(n_edges, 2))
+
+
+def random_csr(n_nodes, n_edges, is_directed, seed, simple=False):
+    """
+    Parameters:
+    - n_nodes (int): Number of vertices.
+    - n_edges (int): Number of random pairs drawn.
+    - is_directed (bool): True for a directed graph.
+    - seed (int): Seed of the pairs.
+    - simple (bool): True to drop self-loops and parallel edges.
+
+    Returns:
+    - CSRGraph: The graph of the random pairs.
+    """
+    edges = random_edges(n_nodes, n_edges, seed)
+    if simple:
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        if not is_directed:
+            edges = np.sort(edges, axis=1)
+        edges = np.unique(edges, axis=0)
+    return CSRGraph.from_edge_array(edges, n_nodes, is_directed)
@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from graph import RandomGraph
+from backends import BACKENDS, BackendDispatcher, canonical_labels
+
+# Small graphs of every shape the backends must agree on: sparse with many components, dense, directed, isolated
+GRAPHS = [(1, 0, False), (30, 20, False), (200, 600, False), (500, 4000, False), (30, 20, True), (200, 600, True)]
+
+
+class TestBackendConformance(unittest.TestCase):
+
+    def setUp(self):
+        self.graphs = [RandomGraph(n_nodes, n_edges, is_directed=is_directed) for n_nodes, n_edges, is_directed in GRAPHS]
+        self.reference = BACKENDS['python']
+
+    def _backends(self, operation):
+        return [backend for backend in BACKENDS.values() if backend.supports(operation)]
+
+    def _edges(self, random_graph):
+        return set(map(tuple, random_graph.get_edge_array.tolist()))
+
+    def _assert_tree(self, random_graph, source, parent, reached):
+        # Every reached vertex but the source hangs from a reached vertex through an edge of the graph
+        edges = self._edges(random_graph)
+        self.assertEqual(parent[source], -1)
+        for v in np.flatnonzero(reached):
+            if v == source:
+                continue
+            p = int(parent[v])
+            self.assertTrue(reached[p])
+            self.assertTrue((p, v) in edges or (not random_graph.is_directed and (v, p) in edges))
+
+    def test_bfs(self):
+        for random_graph in self.graphs:
+            _, expected = self.reference.bfs(random_graph, 0)
+            for backend in self._backends('bfs'):
+                with self.subTest(backend=backend.name, graph=random_graph):
+                    parent, distance = backend.bfs(random_graph, 0)
+                    np.testing.assert_array_equal(distance, expected)
+                    self._assert_tree(random_graph, 0, parent, distance >= 0)
+                    # BFS parents sit exactly one level up
+                    child = np.flatnonzero(distance > 0)
+                    np.testing.assert_array_equal(distance[parent[child]], distance[child] - 1)
+
+    def test_dfs(self):
+        for random_graph in self.graphs:
+            _, reachable = self.reference.bfs(random_graph, 0)
+            for backend in self._backends('dfs'):
+                with self.subTest(backend=backend.name, graph=random_graph):
+                    parent, order = backend.dfs(random_graph, 0)
+                    self.assertEqual(order[0], 0)
+                    self.assertEqual(sorted(order.tolist()), np.flatnonzero(reachable >= 0).tolist())
+                    self._assert_tree(random_graph, 0, parent, reachable >= 0)
+                    # Preorder: parents come first, and an undirected DFS leaves no cross edges, so every edge joins
+                    # a vertex to one of its ancestors
+                    position = np.empty(random_graph.n_nodes, dtype=np.int64)
+                    position[order] = np.arange(len(order))
+                    child = order[1:]
+                    self.assertTrue((position[parent[child]] < position[child]).all())
+                    if not random_graph.is_directed:
+                        for source, target in self._edges(random_graph):
+                            if reachable[source] >= 0:
+                                self._assert_ancestor(parent, position, source, target)
+
+    def _assert_ancestor(self, parent, position, source, target):
+        descendant, ancestor = (source, target) if position[source] > position[target] else (target, source)
+        while descendant != -1 and descendant != ancestor:
+            descendant = parent[descendant]
+        self.assertEqual(descendant, ancestor)
+
+    def test_components(self):
+        for random_graph in self.graphs:
+            expected = self.reference.components(random_graph)
+            self.assertEqual(expected.max() + 1, random_graph.get_number_of_connected_components())
+            for backend in self._backends('components'):
+                with self.subTest(backend=backend.name, graph=random_graph):
+                    np.testing.assert_array_equal(backend.components(random_graph), expected)
+
+    def test_unsupported_operation(self):
+        random_graph = self.graphs[0]
+        for backend in BACKENDS.values():
+            with self.subTest(backend=backend.name):
+                with self.assertRaises(ValueError):
+                    backend.run('pagerank', random_graph)
+        with self.assertRaises(ValueError):
+            BackendDispatcher(path=None).run('pagerank', random_graph)
+
+    def test_canonical_labels(self):
+        np.testing.assert_array_equal(canonical_labels([7, 7, 3, 9, 3]), [0, 0, 1, 2, 1])
+
+
+class TestBackendDispatcher(unittest.TestCase):
+
+    def test_calibration_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'calibration.json')
+            dispatcher = BackendDispatcher(path)
+            dispatcher.calibrate(sizes=((50, 100), (2000, 6000)), repeats=1)
+            reloaded = BackendDispatcher(path)
+            self.assertEqual(len(reloaded.timings), len(dispatcher.timings))
+            for operation in ('bfs', 'dfs', 'components'):
+                for n_nodes, n_edges in ((40, 90), (3000, 9000)):
+                    backend = reloaded.select(operation, n_nodes, n_edges)
+                    self.assertTrue(backend.supports(operation))
+                    self.assertIs(backend, dispatcher.select(operation, n_nodes, n_edges))
+
+    def test_default_selection(self):
+        dispatcher = BackendDispatcher(path=None, default_threshold=100)
+        self.assertEqual(dispatcher.select('bfs', 10, 20).name, 'python')
+        self.assertEqual(dispatcher.select('bfs', 1000, 2000).name, 'numpy')
+
+
+if __name__ == '__main__':
+    unittest.main()
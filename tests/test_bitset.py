@@ -0,0 +1,71 @@
+import os
+import pickle
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from bitset import Bitset
+
+
+class TestBitset(unittest.TestCase):
+
+    def test_matches_python_set(self):
+        rng = np.random.default_rng(1)
+        bitset = Bitset(1003)
+        expected = set()
+        for _ in range(3000):
+            index = int(rng.integers(1003))
+            operation = rng.integers(4)
+            if operation == 0:
+                bitset.set(index)
+                expected.add(index)
+            elif operation == 1:
+                bitset.clear(index)
+                expected.discard(index)
+            elif operation == 2:
+                self.assertEqual(bitset.test_and_set(index), index in expected)
+                expected.add(index)
+            else:
+                self.assertEqual(index in bitset, index in expected)
+        self.assertEqual(bitset.count(), len(expected))
+        self.assertEqual(bitset.nonzero().tolist(), sorted(expected))
+
+    def test_bulk_operations(self):
+        rng = np.random.default_rng(2)
+        indices = rng.integers(0, 5000, 4000)
+        bitset = Bitset.from_indices(5000, indices)
+        mask = np.zeros(5000, dtype=bool)
+        mask[indices] = True
+        np.testing.assert_array_equal(bitset.test_many(np.arange(5000)), mask)
+        removed = rng.integers(0, 5000, 1000)
+        bitset.clear_many(removed)
+        mask[removed] = False
+        np.testing.assert_array_equal(bitset.nonzero(), np.flatnonzero(mask))
+        self.assertEqual(bitset.count(), mask.sum())
+        bitset.clear_all()
+        self.assertEqual(bitset.count(), 0)
+
+    def test_scalar_and_bulk_views_share_the_buffer(self):
+        bitset = Bitset(20)
+        bitset.set_many([3, 17])
+        self.assertTrue(bitset.test(3) and bitset.test(17))
+        bitset.set(9)
+        self.assertEqual(bitset.nonzero().tolist(), [3, 9, 17])
+        self.assertEqual((len(bitset), bitset.nbytes), (20, 3))
+
+    def test_pickle_round_trip(self):
+        bitset = Bitset.from_indices(100, [0, 50, 99])
+        copy = pickle.loads(pickle.dumps(bitset))
+        self.assertEqual(copy.nonzero().tolist(), [0, 50, 99])
+        # The numpy view must follow the scalar writes of the copy
+        copy.set(7)
+        self.assertTrue(copy.test_many([7])[0])
+        self.assertFalse(bitset.test(7))
+
+
+if __name__ == '__main__':
+    unittest.main()
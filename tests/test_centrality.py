@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+from collections import deque
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from centrality import BetweennessCache, BetweennessResult, betweenness_centrality
+from csr import CSRGraph
+from graph_fixtures import random_csr
+
+
+def brute_force_betweenness(csr):
+    # Shortest-path counts between every pair, then sigma(s, v) * sigma(v, t) / sigma(s, t) over every ordered pair
+    n_nodes = csr.n_nodes
+    distance = np.full((n_nodes, n_nodes), -1)
+    sigma = np.zeros((n_nodes, n_nodes))
+    for s in range(n_nodes):
+        distance[s, s] = 0
+        sigma[s, s] = 1
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for v in csr.neighbors(u).tolist():
+                if distance[s, v] == -1:
+                    distance[s, v] = distance[s, u] + 1
+                    queue.append(v)
+                if distance[s, v] == distance[s, u] + 1:
+                    sigma[s, v] += sigma[s, u]
+    scores = np.zeros(n_nodes)
+    for v in range(n_nodes):
+        for s in range(n_nodes):
+            for t in range(n_nodes):
+                if len({s, v, t}) == 3 and distance[s, t] > 0 and distance[s, v] >= 0 and distance[v, t] >= 0 \
+                        and distance[s, v] + distance[v, t] == distance[s, t]:
+                    scores[v] += sigma[s, v] * sigma[v, t] / sigma[s, t]
+    return scores if csr.is_directed else scores / 2
+
+
+class TestBetweennessCentrality(unittest.TestCase):
+
+    def test_exact_matches_brute_force(self):
+        for is_directed in (False, True):
+            csr = random_csr(40, 90, is_directed, seed=1, simple=True)
+            with self.subTest(is_directed=is_directed):
+                result = betweenness_centrality(csr)
+                self.assertTrue(result.is_exact)
+                self.assertEqual(result.epsilon, 0.0)
+                np.testing.assert_allclose(result.scores, brute_force_betweenness(csr), atol=1e-9)
+
+    def test_parallel_matches_serial(self):
+        csr = random_csr(120, 300, False, seed=2, simple=True)
+        serial = betweenness_centrality(csr, n_sources=50, seed=5)
+        parallel = betweenness_centrality(csr, n_sources=50, n_workers=3, seed=5)
+        self.assertEqual(parallel.n_sources, 50)
+        np.testing.assert_allclose(parallel.scores, serial.scores)
+
+    def test_adaptive_estimate_within_bound(self):
+        csr = random_csr(300, 900, False, seed=3, simple=True)
+        exact = betweenness_centrality(csr)
+        estimate = betweenness_centrality(csr, epsilon=0.05, delta=0.1, seed=4)
+        self.assertLessEqual(estimate.epsilon, 0.05)
+        self.assertLessEqual(np.abs(estimate.normalized - exact.normalized).max(), estimate.epsilon + 1e-12)
+
+    def test_empty_graph(self):
+        csr = CSRGraph.from_edge_array(np.zeros((0, 2)), 0)
+        for kwargs in ({}, {'n_sources': 10}, {'epsilon': 0.1}):
+            with self.subTest(**kwargs):
+                result = betweenness_centrality(csr, **kwargs)
+                self.assertEqual(len(result.scores), 0)
+                self.assertTrue(result.is_exact)
+
+    def test_top_k_breaks_ties_by_vertex_id(self):
+        result = BetweennessResult(np.array([1.0, 3.0, 2.0, 3.0, 2.0, 0.0]), 6, False)
+        vertices, scores = result.top_k(4)
+        np.testing.assert_array_equal(vertices, [1, 3, 2, 4])
+        np.testing.assert_array_equal(scores, [3.0, 3.0, 2.0, 2.0])
+        self.assertEqual(len(result.top_k(0)[0]), 0)
+        self.assertEqual(len(result.top_k(10)[0]), 6)
+
+
+class TestBetweennessCache(unittest.TestCase):
+
+    def test_round_trip_through_disk(self):
+        csr = random_csr(30, 60, False, seed=6, simple=True)
+        result = betweenness_centrality(csr)
+        key = BetweennessCache.key('abc', None, None, 0.1, None)
+        self.assertNotEqual(key, BetweennessCache.key('abc', 10, None, 0.1, None))
+        with tempfile.TemporaryDirectory() as directory:
+            BetweennessCache(directory).put(key, result)
+            loaded = BetweennessCache(directory).get(key)
+            self.assertIsNotNone(loaded)
+            np.testing.assert_array_equal(loaded.scores, result.scores)
+            self.assertEqual(loaded.n_sources, result.n_sources)
+            self.assertIsNone(BetweennessCache(directory).get(BetweennessCache.key('other')))
+
+
+if __name__ == '__main__':
+    unittest.main()
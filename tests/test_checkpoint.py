@@ -0,0 +1,83 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+from checkpoint import SweepCheckpoint, atomic_dump, load_checkpoint
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise pickle.PicklingError('not today')
+
+
+class TestAtomicDump(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'nested', 'state.ckpt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(load_checkpoint(self.path, 'missing'), 'missing')
+        atomic_dump({'queue': [1, 2, 3]}, self.path)
+        self.assertEqual(load_checkpoint(self.path), {'queue': [1, 2, 3]})
+
+    def test_failed_dump_keeps_previous_checkpoint(self):
+        atomic_dump('previous', self.path)
+        with self.assertRaises(pickle.PicklingError):
+            atomic_dump(['new', Unpicklable()], self.path)
+        self.assertEqual(load_checkpoint(self.path), 'previous')
+        # No temporary file is left behind
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['state.ckpt'])
+
+
+class TestSweepCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'sweep.ckpt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resume(self):
+        sweep = SweepCheckpoint(self.path, interval=0)
+        sweep.mark_finished('100x300', 0.5)
+        self.assertTrue(sweep.save_partial('1000x3000', lambda: {'queue': [4, 5]}))
+
+        resumed = SweepCheckpoint(self.path)
+        self.assertTrue(resumed.is_finished('100x300'))
+        self.assertFalse(resumed.is_finished('1000x3000'))
+        self.assertEqual(resumed.result('100x300'), 0.5)
+        self.assertEqual(resumed.partial('1000x3000'), {'queue': [4, 5]})
+        resumed.mark_finished('1000x3000', 2.0)
+        self.assertIsNone(resumed.partial('1000x3000'))
+        self.assertEqual(SweepCheckpoint(self.path).results(), {'100x300': 0.5, '1000x3000': 2.0})
+
+    def test_partial_saves_are_throttled(self):
+        sweep = SweepCheckpoint(self.path, interval=60)
+        get_state = mock.Mock(return_value='state')
+        self.assertFalse(sweep.save_partial('key', get_state))
+        get_state.assert_not_called()
+        self.assertTrue(sweep.save_partial('key', get_state, force=True))
+        self.assertEqual(SweepCheckpoint(self.path).partial('key'), 'state')
+
+    def test_reset(self):
+        sweep = SweepCheckpoint(self.path)
+        sweep.mark_finished('key')
+        sweep.reset()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(SweepCheckpoint(self.path).is_finished('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
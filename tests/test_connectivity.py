@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+from collections import deque
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from connectivity import UnionFind
+from csr import CSRGraph
+from traversal import bfs_forest_events, dfs_forest_events, Discover
+
+
+def bfs_components(n_nodes, edges):
+    # Component of every vertex by plain BFS, numbered by smallest vertex first
+    adjacency_list = CSRGraph.from_edge_array(edges, n_nodes).to_adjacency_list()
+    labels = [-1] * n_nodes
+    n_components = 0
+    for start in range(n_nodes):
+        if labels[start] != -1:
+            continue
+        labels[start] = n_components
+        queue = deque([start])
+        while queue:
+            for v in adjacency_list[queue.popleft()]:
+                if labels[v] == -1:
+                    labels[v] = n_components
+                    queue.append(v)
+        n_components += 1
+    return np.array(labels), n_components
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def test_union_edges_matches_bfs(self):
+        for n_edges in (0, 50, 150, 400):
+            edges = np.random.default_rng(n_edges).integers(0, 200, size=(n_edges, 2))
+            with self.subTest(n_edges=n_edges):
+                components = UnionFind(200)
+                components.union_edges(edges)
+                expected, n_components = bfs_components(200, edges)
+                self.assertEqual(components.n_components, n_components)
+                np.testing.assert_array_equal(components.component_ids(), expected)
+                labels = components.labels()
+                np.testing.assert_array_equal(np.sort(np.unique(labels)), components.roots())
+                self.assertEqual(sum(components.component_sizes().values()), 200)
+                self.assertEqual(components.component_sizes(), dict(zip(*np.unique(labels, return_counts=True))))
+
+    def test_incremental_unions_match_bulk(self):
+        edges = np.random.default_rng(1).integers(0, 100, size=(120, 2))
+        bulk = UnionFind(100)
+        bulk.union_edges(edges)
+        incremental = UnionFind(100)
+        for source, target in edges.tolist():
+            incremental.union(source, target)
+        self.assertEqual(incremental.n_components, bulk.n_components)
+        # Roots may differ, the partition may not
+        labels, expected = incremental.labels(), bulk.labels()
+        np.testing.assert_array_equal(labels[:, None] == labels[None, :], expected[:, None] == expected[None, :])
+        for source, target in edges.tolist():
+            self.assertEqual(incremental.find(source), incremental.find(target))
+
+    def test_add_node(self):
+        components = UnionFind(3)
+        components.union(0, 1)
+        self.assertEqual(components.add_node(), 3)
+        self.assertEqual(components.n_components, 3)
+        components.union(3, 2)
+        self.assertEqual(components.n_components, 2)
+        self.assertEqual(components.find(3), components.find(2))
+
+
+class TestForestEvents(unittest.TestCase):
+
+    def test_one_tree_per_component(self):
+        edges = np.random.default_rng(2).integers(0, 150, size=(100, 2))
+        adjacency_list = CSRGraph.from_edge_array(edges, 150).to_adjacency_list()
+        components = UnionFind(150)
+        components.union_edges(edges)
+        for forest_events in (bfs_forest_events, dfs_forest_events):
+            with self.subTest(forest_events=forest_events.__name__):
+                discovered = [event for event in forest_events(adjacency_list, components.roots())
+                              if isinstance(event, Discover)]
+                self.assertEqual(sorted(event.vertex for event in discovered), list(range(150)))
+                roots = [event.vertex for event in discovered if event.parent == -1]
+                self.assertEqual(roots, components.roots().tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+import unittest
+from collections import deque
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph, path_from_parents
+from graph_fixtures import random_edges
+
+
+def adjacency_from_edges(n_nodes, edges, is_directed):
+    adjacency_list = [[] for _ in range(n_nodes)]
+    for source, target in edges.tolist():
+        adjacency_list[source].append(target)
+        if not is_directed:
+            adjacency_list[target].append(source)
+    return [sorted(neighbours) for neighbours in adjacency_list]
+
+
+def bfs_distances(adjacency_list, source, max_depth=None):
+    distance = [-1] * len(adjacency_list)
+    distance[source] = 0
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if max_depth is not None and distance[u] == max_depth:
+            continue
+        for v in adjacency_list[u]:
+            if distance[v] == -1:
+                distance[v] = distance[u] + 1
+                queue.append(v)
+    return distance
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.edges = random_edges(100, 250, seed=1)
+
+    def test_adjacency(self):
+        for is_directed in (False, True):
+            csr = CSRGraph.from_edge_array(self.edges, 100, is_directed)
+            expected = adjacency_from_edges(100, self.edges, is_directed)
+            with self.subTest(is_directed=is_directed):
+                self.assertEqual(csr.to_adjacency_list(), expected)
+                np.testing.assert_array_equal(csr.degree(), [len(neighbours) for neighbours in expected])
+                self.assertEqual(csr.n_arcs, len(self.edges) * (1 if is_directed else 2))
+                reverse = csr.reverse().to_adjacency_list()
+                for u in range(100):
+                    for v in expected[u]:
+                        self.assertIn(u, reverse[v])
+
+    def test_gather(self):
+        csr = CSRGraph.from_edge_array(self.edges, 100)
+        frontier = np.array([3, 50, 7, 99])
+        sources, targets = csr.gather(frontier)
+        expected = [(u, v) for u in frontier.tolist() for v in csr.neighbors(u).tolist()]
+        self.assertEqual(list(zip(sources.tolist(), targets.tolist())), expected)
+
+    def test_bfs_tree(self):
+        for is_directed in (False, True):
+            csr = CSRGraph.from_edge_array(self.edges, 100, is_directed)
+            adjacency_list = csr.to_adjacency_list()
+            for max_depth in (None, 2):
+                with self.subTest(is_directed=is_directed, max_depth=max_depth):
+                    parent, distance = csr.bfs_tree(0, max_depth)
+                    self.assertEqual(distance.tolist(), bfs_distances(adjacency_list, 0, max_depth))
+                    for v in np.flatnonzero(distance > 0):
+                        self.assertIn(v, adjacency_list[parent[v]])
+                        path = path_from_parents(parent, v)
+                        self.assertEqual((path[0], path[-1], len(path)), (0, v, distance[v] + 1))
+
+    def test_save_and_load(self):
+        csr = CSRGraph.from_edge_array(self.edges, 100, True)
+        with tempfile.TemporaryDirectory() as directory:
+            csr.save(directory)
+            for mmap in (True, False):
+                loaded = CSRGraph.load(directory, mmap=mmap)
+                self.assertTrue(loaded.is_directed)
+                np.testing.assert_array_equal(loaded.indptr, csr.indptr)
+                np.testing.assert_array_equal(loaded.indices, csr.indices)
+                del loaded
+
+
+if __name__ == '__main__':
+    unittest.main()
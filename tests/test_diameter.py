@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph
+from diameter import DiameterEstimator
+from triangles import undirected_csr
+
+
+def graphs():
+    rng = np.random.default_rng(1)
+    path = np.column_stack([np.arange(29), np.arange(1, 30)])
+    cycle = np.column_stack([np.arange(31), (np.arange(31) + 1) % 31])
+    tree = np.column_stack([np.arange(1, 200), [int(rng.integers(v)) for v in range(1, 200)]])
+    yield 'path', CSRGraph.from_edge_array(path, 30)
+    yield 'cycle', CSRGraph.from_edge_array(cycle, 31)
+    yield 'tree', CSRGraph.from_edge_array(tree, 200)
+    for seed in range(3):
+        yield 'random-{}'.format(seed), CSRGraph.from_edge_array(rng.integers(0, 300, size=(450, 2)), 300)
+    yield 'directed', CSRGraph.from_edge_array(rng.integers(0, 300, size=(500, 2)), 300, True)
+
+
+def brute_force_eccentricities(csr, source):
+    # Eccentricity of every vertex of the component of source, -1 elsewhere
+    csr = undirected_csr(csr)
+    component = csr.bfs_tree(source)[1] >= 0
+    eccentricity = np.full(csr.n_nodes, -1)
+    for v in np.flatnonzero(component):
+        eccentricity[v] = csr.bfs_tree(v)[1].max()
+    return eccentricity
+
+
+class TestDiameterEstimator(unittest.TestCase):
+
+    def test_exact_values(self):
+        for name, csr in graphs():
+            estimator = DiameterEstimator(csr)
+            source = int(np.argmax(undirected_csr(csr).degree()))
+            eccentricity = brute_force_eccentricities(csr, source)
+            inside = eccentricity >= 0
+            with self.subTest(graph=name):
+                np.testing.assert_array_equal(estimator.component, inside)
+                diameter = estimator.diameter()
+                self.assertEqual((diameter.lower, diameter.upper), (eccentricity.max(),) * 2)
+                u, v = diameter.endpoints
+                self.assertEqual(undirected_csr(csr).bfs_tree(u)[1][v], diameter.lower)
+                radius = estimator.radius()
+                self.assertEqual((radius.radius_lower, radius.radius_upper), (eccentricity[inside].min(),) * 2)
+                estimator.eccentricities()
+                np.testing.assert_array_equal(estimator.eccentricity_lower, eccentricity)
+                np.testing.assert_array_equal(estimator.eccentricity_upper, eccentricity)
+
+    def test_bounds_hold_at_every_step(self):
+        for name, csr in graphs():
+            estimator = DiameterEstimator(csr, source=0)
+            eccentricity = brute_force_eccentricities(csr, 0)
+            inside = eccentricity >= 0
+            diameter, radius = eccentricity.max(), eccentricity[inside].min()
+            with self.subTest(graph=name):
+                for bounds in (estimator.bounds(), estimator.double_sweep(), estimator.diameter(exact=False),
+                               estimator.diameter(max_bfs=estimator.n_bfs + 1), estimator.radius(max_bfs=estimator.n_bfs + 1)):
+                    self.assertLessEqual(bounds.lower, diameter)
+                    self.assertGreaterEqual(bounds.upper, diameter)
+                    self.assertLessEqual(bounds.radius_lower, radius)
+                    self.assertGreaterEqual(bounds.radius_upper, radius)
+                    self.assertTrue((estimator.eccentricity_lower[inside] <= eccentricity[inside]).all())
+                    self.assertTrue((estimator.eccentricity_upper[inside] >= eccentricity[inside]).all())
+                for v in np.flatnonzero(inside)[:5]:
+                    self.assertEqual(estimator.eccentricity(int(v)), eccentricity[v])
+
+    def test_empty_graph(self):
+        with self.assertRaises(ValueError):
+            DiameterEstimator(CSRGraph.from_edge_array(np.zeros((0, 2)), 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+import unittest
+from collections import deque
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+from dynamic_bfs import DynamicBFS
+
+
+def bfs_distances(n_nodes, edges, root, is_directed):
+    adjacency_list = [[] for _ in range(n_nodes)]
+    for source, target in edges:
+        adjacency_list[source].append(target)
+        if not is_directed:
+            adjacency_list[target].append(source)
+    distance = [-1] * n_nodes
+    distance[root] = 0
+    queue = deque([root])
+    while queue:
+        u = queue.popleft()
+        for v in adjacency_list[u]:
+            if distance[v] == -1:
+                distance[v] = distance[u] + 1
+                queue.append(v)
+    return adjacency_list, distance
+
+
+class TestDynamicBFS(unittest.TestCase):
+
+    def _assert_tree(self, dynamic, edges, n_nodes):
+        _, expected = bfs_distances(n_nodes, edges, dynamic.root, dynamic.is_directed)
+        self.assertEqual(dynamic.distance, expected)
+        for v in range(n_nodes):
+            parent = dynamic.parent[v]
+            if v == dynamic.root or expected[v] == -1:
+                self.assertEqual(parent, -1)
+                continue
+            self.assertTrue((parent, v) in edges or (not dynamic.is_directed and (v, parent) in edges))
+            self.assertEqual(expected[parent], expected[v] - 1)
+            path = dynamic.path_to(v)
+            self.assertEqual((path[0], path[-1], len(path)), (dynamic.root, v, expected[v] + 1))
+
+    def test_random_updates(self):
+        n_nodes = 40
+        for is_directed in (False, True):
+            rng = random.Random(1 if is_directed else 0)
+            edges = set()
+            while len(edges) < 60:
+                source, target = rng.sample(range(n_nodes), 2)
+                if is_directed or (target, source) not in edges:
+                    edges.add((source, target))
+            adjacency_list, _ = bfs_distances(n_nodes, edges, 0, is_directed)
+            dynamic = DynamicBFS(adjacency_list, 0, is_directed)
+            with self.subTest(is_directed=is_directed):
+                self._assert_tree(dynamic, edges, n_nodes)
+                for _ in range(300):
+                    if edges and rng.random() < 0.5:
+                        # Prefer tree edges, whose removal needs a repair
+                        tree_edges = [edge for edge in edges if dynamic.parent[edge[1]] == edge[0]]
+                        edge = rng.choice(tree_edges or sorted(edges))
+                        edges.discard(edge)
+                        dynamic.remove_edge(*edge)
+                    else:
+                        source, target = rng.sample(range(n_nodes), 2)
+                        if (source, target) in edges or (not is_directed and (target, source) in edges):
+                            continue
+                        edges.add((source, target))
+                        dynamic.add_edge(source, target)
+                    self._assert_tree(dynamic, edges, n_nodes)
+
+    def test_unreachable_path_is_empty(self):
+        dynamic = DynamicBFS([[1], [0], []], 0)
+        self.assertEqual(dynamic.path_to(2), [])
+        self.assertEqual(dynamic.add_edge(1, 2), 1)
+        self.assertEqual(dynamic.path_to(2), [0, 1, 2])
+        self.assertEqual(dynamic.remove_edge(0, 1), 2)
+        self.assertEqual(dynamic.path_to(2), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+from event_logging import EventLogging, SamplingFilter, get_event_logger, log_event
+
+
+class TestEventLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'events.jsonl')
+        self.logger = get_event_logger('test')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read(self, path=None):
+        with open(path or self.path) as log_file:
+            return [json.loads(line) for line in log_file]
+
+    def test_json_lines(self):
+        with EventLogging(self.path, level=logging.DEBUG):
+            log_event(self.logger, 'update', node=3, edge=-1, status='D')
+            log_event(self.logger, 'bfs_root', level=logging.INFO, node=0)
+        entries = self._read()
+        self.assertEqual([entry['event'] for entry in entries], ['update', 'bfs_root'])
+        self.assertEqual((entries[0]['node'], entries[0]['status'], entries[0]['level']), (3, 'D', 'DEBUG'))
+        self.assertEqual(entries[1]['logger'], 'bfs_dfs.test')
+
+    def test_level_and_sampling(self):
+        with EventLogging(self.path, level=logging.DEBUG, sample_every=10):
+            for node in range(95):
+                log_event(self.logger, 'update', node=node)
+                log_event(self.logger, 'redraw', node=node)
+            log_event(self.logger, 'failure', level=logging.WARNING)
+            log_event(self.logger, 'failure', level=logging.WARNING)
+            self.logger.debug('plain')
+            self.logger.debug('plain')
+        entries = self._read()
+        # 1 in 10 of every event name, counted separately; warnings always pass
+        self.assertEqual([entry['node'] for entry in entries if entry['event'] == 'update'], list(range(0, 95, 10)))
+        self.assertEqual([entry['node'] for entry in entries if entry['event'] == 'redraw'], list(range(0, 95, 10)))
+        self.assertEqual(sum(entry['event'] == 'failure' for entry in entries), 2)
+        self.assertEqual(sum(entry['event'] == 'plain' for entry in entries), 1)
+
+        info_path = os.path.join(self.directory.name, 'info.jsonl')
+        with EventLogging(info_path, level=logging.INFO):
+            log_event(self.logger, 'update', node=0)
+            log_event(self.logger, 'bfs_root', level=logging.INFO, node=0)
+        self.assertEqual([entry['event'] for entry in self._read(info_path)], ['bfs_root'])
+
+    def test_level_restored(self):
+        previous = get_event_logger().level
+        with EventLogging(self.path, level=logging.DEBUG):
+            self.assertTrue(self.logger.isEnabledFor(logging.DEBUG))
+        self.assertEqual(get_event_logger().level, previous)
+        # Once stopped, events are dropped before a record is built
+        log_event(self.logger, 'update', node=0)
+        self.assertEqual(self._read(), [])
+
+    def test_text_format(self):
+        with EventLogging(self.path, json_lines=False):
+            log_event(self.logger, 'astar', level=logging.INFO, expanded=12, n_nodes=40)
+        with open(self.path) as log_file:
+            line = log_file.read().strip()
+        self.assertTrue(line.endswith('INFO bfs_dfs.test astar expanded=12 n_nodes=40'))
+
+
+class TestSamplingFilter(unittest.TestCase):
+
+    def test_counts_are_shared_by_threads(self):
+        sampler = SamplingFilter(sample_every=7)
+        kept = []
+        switch_interval = sys.getswitchinterval()
+        # Switch threads as often as possible, so that unguarded counter updates would interleave
+        sys.setswitchinterval(1e-6)
+        try:
+            def log():
+                kept.append(sum(sampler.keep('update') for _ in range(20000)))
+
+            threads = [threading.Thread(target=log) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(sampler.counts['update'], 80000)
+        self.assertEqual(sum(kept), -(-80000 // 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
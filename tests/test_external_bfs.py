@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph
+from external_bfs import ExternalBFS
+
+
+class TestExternalBFS(unittest.TestCase):
+
+    def _check(self, csr, source, memory_limit):
+        with tempfile.TemporaryDirectory() as directory:
+            csr.save(os.path.join(directory, 'csr'))
+            search = ExternalBFS(os.path.join(directory, 'csr'), os.path.join(directory, 'work'), memory_limit)
+            result = search.run(source)
+            _, expected = csr.bfs_tree(source)
+            np.testing.assert_array_equal(result.distance, expected)
+            for v in np.flatnonzero(expected > 0):
+                self.assertIn(v, csr.neighbors(result.parent[v]))
+                self.assertEqual(expected[result.parent[v]], expected[v] - 1)
+            self.assertEqual(result.parent[source], -1)
+            self.assertEqual(sum(level['discovered'] for level in result.levels), np.count_nonzero(expected > 0))
+            self.assertEqual([level['frontier'] for level in result.levels], np.bincount(expected[expected >= 0]).tolist())
+            # Only the outputs are left in the work directory
+            self.assertEqual(sorted(os.listdir(search.work_dir)), ['distance.npy', 'parent.npy'])
+            runs = max(level['runs'] for level in result.levels)
+            del result
+            search.cleanup()
+            self.assertFalse(os.path.exists(search.work_dir))
+            return runs
+
+    def test_matches_bfs_tree(self):
+        for is_directed in (False, True):
+            edges = np.random.default_rng(1).integers(0, 3000, size=(6000, 2))
+            csr = CSRGraph.from_edge_array(edges, 3000, is_directed)
+            with self.subTest(is_directed=is_directed):
+                self._check(csr, 0, 64 * 1024 ** 2)
+
+    def test_small_memory_limit_spills_runs(self):
+        edges = np.random.default_rng(2).integers(0, 3000, size=(9000, 2))
+        csr = CSRGraph.from_edge_array(edges, 3000)
+        # A few hundred arcs per block: levels are split into many sorted runs that must be merged
+        self.assertGreater(self._check(csr, 5, 16 * 1024), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from graph import RandomGraph
+
+
+def shuffled_edges(n_nodes, n_edges, is_directed, seed):
+    # Distinct edges in an order Snap.py would not list them in
+    rng = np.random.default_rng(seed)
+    edges = rng.integers(0, n_nodes, size=(n_edges, 2))
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    if not is_directed:
+        edges = np.sort(edges, axis=1)
+    _, first = np.unique(edges, axis=0, return_index=True)
+    return [tuple(edge) for edge in edges[rng.permutation(np.sort(first))].tolist()]
+
+
+class TestReleaseRepresentations(unittest.TestCase):
+
+    def test_given_edge_order_survives_release(self):
+        for is_directed in (False, True):
+            edges = shuffled_edges(40, 80, is_directed, seed=1)
+            random_graph = RandomGraph.from_edges(40, edges, is_directed)
+            random_graph.set_edge_weights(np.arange(len(edges), dtype=float))
+            random_graph.get_adjacency_list
+            random_graph.release_representations()
+            with self.subTest(is_directed=is_directed):
+                self.assertEqual(random_graph.get_edges, edges)
+                # Weight i still belongs to edge i, and the rebuilt structures agree with it
+                self.assertEqual(random_graph.weights.tolist(), list(range(len(edges))))
+                self.assertEqual(random_graph.get_edge_array.tolist(), [list(edge) for edge in edges])
+                for edge_id, (source, target) in enumerate(edges):
+                    self.assertIn((target, edge_id), random_graph.get_incidence_list[source])
+
+    def test_mutated_graph_is_rebuilt(self):
+        edges = shuffled_edges(30, 60, False, seed=2)
+        random_graph = RandomGraph.from_edges(30, edges)
+        random_graph.set_edge_weights(np.arange(len(edges), dtype=float))
+        weight_of = {edge: weight for edge, weight in zip(edges, random_graph.weights.tolist())}
+        random_graph.del_edge(*edges[0])
+        random_graph.release_representations()
+        del weight_of[edges[0]]
+        self.assertEqual(sorted(random_graph.get_edges), sorted(weight_of))
+        self.assertEqual([weight_of[edge] for edge in random_graph.get_edges], random_graph.weights.tolist())
+
+
+class TestFindEdge(unittest.TestCase):
+
+    def test_matches_a_scan_of_the_edges(self):
+        for is_directed in (False, True):
+            edges = shuffled_edges(30, 120, is_directed, seed=3)
+            random_graph = RandomGraph.from_edges(30, edges, is_directed)
+            with self.subTest(is_directed=is_directed):
+                for source in range(30):
+                    for target in range(30):
+                        matches = [edge_id for edge_id, edge in enumerate(edges)
+                                   if edge == (source, target) or (not is_directed and edge == (target, source))]
+                        self.assertEqual(random_graph.find_edge(source, target), matches[0] if matches else None)
+
+    def test_directed_arcs_are_not_reversed(self):
+        random_graph = RandomGraph.from_edges(3, [(0, 1), (2, 1), (1, 2)], is_directed=True)
+        self.assertIsNone(random_graph.find_edge(1, 0))
+        self.assertEqual((random_graph.find_edge(2, 1), random_graph.find_edge(1, 2)), (1, 2))
+
+    def test_ids_and_weights_survive_release(self):
+        edges = shuffled_edges(40, 80, False, seed=4)
+        random_graph = RandomGraph.from_edges(40, edges)
+        random_graph.set_edge_weights(np.arange(len(edges), dtype=float) * 10)
+        before = [(random_graph.find_edge(*edge), random_graph.weights[random_graph.find_edge(*edge)]) for edge in edges]
+        random_graph.release_representations()
+        after = [(random_graph.find_edge(*edge), random_graph.weights[random_graph.find_edge(*edge)]) for edge in edges]
+        self.assertEqual(after, before)
+        self.assertEqual(before, [(edge_id, edge_id * 10) for edge_id in range(len(edges))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from connectivity import UnionFind
+from graph_summary import GraphSummary
+
+
+class EdgeListGraph:
+    # The parts of the RandomGraph interface GraphSummary reads, over a plain edge array
+    def __init__(self, n_nodes, edges, is_directed):
+        self.get_nodes = list(range(n_nodes))
+        self.get_edge_array = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.is_directed = is_directed
+        self.get_components = UnionFind(n_nodes)
+        self.get_components.union_edges(self.get_edge_array)
+
+
+class TestGraphSummary(unittest.TestCase):
+
+    def test_degrees_match_edge_count(self):
+        edges = np.random.default_rng(1).integers(0, 50, size=(120, 2))
+        for is_directed in (False, True):
+            summary = GraphSummary(EdgeListGraph(50, edges, is_directed))
+            with self.subTest(is_directed=is_directed):
+                degree = np.array([sum((u == v) + (u == w) for v, w in edges.tolist()) for u in range(50)])
+                np.testing.assert_array_equal(summary.degree, degree)
+                if is_directed:
+                    np.testing.assert_array_equal(summary.out_degree, [np.count_nonzero(edges[:, 0] == u) for u in range(50)])
+                    np.testing.assert_array_equal(summary.in_degree, [np.count_nonzero(edges[:, 1] == u) for u in range(50)])
+                self.assertEqual(summary.max_degree, degree.max())
+                np.testing.assert_array_equal(summary.max_degree_vertices, np.flatnonzero(degree == degree.max()))
+                self.assertAlmostEqual(summary.average_degree, 2 * len(edges) / 50)
+                np.testing.assert_array_equal(summary.degree_histogram, np.bincount(degree))
+                self.assertEqual(summary.degree_percentiles((50,))[50], np.percentile(degree, 50))
+
+    def test_as_dict(self):
+        summary = GraphSummary(EdgeListGraph(6, [(0, 1), (1, 2), (3, 4)], False))
+        report = summary.as_dict()
+        self.assertEqual(report['degree_percentiles'][50], 1.0)
+        del report['degree_percentiles']
+        self.assertEqual(report, {'n_nodes': 6, 'n_edges': 3, 'max_degree': 2, 'max_degree_vertices': [1],
+                                  'average_degree': 1.0, 'n_components': 3})
+
+    def test_empty_graph(self):
+        summary = GraphSummary(EdgeListGraph(0, [], False))
+        self.assertEqual(summary.max_degree, 0)
+        self.assertEqual(summary.average_degree, 0)
+        self.assertEqual(summary.degree_percentiles(), {50: 0, 90: 0, 99: 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
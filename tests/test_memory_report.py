@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from memory_report import MemoryReport, deep_sizeof
+
+
+class Point:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class TestDeepSizeof(unittest.TestCase):
+
+    def test_containers(self):
+        items = [list(range(i, i + 10)) for i in range(0, 100, 10)]
+        expected = sys.getsizeof(items) + sum(sys.getsizeof(item) + sum(map(sys.getsizeof, item)) for item in items)
+        self.assertEqual(deep_sizeof(items), expected)
+        mapping = {'a': (1, 2.0), 'b': None}
+        expected = sys.getsizeof(mapping) + sum(map(sys.getsizeof, ['a', 'b', (1, 2.0), 1, 2.0, None]))
+        self.assertEqual(deep_sizeof(mapping), expected)
+
+    def test_shared_objects_count_once(self):
+        shared = list(range(1000))
+        self.assertEqual(deep_sizeof([shared, shared]), deep_sizeof([shared]) + 8)
+
+    def test_arrays_and_views(self):
+        array = np.zeros(1000)
+        self.assertEqual(deep_sizeof(array), sys.getsizeof(array))
+        self.assertGreaterEqual(deep_sizeof(array), array.nbytes)
+        view = array[:500]
+        self.assertEqual(deep_sizeof(view), sys.getsizeof(view) + view.nbytes)
+
+    def test_objects_and_slots(self):
+        point = Point([1, 2, 3], 'label')
+        self.assertEqual(deep_sizeof(point), sys.getsizeof(point) + deep_sizeof([1, 2, 3]) + sys.getsizeof('label'))
+        seen = {id(point.x)}
+        self.assertEqual(deep_sizeof(point, seen), sys.getsizeof(point) + sys.getsizeof('label'))
+
+
+class TestMemoryReport(unittest.TestCase):
+
+    def test_tracks_allocations(self):
+        report = MemoryReport()
+        with report.track('allocate'):
+            kept = bytearray(5 * 1024 ** 2)
+        with report.track('idle'):
+            pass
+        allocate, idle = report.phases
+        self.assertEqual((allocate['phase'], idle['phase']), ('allocate', 'idle'))
+        self.assertGreaterEqual(allocate['tracemalloc_peak'], len(kept))
+        self.assertGreaterEqual(allocate['tracemalloc_retained'], len(kept))
+        self.assertLess(idle['tracemalloc_peak'], len(kept))
+        self.assertGreater(allocate['peak_rss'], 0)
+        report.add_breakdown('graph', {'csr': 2048, 'snap_graph': None})
+        text = str(report)
+        self.assertIn('2.0 KiB', text)
+        self.assertIn('n/a', text)
+        self.assertEqual(report.as_dict()['breakdowns']['graph']['csr'], 2048)
+        self.assertIn('process peak RSS', text)
+
+    def test_nested_phases_keep_the_outer_peak(self):
+        report = MemoryReport()
+        with report.track('outer'):
+            transient = bytearray(8 * 1024 ** 2)
+            del transient
+            with report.track('first'):
+                transient = bytearray(4 * 1024 ** 2)
+                del transient
+            with report.track('second'):
+                pass
+        first, second, outer = report.phases
+        self.assertEqual([phase['phase'] for phase in report.phases], ['first', 'second', 'outer'])
+        # The 8 MiB freed before the inner phases reset the peak still counts for the outer phase
+        self.assertGreaterEqual(outer['tracemalloc_peak'], 8 * 1024 ** 2)
+        self.assertGreaterEqual(first['tracemalloc_peak'], 4 * 1024 ** 2)
+        self.assertLess(first['tracemalloc_peak'], 8 * 1024 ** 2)
+        self.assertLess(second['tracemalloc_peak'], 4 * 1024 ** 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+import sys
+import unittest
+from unittest import mock
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+import parallel_bfs as parallel_bfs_module
+from parallel_bfs import parallel_bfs
+from graph_fixtures import random_csr
+
+
+class TestParallelBFS(unittest.TestCase):
+
+    def test_matches_bfs_tree(self):
+        for n_workers in (2, 3, 4):
+            for is_directed in (False, True):
+                csr = random_csr(400, 700, is_directed, seed=n_workers)
+                with self.subTest(n_workers=n_workers, is_directed=is_directed):
+                    _, expected = csr.bfs_tree(0)
+                    parent, distance = parallel_bfs(csr, 0, n_workers=n_workers)
+                    np.testing.assert_array_equal(distance, expected)
+                    # Parents may differ from bfs_tree's but must sit one level up, through an arc
+                    for v in np.flatnonzero(distance > 0):
+                        self.assertEqual(distance[parent[v]], distance[v] - 1)
+                        self.assertIn(v, csr.neighbors(parent[v]))
+                    self.assertEqual(parent[0], -1)
+
+    def test_max_depth(self):
+        csr = random_csr(300, 600, False, seed=7)
+        _, expected = csr.bfs_tree(0, max_depth=2)
+        _, distance = parallel_bfs(csr, 0, n_workers=2, max_depth=2)
+        np.testing.assert_array_equal(distance, expected)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'workers must inherit the patched module')
+    def test_worker_failure_raises(self):
+        frontier_slice = parallel_bfs_module._frontier_slice
+
+        def failing_slice(indptr, frontier, rank, n_workers):
+            if rank == 1:
+                raise MemoryError('simulated worker failure')
+            return frontier_slice(indptr, frontier, rank, n_workers)
+
+        csr = random_csr(200, 400, False, seed=3)
+        with mock.patch.object(parallel_bfs_module, '_frontier_slice', failing_slice):
+            with self.assertRaises(RuntimeError):
+                parallel_bfs(csr, 0, n_workers=3, timeout=30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import pstats
+import sys
+import tempfile
+import time
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+from profiling import PhaseProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    def _run(self, profiler):
+        with profiler.phase('traversal'):
+            busy(0.02)
+            for _ in range(3):
+                with profiler.phase('redraw'):
+                    busy(0.01)
+        with profiler.phase('rendering'):
+            busy(0.01)
+
+    def test_nested_timers(self):
+        profiler = PhaseProfiler()
+        self._run(profiler)
+        self.assertEqual(sorted(profiler.phases), ['rendering', 'traversal', 'traversal;redraw'])
+        traversal, redraw = profiler.phases['traversal'], profiler.phases['traversal;redraw']
+        self.assertEqual((traversal['calls'], redraw['calls']), (1, 3))
+        self.assertGreaterEqual(redraw['total'], 0.03)
+        self.assertAlmostEqual(traversal['self'], traversal['total'] - redraw['total'], places=6)
+        self.assertGreaterEqual(traversal['self'], 0.02)
+        folded = dict(line.rsplit(' ', 1) for line in profiler.folded())
+        self.assertEqual(set(folded), set(profiler.phases))
+        self.assertIn('traversal', str(profiler))
+
+    def test_sampling(self):
+        profiler = PhaseProfiler(mode='sampling', interval=0.001)
+        self._run(profiler)
+        self.assertTrue(profiler.samples)
+        self.assertTrue(any(stack.startswith('traversal;redraw;') and 'busy' in stack for stack in profiler.samples))
+        self.assertIsNone(profiler._sampler)
+
+    def test_cprofile_and_write(self):
+        profiler = PhaseProfiler(mode='cprofile')
+        self._run(profiler)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = profiler.write(directory, 'Scene')
+            self.assertEqual(sorted(os.path.basename(path) for path in paths),
+                             ['Scene.folded', 'Scene.rendering.pstats', 'Scene.traversal.pstats',
+                              'Scene.traversal.redraw.pstats', 'Scene.txt'])
+            redraw = pstats.Stats(os.path.join(directory, 'Scene.traversal.redraw.pstats'))
+            self.assertTrue(any(function == 'busy' for _, _, function in redraw.stats))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            PhaseProfiler(mode='perf')
+
+
+if __name__ == '__main__':
+    unittest.main()
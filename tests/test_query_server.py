@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from query_server import BFSTreeCache, QueryService, _serve_connection
+from graph_fixtures import random_csr
+
+
+class TestQueryService(unittest.TestCase):
+
+    def setUp(self):
+        self.csr = random_csr(200, 300, False, seed=1)
+
+    def test_answers_match_bfs_tree(self):
+        async def queries(service):
+            return [(target, await service.distance(0, target), await service.path(0, target)) for target in range(200)], \
+                await service.neighborhood(0, 2)
+
+        service = QueryService(self.csr)
+        answers, neighborhood = asyncio.run(queries(service))
+        _, distance = self.csr.bfs_tree(0)
+        for target, hops, path in answers:
+            self.assertEqual(hops, distance[target])
+            self.assertEqual(len(path), distance[target] + 1)
+            if path:
+                self.assertEqual((path[0], path[-1]), (0, target))
+        self.assertEqual(neighborhood, np.flatnonzero((distance >= 0) & (distance <= 2)).tolist())
+        # One traversal, every other query answered from the cache
+        self.assertEqual(service.cache.misses, 1)
+
+    def test_concurrent_requests_share_a_traversal(self):
+        async def queries(service):
+            return await asyncio.gather(*(service.distance(5, target) for target in range(50)))
+
+        service = QueryService(self.csr)
+        asyncio.run(queries(service))
+        self.assertEqual(len(service.cache), 1)
+        self.assertEqual(service.cache.misses + service.cache.hits, 50)
+        self.assertEqual(service.cache.misses, 1 + service.batched)
+
+    def test_cancelled_requester_does_not_fail_the_others(self):
+        release = threading.Event()
+        bfs_tree = self.csr.bfs_tree
+
+        def slow_bfs_tree(source):
+            release.wait(10)
+            return bfs_tree(source)
+
+        async def queries(service):
+            first = asyncio.create_task(service.distance(5, 6))
+            second = asyncio.create_task(service.distance(5, 7))
+            await asyncio.sleep(0.05)
+            # The first client disconnects while the shared traversal runs
+            first.cancel()
+            await asyncio.sleep(0.05)
+            release.set()
+            return first, await second
+
+        self.csr.bfs_tree = slow_bfs_tree
+        service = QueryService(self.csr)
+        first, distance = asyncio.run(queries(service))
+        self.assertTrue(first.cancelled())
+        self.assertEqual(distance, bfs_tree(5)[1][7])
+        self.assertEqual((len(service.cache), len(service.in_flight)), (1, 0))
+
+    def test_errors(self):
+        service = QueryService(self.csr)
+        for request in ([1, 2], 'distance', {'op': 'distance', 'source': 0}, {'op': 'distance', 'source': 0, 'target': 500},
+                        {'op': 'diameter', 'id': 7}, {'op': 'neighborhood', 'source': 'a', 'k': 1}):
+            with self.subTest(request=request):
+                self.assertIn('error', asyncio.run(service.handle(request)))
+        self.assertEqual(asyncio.run(service.handle({'op': 'diameter', 'id': 7}))['id'], 7)
+
+    def test_over_tcp(self):
+        async def session(service):
+            server = await asyncio.start_server(lambda reader, writer: _serve_connection(service, reader, writer), '127.0.0.1', 0)
+            async with server:
+                reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+                lines = [{'op': 'distance', 'source': 0, 'target': 3, 'id': 1}, [1], 'not json', {'op': 'metrics', 'id': 2}]
+                for line in lines:
+                    writer.write(((line if isinstance(line, str) else json.dumps(line)) + '\n').encode())
+                await writer.drain()
+                responses = [json.loads(await asyncio.wait_for(reader.readline(), 10)) for _ in lines]
+                # Wait for the server to close its side, so its connection task ends before the loop does
+                writer.write_eof()
+                await asyncio.wait_for(reader.read(), 10)
+                writer.close()
+                return responses
+
+        responses = asyncio.run(session(QueryService(self.csr)))
+        by_id = {response['id']: response for response in responses if response['id'] is not None}
+        self.assertEqual(by_id[1]['distance'], self.csr.bfs_tree(0)[1][3])
+        self.assertIn('metrics', by_id[2])
+        self.assertEqual(sum('error' in response for response in responses), 2)
+
+
+class TestBFSTreeCache(unittest.TestCase):
+
+    def test_lru_eviction_within_budget(self):
+        tree = (np.zeros(10, dtype=np.int64), np.zeros(10, dtype=np.int64))
+        cache = BFSTreeCache(memory_budget=3 * 160)
+        for source in range(3):
+            cache.put(source, tree)
+        cache.get(0)
+        cache.put(3, tree)
+        self.assertEqual(list(cache.trees), [2, 0, 3])
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.nbytes, cache.memory_budget)
+        cache.put(4, (np.zeros(1000), np.zeros(1000)))
+        self.assertIsNone(cache.get(4))
+        self.assertEqual(cache.get_metrics()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph
+from reorder import Reordering, bfs_order, degree_order, locality, reverse_cuthill_mckee
+from graph_fixtures import random_csr
+
+
+def arcs(csr):
+    return sorted(zip(np.repeat(np.arange(csr.n_nodes), csr.degree()).tolist(), csr.indices.tolist()))
+
+
+def scrambled_band(n_nodes, width, seed):
+    # Every vertex linked to the next width vertices, under a random relabelling
+    edges = np.array([(u, v) for u in range(n_nodes) for v in range(u + 1, min(u + width + 1, n_nodes))])
+    labels = np.random.default_rng(seed).permutation(n_nodes)
+    return CSRGraph.from_edge_array(labels[edges], n_nodes)
+
+
+class TestReorder(unittest.TestCase):
+
+    def test_orders_are_permutations(self):
+        for is_directed in (False, True):
+            # Sparse enough to leave isolated vertices and several components
+            csr = random_csr(300, 200, is_directed, seed=1)
+            for order in (bfs_order(csr), bfs_order(csr, source=17), reverse_cuthill_mckee(csr), degree_order(csr),
+                          degree_order(csr, descending=False)):
+                self.assertEqual(sorted(order.tolist()), list(range(300)))
+        empty = CSRGraph.from_edge_array(np.zeros((0, 2)), 0)
+        for method in Reordering.METHODS.values():
+            self.assertEqual(len(method(empty)), 0)
+
+    def test_bfs_order(self):
+        csr = random_csr(200, 400, False, seed=2)
+        _, distance = csr.bfs_tree(5)
+        order = bfs_order(csr, source=5)
+        reached = np.count_nonzero(distance >= 0)
+        # The source's component comes first, level by level
+        self.assertEqual(sorted(order[:reached].tolist()), np.flatnonzero(distance >= 0).tolist())
+        self.assertTrue(np.all(np.diff(distance[order[:reached]]) >= 0))
+
+    def test_degree_order(self):
+        csr = random_csr(200, 500, True, seed=3)
+        degree = csr.degree()
+        order = degree_order(csr)
+        expected = sorted(range(200), key=lambda node: (-degree[node], node))
+        self.assertEqual(order.tolist(), expected)
+        self.assertEqual(degree_order(csr, descending=False).tolist(), sorted(range(200), key=lambda node: (degree[node], node)))
+
+    def test_rcm_bandwidth(self):
+        path = scrambled_band(100, 1, seed=4)
+        self.assertEqual(locality(Reordering.compute(path, 'rcm').apply_csr(path))['bandwidth'], 1)
+        for width in (2, 3, 5):
+            band = scrambled_band(400, width, seed=width)
+            after = locality(Reordering.compute(band, 'rcm').apply_csr(band))['bandwidth']
+            self.assertLessEqual(after, 2 * width)
+            self.assertLess(after, locality(band)['bandwidth'])
+
+    def test_locality(self):
+        for is_directed in (False, True):
+            csr = random_csr(150, 400, is_directed, seed=5)
+            gaps = [abs(source - target) for source, target in arcs(csr)]
+            metrics = locality(csr)
+            self.assertEqual(metrics['bandwidth'], max(gaps))
+            self.assertAlmostEqual(metrics['average_gap'], sum(gaps) / len(gaps))
+            self.assertAlmostEqual(metrics['average_log_gap'], float(np.mean(np.log2(1 + np.array(gaps)))))
+        self.assertEqual(locality(CSRGraph.from_edge_array(np.zeros((0, 2)), 4))['bandwidth'], 0)
+
+    def test_apply_csr(self):
+        for is_directed in (False, True):
+            csr = random_csr(200, 600, is_directed, seed=6)
+            for method in Reordering.METHODS:
+                reordering = Reordering.compute(csr, method)
+                relabelled = reordering.apply_csr(csr)
+                self.assertEqual(relabelled.is_directed, is_directed)
+                rank = reordering.rank.tolist()
+                self.assertEqual(arcs(relabelled), sorted((rank[source], rank[target]) for source, target in arcs(csr)))
+                self.assertTrue(np.array_equal(reordering.order[reordering.rank], np.arange(200)))
+
+    def test_traversal_round_trip(self):
+        for is_directed in (False, True):
+            csr = random_csr(300, 700, is_directed, seed=7)
+            reordering = Reordering.compute(csr, 'rcm')
+            relabelled = reordering.apply_csr(csr)
+            for source in (0, 42, 299):
+                expected_parent, expected_distance = csr.bfs_tree(source)
+                parent, distance = relabelled.bfs_tree(reordering.rank[source])
+                parent, distance = reordering.parents_to_original(parent), reordering.to_original(distance)
+                self.assertTrue(np.array_equal(distance, expected_distance))
+                self.assertEqual(parent[source], -1)
+                # Parents may differ on ties, but each must be an arc one level up
+                for node in np.flatnonzero(distance > 0).tolist():
+                    self.assertEqual(distance[parent[node]], distance[node] - 1)
+                    self.assertIn(node, csr.neighbors(parent[node]).tolist())
+                self.assertTrue(np.array_equal(parent == -1, expected_parent == -1))
+
+    def test_apply_edges_and_coordinates(self):
+        edges = np.random.default_rng(8).integers(0, 50, size=(120, 2))
+        weights = np.arange(120, dtype=float)
+        reordering = Reordering(np.random.default_rng(9).permutation(50), 'shuffle')
+        relabelled, edge_order, moved_weights = reordering.apply_edges(edges, weights)
+        self.assertEqual(relabelled.tolist(), sorted(relabelled.tolist()))
+        self.assertTrue(np.array_equal(relabelled, reordering.rank[edges[edge_order]]))
+        self.assertTrue(np.array_equal(moved_weights, weights[edge_order]))
+        self.assertIsNone(reordering.apply_edges(edges)[2])
+
+        coordinates = np.random.default_rng(10).random((50, 3))
+        moved = reordering.apply_coordinates(coordinates)
+        self.assertTrue(np.array_equal(moved[reordering.rank], coordinates))
+        self.assertEqual(reordering.original_ids([0, -1, 3]).tolist(), [reordering.order[0], -1, reordering.order[3]])
+
+    def test_report(self):
+        band = scrambled_band(200, 2, seed=11)
+        reordering = Reordering.compute(band, 'rcm')
+        report = reordering.report(band)
+        self.assertEqual(report['method'], 'rcm')
+        self.assertEqual(report['before'], locality(band))
+        self.assertEqual(report['after'], locality(reordering.apply_csr(band)))
+        self.assertAlmostEqual(report['reduction']['bandwidth'], report['before']['bandwidth'] / report['after']['bandwidth'])
+        self.assertEqual(repr(reordering), "Reordering(method='rcm', nodes=200)")
+        with self.assertRaises(ValueError):
+            Reordering.compute(band, 'metis')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph
+from sampling import HiddenEventCounter, RenderSample, level_sample, snowball_sample, top_degree_sample
+from traversal import bfs_events, Discover, Finish
+from graph_fixtures import random_edges
+
+
+class TestSamplers(unittest.TestCase):
+
+    def setUp(self):
+        self.edges = random_edges(500, 600, seed=1)
+        self.csr = CSRGraph.from_edge_array(self.edges, 500)
+
+    def test_snowball_takes_nearest_vertices_first(self):
+        # Vertex 1 lies in the giant component
+        _, distance = self.csr.bfs_tree(1)
+        sample = snowball_sample(self.csr, 60, seeds=[1])
+        self.assertEqual(len(sample), 60)
+        self.assertIn(1, sample)
+        # Within the component of the seed, no vertex is skipped for a farther one
+        self.assertTrue((distance[sample] >= 0).all())
+        deepest = distance[sample].max()
+        inner = np.flatnonzero((distance >= 0) & (distance < deepest))
+        self.assertTrue(np.isin(inner, sample).all())
+
+    def test_snowball_spans_components(self):
+        reached = np.count_nonzero(self.csr.bfs_tree(0)[1] >= 0)
+        sample = snowball_sample(self.csr, reached + 40, seeds=[0], rng=np.random.default_rng(2))
+        self.assertEqual(len(sample), reached + 40)
+        self.assertEqual(len(snowball_sample(self.csr, 10 ** 6)), self.csr.n_nodes)
+
+    def test_top_degree(self):
+        sample = top_degree_sample(self.csr, 25)
+        degree = self.csr.degree()
+        self.assertEqual(len(sample), 25)
+        self.assertGreaterEqual(degree[sample].min(), np.delete(degree, sample).max())
+
+    def test_level_sample_keeps_every_level(self):
+        _, distance = self.csr.bfs_tree(1)
+        sample = level_sample(self.csr, 1, 50, np.random.default_rng(3))
+        self.assertIn(1, sample)
+        self.assertTrue((distance[sample] >= 0).all())
+        np.testing.assert_array_equal(np.unique(distance[sample]), np.arange(distance.max() + 1))
+
+
+class TestRenderSample(unittest.TestCase):
+
+    def test_mappings(self):
+        edges = random_edges(100, 300, seed=4)
+        vertices = np.random.default_rng(5).choice(100, 30, replace=False)
+        sample = RenderSample(vertices, edges, 100, 'test')
+        inside = set(vertices.tolist())
+        expected_edges = [i for i, (u, v) in enumerate(edges.tolist()) if u in inside and v in inside]
+        np.testing.assert_array_equal(sample.edge_ids, expected_edges)
+        for vertex in range(100):
+            local = sample.local_node(vertex)
+            self.assertEqual(local is not None, vertex in inside)
+            if local is not None:
+                self.assertEqual(sample.vertices[local], vertex)
+        for edge in range(len(edges)):
+            local = sample.local_edge(edge)
+            self.assertEqual(local is not None, edge in expected_edges)
+            if local is not None:
+                self.assertEqual(sample.edge_ids[local], edge)
+        self.assertIsNone(sample.local_edge(None))
+
+
+class TestHiddenEventCounter(unittest.TestCase):
+
+    def test_counts_per_level(self):
+        adjacency_list = [[1, 2], [0, 3], [0], [1]]
+        counter = HiddenEventCounter(4, refresh_every=10 ** 6)
+        refreshes = [counter.record(event) for event in bfs_events(adjacency_list, 0)]
+        self.assertEqual(counter.discovered, [1, 2, 1])
+        self.assertEqual(counter.finished, [1, 2, 1])
+        self.assertEqual(counter.edges, [2, 1, 0])
+        self.assertEqual(counter.total, 11)
+        # One refresh per new level
+        self.assertEqual(sum(refreshes), 3)
+        self.assertEqual(counter.lines()[1], 'level 1: +2 vertices, 2 finished, 1 edges hidden')
+
+    def test_deep_levels_are_merged(self):
+        counter = HiddenEventCounter(20)
+        for vertex in range(20):
+            counter.record(Discover(vertex, vertex - 1, vertex))
+            counter.record(Finish(vertex))
+        lines = counter.lines(max_levels=5)
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[-1], 'levels 4+: +16 vertices, 16 finished, 0 edges hidden')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from collections import deque
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph
+from scc import strongly_connected_components
+from traversal import bfs_forest_events, Discover
+from graph_fixtures import random_csr
+
+
+def reachability(csr):
+    # reach[s, v] is True if v can be reached from s
+    reach = np.zeros((csr.n_nodes, csr.n_nodes), dtype=bool)
+    for source in range(csr.n_nodes):
+        reach[source, source] = True
+        queue = deque([source])
+        while queue:
+            for v in csr.neighbors(queue.popleft()).tolist():
+                if not reach[source, v]:
+                    reach[source, v] = True
+                    queue.append(v)
+    return reach
+
+
+class TestStronglyConnectedComponents(unittest.TestCase):
+
+    def setUp(self):
+        # Sparse enough to get a mix of large and single-vertex components
+        self.csr = random_csr(80, 110, True, seed=1)
+        self.result = strongly_connected_components(self.csr)
+        self.reach = reachability(self.csr)
+
+    def test_labels_match_mutual_reachability(self):
+        same_label = self.result.labels[:, None] == self.result.labels[None, :]
+        np.testing.assert_array_equal(same_label, self.reach & self.reach.T)
+        self.assertEqual(self.result.n_components, len(np.unique(self.result.labels)))
+        self.assertEqual(self.result.sizes.sum(), self.csr.n_nodes)
+
+    def test_labels_are_topological(self):
+        sources = np.repeat(np.arange(self.csr.n_nodes), self.csr.degree())
+        self.assertTrue((self.result.labels[sources] <= self.result.labels[self.csr.indices]).all())
+
+    def test_reachable_vertices(self):
+        for source in (0, 17, 42):
+            np.testing.assert_array_equal(self.result.reachable_vertices(source), self.reach[source])
+        np.testing.assert_array_equal(self.result.reachable_vertices([3, 5]), self.reach[3] | self.reach[5])
+
+    def test_source_roots_reach_everything(self):
+        roots = self.result.source_roots()
+        self.assertTrue(self.result.reachable_vertices(roots).all())
+        # No root reaches another one, so none can be dropped
+        for root in roots:
+            self.assertEqual(np.count_nonzero(self.reach[root, roots]), 1)
+        trees = sum(1 for event in bfs_forest_events(self.csr.to_adjacency_list(), roots, True)
+                    if isinstance(event, Discover) and event.parent == -1)
+        self.assertEqual(trees, len(roots))
+
+    def test_undirected_graph_yields_connected_components(self):
+        csr = random_csr(60, 50, False, seed=2)
+        result = strongly_connected_components(csr)
+        reach = reachability(csr)
+        np.testing.assert_array_equal(result.labels[:, None] == result.labels[None, :], reach)
+
+    def test_deep_path_does_not_recurse(self):
+        n_nodes = 50000
+        path = np.column_stack([np.arange(n_nodes - 1), np.arange(1, n_nodes)])
+        result = strongly_connected_components(CSRGraph.from_edge_array(path, n_nodes, True))
+        self.assertEqual(result.n_components, n_nodes)
+        np.testing.assert_array_equal(result.labels, np.arange(n_nodes))
+
+
+if __name__ == '__main__':
+    unittest.main()
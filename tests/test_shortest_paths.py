@@ -0,0 +1,122 @@
+import math
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from csr import CSRGraph
+from shortest_paths import astar, bidirectional_bfs, dial, dijkstra, euclidean_weights, weighted_shortest_paths, zero_one_bfs
+from graph_fixtures import random_edges
+
+
+def incidence_list(n_nodes, edges, is_directed):
+    incidence = [[] for _ in range(n_nodes)]
+    for edge_id, (source, target) in enumerate(edges.tolist()):
+        incidence[source].append((target, edge_id))
+        if not is_directed:
+            incidence[target].append((source, edge_id))
+    return incidence
+
+
+def bellman_ford(n_nodes, edges, weights, source, is_directed):
+    distance = [math.inf] * n_nodes
+    distance[source] = 0
+    arcs = [(u, v, w) for (u, v), w in zip(edges.tolist(), weights)]
+    if not is_directed:
+        arcs += [(v, u, w) for u, v, w in arcs]
+    for _ in range(n_nodes):
+        for u, v, w in arcs:
+            if distance[u] + w < distance[v]:
+                distance[v] = distance[u] + w
+    return distance
+
+
+class TestBidirectionalBFS(unittest.TestCase):
+
+    def test_matches_bfs_distances(self):
+        for is_directed in (False, True):
+            csr = CSRGraph.from_edge_array(random_edges(120, 200, seed=1), 120, is_directed)
+            adjacency_list = csr.to_adjacency_list()
+            reverse_adjacency_list = csr.reverse().to_adjacency_list() if is_directed else None
+            for source in (0, 5, 77):
+                _, distance = csr.bfs_tree(source)
+                for target in range(120):
+                    with self.subTest(is_directed=is_directed, source=source, target=target):
+                        path = bidirectional_bfs(adjacency_list, source, target, reverse_adjacency_list)
+                        if distance[target] == -1:
+                            self.assertEqual(path, [])
+                            continue
+                        self.assertEqual(len(path) - 1, distance[target])
+                        self.assertEqual((path[0], path[-1]), (source, target))
+                        for u, v in zip(path, path[1:]):
+                            self.assertIn(v, adjacency_list[u])
+
+    def test_same_vertex(self):
+        self.assertEqual(bidirectional_bfs([[1], [0]], 1, 1), [1])
+
+
+class TestWeightedShortestPaths(unittest.TestCase):
+
+    def _assert_shortest(self, incidence, weights, source, parent, distance, expected):
+        for v, d in enumerate(expected):
+            if d == math.inf:
+                self.assertEqual(distance[v], math.inf)
+                continue
+            self.assertAlmostEqual(distance[v], d)
+            if v != source:
+                # The parent edge is the last edge of a shortest path
+                self.assertTrue(any(u == v and abs(distance[parent[v]] + weights[e] - d) < 1e-9 for u, e in incidence[parent[v]]))
+
+    def test_every_method_matches_bellman_ford(self):
+        rng = np.random.default_rng(2)
+        edges = random_edges(80, 200, seed=3)
+        cases = {'0-1': (zero_one_bfs, rng.integers(0, 2, len(edges))),
+                 'dial': (dial, rng.integers(0, 9, len(edges))),
+                 'dijkstra': (dijkstra, rng.random(len(edges)) * 5)}
+        for is_directed in (False, True):
+            incidence = incidence_list(80, edges, is_directed)
+            for method, (search, weights) in cases.items():
+                weights = weights.tolist()
+                expected = bellman_ford(80, edges, weights, 0, is_directed)
+                with self.subTest(is_directed=is_directed, method=method):
+                    self._assert_shortest(incidence, weights, 0, *search(incidence, weights, 0), expected)
+                    self._assert_shortest(incidence, weights, 0, *weighted_shortest_paths(incidence, weights, 0), expected)
+                    self._assert_shortest(incidence, weights, 0, *weighted_shortest_paths(incidence, weights, 0, method), expected)
+
+    def test_rejects_negative_weights_and_unknown_methods(self):
+        incidence = incidence_list(2, np.array([[0, 1]]), False)
+        with self.assertRaises(ValueError):
+            weighted_shortest_paths(incidence, [-1], 0)
+        with self.assertRaises(ValueError):
+            weighted_shortest_paths(incidence, [1], 0, method='bellman-ford')
+
+
+class TestAStar(unittest.TestCase):
+
+    def test_matches_dijkstra(self):
+        rng = np.random.default_rng(4)
+        coordinates = rng.random((150, 3)) * 10
+        edges = random_edges(150, 400, seed=5)
+        weights = euclidean_weights(edges, coordinates)
+        np.testing.assert_allclose(weights, [math.dist(coordinates[u], coordinates[v]) for u, v in edges])
+        incidence = incidence_list(150, edges, False)
+        _, distance = dijkstra(incidence, weights.tolist(), 0)
+        for target in range(0, 150, 7):
+            with self.subTest(target=target):
+                result = astar(incidence, weights, coordinates, 0, target, record_steps=True)
+                if distance[target] == math.inf:
+                    self.assertEqual((result.path, result.distance), ([], math.inf))
+                    continue
+                self.assertAlmostEqual(result.distance, distance[target])
+                self.assertEqual((result.path[0], result.path[-1]), (0, target))
+                length = sum(math.dist(coordinates[u], coordinates[v]) for u, v in zip(result.path, result.path[1:]))
+                self.assertAlmostEqual(length, result.distance)
+                self.assertEqual(len(result.steps), result.expanded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import itertools
+import os
+import queue
+import sys
+import threading
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from traversal import (bfs_events, buffered_events, dfs_events, dfs_forest_events, find_vertex, receive_events,
+                       send_events, BackEdge, CrossEdge, Discover, EdgeEvent, Finish, ForwardEdge, LevelBoundary,
+                       NonTreeEdge, TreeEdge)
+from graph_fixtures import random_csr
+
+
+class TestBFSEvents(unittest.TestCase):
+
+    def test_matches_bfs_tree(self):
+        for is_directed in (False, True):
+            csr = random_csr(300, 500, is_directed, seed=1, simple=True)
+            adjacency_list = csr.to_adjacency_list()
+            _, distance = csr.bfs_tree(0)
+            reached = np.flatnonzero(distance >= 0)
+            events = list(bfs_events(adjacency_list, 0, is_directed))
+            discovered = [event for event in events if isinstance(event, Discover)]
+            with self.subTest(is_directed=is_directed):
+                self.assertEqual(sorted(event.vertex for event in discovered), reached.tolist())
+                for event in discovered:
+                    self.assertEqual(event.level, distance[event.vertex])
+                    if event.parent != -1:
+                        self.assertIn(event.vertex, adjacency_list[event.parent])
+                tree_edges = [(event.source, event.target) for event in events if type(event) is TreeEdge]
+                self.assertEqual(tree_edges, [(event.parent, event.vertex) for event in discovered[1:]])
+                self.assertEqual(sorted(event.vertex for event in events if isinstance(event, Finish)), reached.tolist())
+                boundaries = [(event.level, event.size) for event in events if isinstance(event, LevelBoundary)]
+                self.assertEqual(boundaries, list(enumerate(np.bincount(distance[reached]).tolist())))
+                # Every edge of the component is reported once, as a tree or a non-tree edge
+                arcs = int(csr.degree()[reached].sum())
+                non_tree = sum(1 for event in events if isinstance(event, NonTreeEdge))
+                self.assertEqual(len(tree_edges) + non_tree, arcs if is_directed else arcs // 2)
+
+    def test_find_vertex_stops_early(self):
+        adjacency_list = random_csr(200, 600, False, seed=2, simple=True).to_adjacency_list()
+        consumed = []
+        events = (consumed.append(event) or event for event in bfs_events(adjacency_list, 0))
+        target = adjacency_list[0][0]
+        self.assertEqual(find_vertex(events, target).parent, 0)
+        self.assertLess(len(consumed), len(list(bfs_events(adjacency_list, 0))))
+        self.assertIsNone(find_vertex(bfs_events([[1], [0], []], 0), 2))
+
+
+class TestDFSEvents(unittest.TestCase):
+
+    def _timestamps(self, events):
+        discovery, finish = {}, {}
+        for event in events:
+            if isinstance(event, Discover):
+                discovery[event.vertex] = event.time
+            elif isinstance(event, Finish):
+                finish[event.vertex] = event.time
+        return discovery, finish
+
+    def _expected_type(self, source, target, parent, discovery, finish):
+        # CLRS classification from the discovery/finish intervals
+        if parent.get(target) == source:
+            return TreeEdge
+        if discovery[target] <= discovery[source] and finish[source] <= finish[target]:
+            return BackEdge
+        if discovery[source] < discovery[target]:
+            return ForwardEdge
+        return CrossEdge
+
+    def test_timestamps_and_edge_classes(self):
+        for is_directed in (False, True):
+            csr = random_csr(200, 400, is_directed, seed=4, simple=True)
+            adjacency_list = csr.to_adjacency_list()
+            events = list(dfs_forest_events(adjacency_list, [0], is_directed))
+            discovery, finish = self._timestamps(events)
+            parent = {event.vertex: event.parent for event in events if isinstance(event, Discover)}
+            with self.subTest(is_directed=is_directed):
+                self.assertEqual(sorted(discovery), list(range(200)))
+                # Every time is handed out once, and intervals nest like parentheses
+                self.assertEqual(sorted(list(discovery.values()) + list(finish.values())), list(range(400)))
+                for v, p in parent.items():
+                    if p != -1:
+                        self.assertTrue(discovery[p] < discovery[v] < finish[v] < finish[p])
+                edge_events = [event for event in events if isinstance(event, EdgeEvent)]
+                for event in edge_events:
+                    self.assertIs(type(event), self._expected_type(event.source, event.target, parent, discovery, finish))
+                if is_directed:
+                    self.assertEqual(len(edge_events), csr.n_arcs)
+                else:
+                    # Each undirected edge once, and only tree and back edges
+                    self.assertEqual(len(edge_events), csr.n_arcs // 2)
+                    self.assertTrue(all(type(event) in (TreeEdge, BackEdge) for event in edge_events))
+
+    def test_deep_graph_does_not_recurse(self):
+        n_nodes = 20000
+        adjacency_list = [[v + 1] for v in range(n_nodes - 1)] + [[]]
+        finished = [event.vertex for event in dfs_events(adjacency_list, 0, True) if isinstance(event, Finish)]
+        self.assertEqual(finished, list(range(n_nodes - 1, -1, -1)))
+
+
+class TestBufferedEvents(unittest.TestCase):
+
+    def test_same_events_in_order(self):
+        adjacency_list = random_csr(500, 1500, False, seed=3, simple=True).to_adjacency_list()
+        expected = list(bfs_events(adjacency_list, 0))
+        self.assertEqual(list(buffered_events(bfs_events(adjacency_list, 0), maxsize=2, batch_size=7)), expected)
+
+    def test_channel_round_trip(self):
+        channel = queue.Queue()
+        send_events(range(1000), channel, batch_size=64)
+        self.assertEqual(list(receive_events(channel)), list(range(1000)))
+
+    def test_early_stop_ends_the_producer(self):
+        threads = threading.active_count()
+        events = buffered_events(itertools.count(), maxsize=2, batch_size=4)
+        self.assertEqual([event for _, event in zip(range(10), events)], list(range(10)))
+        events.close()
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_producer_error_reaches_the_consumer(self):
+        def failing_events():
+            yield from range(100)
+            raise KeyError('lost edge')
+
+        # Consume in a thread, so that a hung consumer fails the test instead of blocking it
+        received, errors = [], []
+
+        def consume():
+            try:
+                received.extend(buffered_events(failing_events(), batch_size=8))
+            except KeyError as error:
+                errors.append(error)
+
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        consumer.join(5)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(received, list(range(100)))
+        self.assertEqual(len(errors), 1)
+
+        channel = queue.Queue()
+        send_events(failing_events(), channel, batch_size=8)
+        with self.assertRaises(KeyError):
+            list(receive_events(channel))
+
+
+if __name__ == '__main__':
+    unittest.main()
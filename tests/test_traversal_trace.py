@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from graph import RandomGraph
+from traversal import bfs_events, dfs_forest_events
+from traversal_trace import TraceEdge, TraceReader, TraceWriter
+
+
+def unwrap(event):
+    return event.event if isinstance(event, TraceEdge) else event
+
+
+class TestTraversalTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'traversal.trace')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _round_trip(self, random_graph, events, coordinates=None, block_events=64):
+        with TraceWriter(self.path, random_graph, coordinates, block_events=block_events) as writer:
+            writer.write_all(events)
+        return TraceReader(self.path)
+
+    def test_events_round_trip(self):
+        for is_directed in (False, True):
+            random_graph = RandomGraph(300, 700, is_directed=is_directed)
+            for events in (list(bfs_events(random_graph.get_adjacency_list, 0, is_directed)),
+                           list(dfs_forest_events(random_graph.get_adjacency_list, [0], is_directed))):
+                with self.subTest(is_directed=is_directed), self._round_trip(random_graph, events) as reader:
+                    decoded = list(reader.iter_events())
+                    self.assertEqual([unwrap(event) for event in decoded], events)
+                    self.assertEqual((len(reader), reader.n_nodes, reader.is_directed), (len(events), 300, is_directed))
+                    self.assertEqual(reader.graph_hash, random_graph.get_graph_hash)
+                    self.assertEqual(reader.edges, list(random_graph.get_edges))
+                    # Edge IDs point at the traversed edge
+                    for event in decoded:
+                        if isinstance(event, TraceEdge):
+                            source, target = reader.edges[event.edge_id]
+                            self.assertIn((event.event.source, event.event.target),
+                                          ((source, target),) if is_directed else ((source, target), (target, source)))
+
+    def test_seek_and_sample(self):
+        random_graph = RandomGraph(500, 1500)
+        events = list(bfs_events(random_graph.get_adjacency_list, 0))
+        with self._round_trip(random_graph, events, block_events=50) as reader:
+            self.assertEqual([unwrap(event) for event in reader.iter_events(123, 321)], events[123:321])
+            sampled = [unwrap(event) for event in reader.iter_events(block_step=3)]
+            expected = [event for index, event in enumerate(events) if (index // 50) % 3 == 0]
+            self.assertEqual(sampled, expected)
+
+    def test_coordinates(self):
+        random_graph = RandomGraph(50, 80)
+        coordinates = np.random.default_rng(1).random((50, 3))
+        with self._round_trip(random_graph, bfs_events(random_graph.get_adjacency_list, 0), coordinates) as reader:
+            np.testing.assert_allclose(reader.coordinates, coordinates, rtol=1e-6)
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as other_file:
+            other_file.write(b'\0' * 128)
+        with self.assertRaises(ValueError):
+            TraceReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
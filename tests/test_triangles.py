@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+current_script_path = os.path.dirname(os.path.abspath(__file__))
+root_directory = os.path.abspath(os.path.join(current_script_path, ".."))  # Go up one level
+sys.path.append(root_directory)
+
+import numpy as np
+from triangles import count_triangles, estimate_clustering, undirected_csr
+from graph_fixtures import random_csr
+
+
+def simple_adjacency(csr):
+    adjacency = np.zeros((csr.n_nodes, csr.n_nodes), dtype=np.int64)
+    sources = np.repeat(np.arange(csr.n_nodes), csr.degree())
+    adjacency[sources, csr.indices] = 1
+    adjacency[csr.indices, sources] = 1
+    np.fill_diagonal(adjacency, 0)
+    return adjacency
+
+
+class TestUndirectedCSR(unittest.TestCase):
+
+    def test_simple_graph(self):
+        for is_directed in (False, True):
+            csr = random_csr(50, 300, is_directed, seed=1)
+            with self.subTest(is_directed=is_directed):
+                simple = undirected_csr(csr)
+                self.assertFalse(simple.is_directed)
+                np.testing.assert_array_equal(simple_adjacency(simple), simple_adjacency(csr))
+                np.testing.assert_array_equal(simple.degree(), simple_adjacency(csr).sum(axis=1))
+
+    def test_simple_graph_is_returned_as_is(self):
+        simple = undirected_csr(random_csr(50, 300, False, seed=2))
+        self.assertIs(undirected_csr(simple), simple)
+
+
+class TestCountTriangles(unittest.TestCase):
+
+    def test_matches_trace_of_cube(self):
+        for is_directed in (False, True):
+            csr = random_csr(60, 400, is_directed, seed=3)
+            with self.subTest(is_directed=is_directed):
+                adjacency = simple_adjacency(csr)
+                cube = np.linalg.matrix_power(adjacency, 3)
+                result = count_triangles(csr)
+                self.assertEqual(result.n_triangles, np.trace(cube) // 6)
+                np.testing.assert_array_equal(result.triangles, np.diag(cube) // 2)
+                degree = adjacency.sum(axis=1)
+                wedges = degree * (degree - 1) / 2
+                self.assertAlmostEqual(result.transitivity, np.trace(cube) / 2 / wedges.sum())
+
+    def test_parallel_matches_serial(self):
+        csr = random_csr(200, 1500, False, seed=4)
+        np.testing.assert_array_equal(count_triangles(csr, n_workers=3).triangles, count_triangles(csr).triangles)
+
+    def test_estimate_within_epsilon(self):
+        csr = random_csr(200, 1500, False, seed=5)
+        exact = count_triangles(csr)
+        estimate = estimate_clustering(csr, epsilon=0.02, delta=0.001, seed=6)
+        self.assertLessEqual(abs(estimate.transitivity - exact.transitivity), estimate.epsilon)
+        self.assertLessEqual(abs(estimate.average_clustering - exact.average_clustering), estimate.epsilon)
+
+
+if __name__ == '__main__':
+    unittest.main()
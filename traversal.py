@@ -0,0 +1,395 @@
+import itertools
+import queue
+import threading
+from array import array
+from collections import deque
+
+from bitset import Bitset
+
+
+class TraversalEvent:
+    """
+    Base class for the events yielded by the traversal generators.
+
+    Events are small slot-based records so that a consumer (renderer, logger, early-stop search...) can pull
+    them one by one without the traversal holding any scene state.
+    """
+    __slots__ = ()
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.fields = cls.fields + tuple(cls.__dict__.get('__slots__', ()))
+
+    def astuple(self):
+        return tuple(getattr(self, field) for field in self.fields)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash((type(self),) + self.astuple())
+
+    def __repr__(self):
+        values = ', '.join('{}={}'.format(field, getattr(self, field)) for field in self.fields)
+        return '{}({})'.format(type(self).__name__, values)
+
+    def __reduce__(self):
+        return (type(self), self.astuple())
+
+
+class Discover(TraversalEvent):
+    """
+    A vertex is reached for the first time.
+
+    Attributes:
+    - vertex (int): The discovered vertex.
+    - parent (int): The vertex it was discovered from, -1 for a root.
+    - level (int): Depth of the vertex in the traversal tree.
+    - time (int): DFS discovery timestamp, -1 for traversals that do not keep a clock.
+    """
+    __slots__ = ('vertex', 'parent', 'level', 'time')
+
+    def __init__(self, vertex, parent=-1, level=0, time=-1):
+        self.vertex = vertex
+        self.parent = parent
+        self.level = level
+        self.time = time
+
+
+class Finish(TraversalEvent):
+    """
+    All the neighbours of a vertex have been scanned.
+
+    Attributes:
+    - vertex (int): The finished vertex.
+    - time (int): DFS finish timestamp, -1 for traversals that do not keep a clock.
+    """
+    __slots__ = ('vertex', 'time')
+
+    def __init__(self, vertex, time=-1):
+        self.vertex = vertex
+        self.time = time
+
+
+class EdgeEvent(TraversalEvent):
+    """
+    Base class for the events reporting an edge scan.
+
+    Attributes:
+    - source (int): Vertex being scanned.
+    - target (int): Neighbour reached through the edge.
+    """
+    __slots__ = ('source', 'target')
+
+    def __init__(self, source, target):
+        self.source = source
+        self.target = target
+
+
+class TreeEdge(EdgeEvent):
+    """
+    An edge that discovers its target. Always yielded right before the matching Discover event.
+    """
+    __slots__ = ()
+
+
+class NonTreeEdge(EdgeEvent):
+    """
+    An edge whose target had already been discovered. For undirected graphs every edge is reported once.
+    """
+    __slots__ = ()
+
+
+class BackEdge(NonTreeEdge):
+    """
+    DFS edge to an ancestor of the source that is still being scanned: it closes a cycle.
+    """
+    __slots__ = ()
+
+
+class ForwardEdge(NonTreeEdge):
+    """
+    DFS edge of a directed graph to an already finished descendant of the source.
+    """
+    __slots__ = ()
+
+
+class CrossEdge(NonTreeEdge):
+    """
+    DFS edge of a directed graph to an already finished vertex that is neither an ancestor nor a descendant.
+    """
+    __slots__ = ()
+
+
+class LevelBoundary(TraversalEvent):
+    """
+    Marks the start of a new BFS level: every following Discover event until the next boundary has depth level + 1.
+
+    Attributes:
+    - level (int): Depth of the vertices about to be scanned.
+    - size (int): Number of vertices in that level.
+    """
+    __slots__ = ('level', 'size')
+
+    def __init__(self, level, size):
+        self.level = level
+        self.size = size
+
+
+def _bfs_tree_events(adjacency_list, root, is_directed, discovered, finished):
+    # One BFS tree, sharing its Bitset state with the caller so that forests can resume where a tree stopped.
+    # Frontier entries carry their parent, which is all the undirected non-tree edge test needs.
+    discovered.set(root)
+    yield Discover(root, -1, 0)
+    frontier = deque([(root, -1)])
+    level = 0
+    while frontier:
+        yield LevelBoundary(level, len(frontier))
+        next_frontier = deque()
+        while frontier:
+            v, parent = frontier.popleft()
+            for adj_n in adjacency_list[v]:
+                if not discovered.test_and_set(adj_n):
+                    next_frontier.append((adj_n, v))
+                    yield TreeEdge(v, adj_n)
+                    yield Discover(adj_n, v, level + 1)
+                elif is_directed or (adj_n != parent and not finished.test(adj_n)):
+                    yield NonTreeEdge(v, adj_n)
+            finished.set(v)
+            yield Finish(v)
+        frontier = next_frontier
+        level += 1
+
+
+class _DFSClock:
+    # Timestamps shared by the trees of a DFS forest: discovery time per vertex and the next time to hand out
+    __slots__ = ('discovery', 'time')
+
+    def __init__(self, n_nodes):
+        self.discovery = array('q', [-1]) * n_nodes
+        self.time = 0
+
+
+def _dfs_tree_events(adjacency_list, root, is_directed, discovered, finished, clock=None):
+    # One DFS tree, sharing its Bitset state and clock with the caller so that forests can resume where a tree
+    # stopped. Each vertex is entered once and each adjacency scanned once through its iterator: O(V + E).
+    # Edges to discovered vertices are classified with the CLRS rules: unfinished target -> back edge; finished
+    # target discovered later than the source -> forward edge, earlier -> cross edge (both only exist if directed).
+    if clock is None:
+        clock = _DFSClock(len(adjacency_list))
+    discovery = clock.discovery
+    discovered.set(root)
+    discovery[root] = clock.time
+    yield Discover(root, -1, 0, clock.time)
+    clock.time += 1
+    stack = [(root, -1, iter(adjacency_list[root]))]
+    while stack:
+        v, parent, neighbours = stack[-1]
+        for adj_n in neighbours:
+            if not discovered.test_and_set(adj_n):
+                yield TreeEdge(v, adj_n)
+                discovery[adj_n] = clock.time
+                yield Discover(adj_n, v, len(stack), clock.time)
+                clock.time += 1
+                stack.append((adj_n, v, iter(adjacency_list[adj_n])))
+                break
+            if not finished.test(adj_n):
+                if is_directed or adj_n != parent:
+                    yield BackEdge(v, adj_n)
+            elif is_directed:
+                yield ForwardEdge(v, adj_n) if discovery[adj_n] > discovery[v] else CrossEdge(v, adj_n)
+        else:
+            stack.pop()
+            finished.set(v)
+            yield Finish(v, clock.time)
+            clock.time += 1
+
+
+def _forest_events(tree_events, adjacency_list, roots, is_directed, *state):
+    n_nodes = len(adjacency_list)
+    discovered, finished = Bitset(n_nodes), Bitset(n_nodes)
+    # Vertices a directed tree could not reach from the component roots get their own trees afterwards
+    for root in itertools.chain(map(int, roots), range(n_nodes)):
+        if not discovered.test(root):
+            yield from tree_events(adjacency_list, root, is_directed, discovered, finished, *state)
+
+
+def bfs_events(adjacency_list, root, is_directed=False):
+    """
+    Lazily run a breadth-first search, yielding one event per step.
+
+    Parameters:
+    - adjacency_list (list of lists): Adjacency list of the graph, indexed by vertex.
+    - root (int): Vertex the search starts from.
+    - is_directed (bool): False to report every undirected non-tree edge once instead of twice.
+
+    Returns:
+    - generator: LevelBoundary, Discover, TreeEdge, NonTreeEdge and Finish events in BFS order.
+    """
+    n_nodes = len(adjacency_list)
+    return _bfs_tree_events(adjacency_list, root, is_directed, Bitset(n_nodes), Bitset(n_nodes))
+
+
+def dfs_events(adjacency_list, root, is_directed=False):
+    """
+    Lazily run a depth-first search, yielding one event per step.
+
+    The search keeps an explicit stack of neighbour iterators instead of recursing, so every vertex is entered once,
+    every edge is scanned once (O(V + E)) and deep graphs do not hit the interpreter recursion limit.
+
+    Discover and Finish events carry discovery and finish timestamps from a single clock, and every non-tree edge
+    is classified: BackEdge, or for directed graphs also ForwardEdge and CrossEdge. Undirected graphs only have
+    tree and back edges.
+
+    Parameters:
+    - adjacency_list (list of lists): Adjacency list of the graph, indexed by vertex.
+    - root (int): Vertex the search starts from.
+    - is_directed (bool): False to report every undirected non-tree edge once instead of twice.
+
+    Returns:
+    - generator: Discover, TreeEdge, BackEdge, ForwardEdge, CrossEdge and Finish events in DFS order.
+    """
+    n_nodes = len(adjacency_list)
+    return _dfs_tree_events(adjacency_list, root, is_directed, Bitset(n_nodes), Bitset(n_nodes))
+
+
+def bfs_forest_events(adjacency_list, roots, is_directed=False):
+    """
+    Run a breadth-first search over every component, one tree per root, in a single linear pass.
+
+    Parameters:
+    - adjacency_list (list of lists): Adjacency list of the graph, indexed by vertex.
+    - roots (iterable of int): One vertex per component, e.g. UnionFind.roots(), or SCCResult.source_roots() for
+      directed graphs. Every vertex left undiscovered after these trees (possible in directed graphs) starts a
+      tree of its own.
+    - is_directed (bool): False to report every undirected non-tree edge once instead of twice.
+
+    Returns:
+    - generator: The events of every tree, each starting with the Discover event of its root (parent -1).
+    """
+    return _forest_events(_bfs_tree_events, adjacency_list, roots, is_directed)
+
+
+def dfs_forest_events(adjacency_list, roots, is_directed=False):
+    """
+    Run a depth-first search over every component, one tree per root, in a single linear pass.
+
+    Parameters:
+    - adjacency_list (list of lists): Adjacency list of the graph, indexed by vertex.
+    - roots (iterable of int): One vertex per component, e.g. UnionFind.roots(), or SCCResult.source_roots() for
+      directed graphs. Every vertex left undiscovered after these trees (possible in directed graphs) starts a
+      tree of its own.
+    - is_directed (bool): False to report every undirected non-tree edge once instead of twice.
+
+    Returns:
+    - generator: The events of every tree, each starting with the Discover event of its root (parent -1). DFS
+      timestamps keep running from one tree to the next, so cross edges between trees are classified too.
+    """
+    return _forest_events(_dfs_tree_events, adjacency_list, roots, is_directed, _DFSClock(len(adjacency_list)))
+
+
+def find_vertex(events, target):
+    """
+    Consume events until the target vertex is discovered, stopping the traversal early.
+
+    Parameters:
+    - events (iterable): Events produced by bfs_events or dfs_events.
+    - target (int): Vertex to look for.
+
+    Returns:
+    - Discover or None: The Discover event of the target, None if the traversal never reaches it.
+    """
+    for event in events:
+        if isinstance(event, Discover) and event.vertex == target:
+            return event
+    return None
+
+
+_END_OF_STREAM = None
+
+
+def send_events(events, channel, batch_size=256, stop=None):
+    """
+    Push events into a bounded channel, e.g. a multiprocessing.Queue(maxsize=...) read by another process.
+
+    Events are sent in batches to amortize pickling; put() blocks while the channel is full, so the producer
+    never runs more than maxsize batches ahead of the consumer. The stream always ends with an end-of-stream
+    message, which carries the exception raised by events, if any, so that receive_events re-raises it.
+
+    Parameters:
+    - events (iterable): Events to send.
+    - channel (queue-like): Any object with a blocking put(), such as queue.Queue or multiprocessing.Queue.
+    - batch_size (int): Number of events per message.
+    - stop (Event): Optional threading.Event or multiprocessing.Event. Once set, sending stops at the next batch,
+      without an end-of-stream message.
+    """
+    batch = []
+    error = None
+    try:
+        for event in events:
+            batch.append(event)
+            if len(batch) >= batch_size:
+                if stop is not None and stop.is_set():
+                    return
+                channel.put(batch)
+                batch = []
+    except Exception as exception:
+        error = exception
+    finally:
+        if stop is None or not stop.is_set():
+            if batch:
+                channel.put(batch)
+            # Batches are lists, so a tuple marks the end of the stream whatever the events are
+            channel.put((_END_OF_STREAM, error))
+
+
+def receive_events(channel):
+    """
+    Yield the events sent through a channel by send_events until the stream ends.
+
+    Parameters:
+    - channel (queue-like): The channel given to send_events.
+
+    Returns:
+    - generator: The events, in the order they were sent. Raises the producer's exception, if it failed, after
+      the events sent before the failure.
+    """
+    while True:
+        batch = channel.get()
+        if isinstance(batch, tuple):
+            _, error = batch
+            if error is not None:
+                raise error
+            return
+        yield from batch
+
+
+def buffered_events(events, maxsize=1024, batch_size=256):
+    """
+    Run a traversal ahead of its consumer in a background thread with a bounded buffer.
+
+    Parameters:
+    - events (iterable): Events to prefetch.
+    - maxsize (int): Maximum number of batches held in the buffer.
+    - batch_size (int): Number of events per batch.
+
+    Returns:
+    - generator: The same events, in order.
+    """
+    channel = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    producer = threading.Thread(target=send_events, args=(events, channel, batch_size, stop), daemon=True)
+    producer.start()
+    try:
+        yield from receive_events(channel)
+    finally:
+        # The consumer may stop early (break, exception, close()): tell the producer, and drain the buffer so that
+        # a put() blocked on a full channel returns and the producer can see the stop flag and exit
+        stop.set()
+        while producer.is_alive():
+            try:
+                channel.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        producer.join()
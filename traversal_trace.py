@@ -0,0 +1,358 @@
+import bisect
+import struct
+
+import numpy as np
+
+from traversal import BackEdge, CrossEdge, Discover, Finish, ForwardEdge, LevelBoundary, NonTreeEdge, TreeEdge
+
+# File layout (little endian):
+#   header   magic, version, flags, graph hash (sha1), n_nodes, n_edges, n_events, index offset
+#   graph    optional: varint byte length + zigzag-delta varint edge list, then float32 (n_nodes, 3) coordinates
+#   blocks   per block: u32 event count, u32 payload length, payload. Delta state restarts in every block.
+#   index    u64 block count, then (u64 offset, u64 first event index) per block
+_MAGIC = b'BFDT'
+_VERSION = 2
+_HEADER = struct.Struct('<4sHH20sQQQQ')
+_BLOCK_HEADER = struct.Struct('<II')
+_INDEX_ENTRY = struct.Struct('<QQ')
+
+FLAG_GRAPH = 1
+FLAG_COORDINATES = 2
+FLAG_DIRECTED = 4
+
+DISCOVER_ROOT = 1
+DISCOVER = 2
+FINISH = 3
+TREE_EDGE = 4
+NON_TREE_EDGE = 5
+LEVEL_BOUNDARY = 6
+BACK_EDGE = 7
+FORWARD_EDGE = 8
+CROSS_EDGE = 9
+
+_EDGE_CODES = {TreeEdge: TREE_EDGE, NonTreeEdge: NON_TREE_EDGE, BackEdge: BACK_EDGE, ForwardEdge: FORWARD_EDGE, CrossEdge: CROSS_EDGE}
+_EDGE_TYPES = {code: event_type for event_type, code in _EDGE_CODES.items()}
+
+
+def _write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_signed(buffer, value):
+    _write_varint(buffer, (value << 1) if value >= 0 else ((-value) << 1) - 1)
+
+
+def _read_varint(data, position):
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def _read_signed(data, position):
+    value, position = _read_varint(data, position)
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1), position
+
+
+class TraceEdge:
+    """
+    Edge event read back from a trace, with the edge ID resolved when the trace was written.
+
+    Attributes:
+    - event (EdgeEvent): The traversal event.
+    - edge_id (int): Position of the edge in RandomGraph.get_edges, -1 if unknown.
+    """
+    __slots__ = ('event', 'edge_id')
+
+    def __init__(self, event, edge_id):
+        self.event = event
+        self.edge_id = edge_id
+
+
+class TraceWriter:
+    """
+    Writes traversal events to a compact, seekable binary trace.
+
+    Vertex and edge IDs are zigzag varints relative to the previous ID in the same block, so traversals that
+    move between nearby IDs take one or two bytes per field. Events are grouped in blocks listed in a trailing
+    index, so readers can seek to or sample blocks without decoding the whole file.
+
+    Parameters:
+    - path (str): Output file.
+    - random_graph (RandomGraph): The traversed graph; its hash goes into the header.
+    - coordinates (array-like): Optional (n_nodes, 3) vertex positions to embed, e.g. Graph3D.node_coordinates.
+    - include_graph (bool): True to embed the edge list so the trace can be replayed without the original graph.
+    - block_events (int): Number of events per block.
+
+    Example Usage:
+    ```python
+    with TraceWriter('bfs.trace', random_graph, coordinates) as writer:
+        writer.write_all(bfs_events(random_graph.get_adjacency_list, 0))
+    ```
+    """
+
+    def __init__(self, path, random_graph, coordinates=None, include_graph=True, block_events=4096):
+        self.file = open(path, 'wb')
+        self.block_events = block_events
+        self.n_events = 0
+        self.index = []
+        self._find_edge = random_graph.find_edge
+
+        flags = FLAG_DIRECTED if random_graph.is_directed else 0
+        flags |= FLAG_GRAPH if include_graph else 0
+        flags |= FLAG_COORDINATES if coordinates is not None else 0
+        self._header = [_MAGIC, _VERSION, flags, bytes.fromhex(random_graph.get_graph_hash),
+                        random_graph.n_nodes, len(random_graph.get_edges)]
+        self.file.write(_HEADER.pack(*self._header, 0, 0))
+
+        if include_graph:
+            section = bytearray()
+            previous = 0
+            for source, target in random_graph.get_edges:
+                _write_signed(section, source - previous)
+                _write_signed(section, target - source)
+                previous = source
+            length = bytearray()
+            _write_varint(length, len(section))
+            self.file.write(bytes(length) + bytes(section))
+        if coordinates is not None:
+            self.file.write(np.asarray(coordinates, dtype='<f4').reshape(-1, 3).tobytes())
+        self._start_block()
+
+    def _start_block(self):
+        self._block = bytearray()
+        self._block_count = 0
+        self._previous_vertex = 0
+        self._previous_edge = 0
+        self._previous_time = -1
+
+    def _flush_block(self):
+        if self._block_count == 0:
+            return
+        self.index.append((self.file.tell(), self.n_events - self._block_count))
+        self.file.write(_BLOCK_HEADER.pack(self._block_count, len(self._block)))
+        self.file.write(self._block)
+        self._start_block()
+
+    def _write_vertex(self, vertex):
+        _write_signed(self._block, vertex - self._previous_vertex)
+        self._previous_vertex = vertex
+
+    def _write_time(self, time):
+        # DFS timestamps grow by one per Discover/Finish, so their deltas take a single byte
+        _write_signed(self._block, time - self._previous_time)
+        self._previous_time = time
+
+    def write(self, event):
+        """
+        Append one event.
+
+        Parameters:
+        - event (TraversalEvent): Event from bfs_events, dfs_events or their forest variants.
+        """
+        block = self._block
+        if isinstance(event, Discover):
+            block.append(DISCOVER_ROOT if event.parent == -1 else DISCOVER)
+            self._write_vertex(event.vertex)
+            if event.parent != -1:
+                _write_signed(block, event.parent - event.vertex)
+            _write_varint(block, event.level)
+            self._write_time(event.time)
+        elif isinstance(event, Finish):
+            block.append(FINISH)
+            self._write_vertex(event.vertex)
+            self._write_time(event.time)
+        elif type(event) in _EDGE_CODES:
+            block.append(_EDGE_CODES[type(event)])
+            self._write_vertex(event.source)
+            _write_signed(block, event.target - event.source)
+            edge_id = self._find_edge(event.source, event.target)
+            edge_id = -1 if edge_id is None else edge_id
+            _write_signed(block, edge_id - self._previous_edge)
+            self._previous_edge = edge_id
+        elif isinstance(event, LevelBoundary):
+            block.append(LEVEL_BOUNDARY)
+            _write_varint(block, event.level)
+            _write_varint(block, event.size)
+        else:
+            raise TypeError("Cannot trace event {!r}".format(event))
+        self._block_count += 1
+        self.n_events += 1
+        if self._block_count >= self.block_events:
+            self._flush_block()
+
+    def write_all(self, events):
+        """
+        Append every event of an iterable.
+
+        Parameters:
+        - events (iterable): The events.
+        """
+        for event in events:
+            self.write(event)
+
+    def close(self):
+        """
+        Flush the last block, write the index and patch the header.
+        """
+        if self.file.closed:
+            return
+        self._flush_block()
+        index_offset = self.file.tell()
+        self.file.write(struct.pack('<Q', len(self.index)))
+        for entry in self.index:
+            self.file.write(_INDEX_ENTRY.pack(*entry))
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(*self._header, self.n_events, index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TraceReader:
+    """
+    Reads a trace written by TraceWriter, decoding blocks lazily.
+
+    Parameters:
+    - path (str): The trace file.
+
+    Attributes:
+    - graph_hash (str): Hex digest of the traced graph, as RandomGraph.get_graph_hash.
+    - n_nodes (int): Number of vertices of the traced graph.
+    - n_edges (int): Number of edges of the traced graph.
+    - n_events (int): Number of events in the trace.
+    - is_directed (bool): True if the traced graph is directed.
+    - edges (list or None): Embedded edge list, aligned with the edge IDs of the trace.
+    - coordinates (np.ndarray or None): Embedded (n_nodes, 3) vertex positions.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        magic, version, flags, graph_hash, self.n_nodes, self.n_edges, self.n_events, index_offset = \
+            _HEADER.unpack(self.file.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            self.file.close()
+            raise ValueError("{} is not a version {} traversal trace".format(path, _VERSION))
+        self.graph_hash = graph_hash.hex()
+        self.is_directed = bool(flags & FLAG_DIRECTED)
+
+        self.edges = None
+        if flags & FLAG_GRAPH:
+            length_bytes = self.file.read(10)
+            length, used = _read_varint(length_bytes, 0)
+            self.file.seek(_HEADER.size + used)
+            section = self.file.read(length)
+            self.edges = []
+            position = previous = 0
+            for _ in range(self.n_edges):
+                delta, position = _read_signed(section, position)
+                offset, position = _read_signed(section, position)
+                previous += delta
+                self.edges.append((previous, previous + offset))
+        self.coordinates = None
+        if flags & FLAG_COORDINATES:
+            self.coordinates = np.frombuffer(self.file.read(self.n_nodes * 12), dtype='<f4').reshape(-1, 3)
+
+        self.file.seek(index_offset)
+        n_blocks, = struct.unpack('<Q', self.file.read(8))
+        self.index = [_INDEX_ENTRY.unpack(self.file.read(_INDEX_ENTRY.size)) for _ in range(n_blocks)]
+        self._first_events = [first for _, first in self.index]
+
+    def __len__(self):
+        return self.n_events
+
+    def __repr__(self):
+        return "TraceReader(nodes={}, edges={}, events={}, blocks={})".format(self.n_nodes, self.n_edges, self.n_events, len(self.index))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read_block(self, block):
+        """
+        Decode one block.
+
+        Parameters:
+        - block (int): Block number, 0..len(index)-1.
+
+        Returns:
+        - list: Its events; edge events are wrapped in TraceEdge to carry their edge ID.
+        """
+        offset, _ = self.index[block]
+        self.file.seek(offset)
+        count, length = _BLOCK_HEADER.unpack(self.file.read(_BLOCK_HEADER.size))
+        data = self.file.read(length)
+        events = []
+        position = vertex = edge_id = 0
+        time = -1
+        for _ in range(count):
+            code = data[position]
+            position += 1
+            if code == LEVEL_BOUNDARY:
+                level, position = _read_varint(data, position)
+                size, position = _read_varint(data, position)
+                events.append(LevelBoundary(level, size))
+                continue
+            delta, position = _read_signed(data, position)
+            vertex += delta
+            if code == DISCOVER_ROOT or code == DISCOVER:
+                parent = -1
+                if code == DISCOVER:
+                    offset, position = _read_signed(data, position)
+                    parent = vertex + offset
+                level, position = _read_varint(data, position)
+                delta, position = _read_signed(data, position)
+                time += delta
+                events.append(Discover(vertex, parent, level, time))
+            elif code == FINISH:
+                delta, position = _read_signed(data, position)
+                time += delta
+                events.append(Finish(vertex, time))
+            elif code in _EDGE_TYPES:
+                offset, position = _read_signed(data, position)
+                delta, position = _read_signed(data, position)
+                edge_id += delta
+                events.append(TraceEdge(_EDGE_TYPES[code](vertex, vertex + offset), edge_id))
+            else:
+                raise ValueError("Corrupted trace: unknown event code {} in block {}".format(code, block))
+        return events
+
+    def iter_events(self, start=0, stop=None, block_step=1):
+        """
+        Iterate over the events, seeking straight to the block holding start.
+
+        Parameters:
+        - start (int): Index of the first event.
+        - stop (int): Index after the last event, None for the end of the trace.
+        - block_step (int): Decode one block out of every block_step, to sample huge traces.
+
+        Returns:
+        - generator: Events; edge events are wrapped in TraceEdge to carry their edge ID.
+        """
+        stop = self.n_events if stop is None else min(stop, self.n_events)
+        first_block = max(bisect.bisect_right(self._first_events, start) - 1, 0)
+        for block in range(first_block, len(self.index), block_step):
+            first = self._first_events[block]
+            if first >= stop:
+                return
+            for index, event in enumerate(self.read_block(block), first):
+                if index >= stop:
+                    return
+                if index >= start:
+                    yield event
@@ -0,0 +1,207 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from csr import CSRGraph
+
+
+class ClusteringResult:
+    """
+    Triangle counts and clustering coefficients of a graph, treating directed edges as undirected.
+
+    Attributes:
+    - triangles (np.ndarray): Number of triangles through each vertex.
+    - local (np.ndarray): Local clustering coefficient of each vertex, 0 for degree below 2.
+    - average_clustering (float): Mean of the local coefficients, as returned by snap.GetClustCf.
+    - transitivity (float): Global coefficient, 3 * triangles / connected triples.
+    - n_triangles (int): Number of triangles in the graph.
+    """
+    __slots__ = ('triangles', 'local', 'average_clustering', 'transitivity', 'n_triangles')
+
+    def __init__(self, triangles, degree):
+        wedges = degree * (degree - 1) / 2
+        self.triangles = triangles
+        self.local = np.divide(triangles, wedges, out=np.zeros(len(triangles)), where=wedges > 0)
+        self.average_clustering = float(self.local.mean()) if len(triangles) > 0 else 0.0
+        self.n_triangles = int(triangles.sum()) // 3
+        self.transitivity = float(triangles.sum() / wedges.sum()) if wedges.sum() > 0 else 0.0
+
+    def __repr__(self):
+        return "ClusteringResult(triangles={}, average_clustering={:.4f}, transitivity={:.4f})".format(
+            self.n_triangles, self.average_clustering, self.transitivity)
+
+
+def undirected_csr(csr) -> CSRGraph:
+    """
+    Get the undirected simple graph underlying a CSR, merging reciprocal directed edges and parallel edges, and
+    dropping self-loops.
+
+    Parameters:
+    - csr (CSRGraph): The graph.
+
+    Returns:
+    - CSRGraph: The undirected simple graph, csr itself if it is already one.
+    """
+    sources = np.repeat(np.arange(csr.n_nodes), csr.degree())
+    if not csr.is_directed:
+        # Neighbour ranges are sorted, so a parallel edge repeats a target next to itself within a range
+        repeated = (csr.indices[1:] == csr.indices[:-1]) & (sources[1:] == sources[:-1])
+        if not repeated.any() and not (sources == csr.indices).any():
+            return csr
+    pairs = np.unique(np.sort(np.column_stack([sources, csr.indices]), axis=1), axis=0)
+    return CSRGraph.from_edge_array(pairs[pairs[:, 0] != pairs[:, 1]], csr.n_nodes, False)
+
+
+def degree_oriented_csr(csr) -> CSRGraph:
+    """
+    Orient every undirected edge from its lower-ranked to its higher-ranked end, ranking by (degree, ID).
+
+    Each vertex keeps at most O(sqrt(E)) out-neighbours, and every triangle is found exactly once, from its
+    lowest-ranked vertex.
+
+    Parameters:
+    - csr (CSRGraph): An undirected graph.
+
+    Returns:
+    - CSRGraph: The oriented graph, with sorted neighbour ranges.
+    """
+    degree = csr.degree()
+    rank = np.empty(csr.n_nodes, dtype=np.int64)
+    rank[np.lexsort((np.arange(csr.n_nodes), degree))] = np.arange(csr.n_nodes)
+    sources = np.repeat(np.arange(csr.n_nodes), degree)
+    forward = rank[sources] < rank[csr.indices]
+    return CSRGraph.from_edge_array(np.column_stack([sources[forward], csr.indices[forward]]), csr.n_nodes, True)
+
+
+_worker_csr = None
+
+
+def _init_worker(indptr, indices):
+    global _worker_csr
+    _worker_csr = CSRGraph(indptr, indices, True)
+
+
+def _count_range(oriented, start, stop):
+    # Triangles (u, v, w) with u in [start, stop): w must be an out-neighbour of both u and v = out-neighbour of u
+    triangles = np.zeros(oriented.n_nodes, dtype=np.int64)
+    for u in range(start, stop):
+        neighbours = oriented.neighbors(u)
+        if len(neighbours) < 2:
+            continue
+        middles, ends = oriented.gather(neighbours)
+        position = np.minimum(np.searchsorted(neighbours, ends), len(neighbours) - 1)
+        closed = neighbours[position] == ends
+        if closed.any():
+            triangles[u] += closed.sum()
+            np.add.at(triangles, middles[closed], 1)
+            np.add.at(triangles, ends[closed], 1)
+    return triangles
+
+
+def _count_range_in_worker(bounds):
+    return _count_range(_worker_csr, *bounds)
+
+
+def count_triangles(csr, n_workers=1) -> ClusteringResult:
+    """
+    Count the triangles through every vertex with degree-ordered orientation and sorted-neighbour intersections.
+
+    Parameters:
+    - csr (CSRGraph): The graph; directed graphs are treated as undirected.
+    - n_workers (int): Number of worker processes, each counting a contiguous vertex range of similar arc count.
+      1 counts in the current process, None uses every core.
+
+    Returns:
+    - ClusteringResult: Per-vertex triangles, local and global coefficients.
+    """
+    csr = undirected_csr(csr)
+    oriented = degree_oriented_csr(csr)
+    n_workers = n_workers or os.cpu_count()
+    if n_workers <= 1 or csr.n_nodes < 2 * n_workers:
+        return ClusteringResult(_count_range(oriented, 0, oriented.n_nodes), csr.degree())
+
+    # Split on the cumulative number of oriented arcs so that every range has a similar amount of work
+    cuts = np.searchsorted(oriented.indptr, np.linspace(0, oriented.n_arcs, n_workers + 1)).tolist()
+    cuts[0], cuts[-1] = 0, oriented.n_nodes
+    ranges = [(start, stop) for start, stop in zip(cuts[:-1], cuts[1:]) if stop > start]
+    with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=(oriented.indptr, oriented.indices)) as pool:
+        triangles = sum(pool.map(_count_range_in_worker, ranges))
+    return ClusteringResult(triangles, csr.degree())
+
+
+class ClusteringEstimate:
+    """
+    Wedge-sampling estimate of the clustering coefficients.
+
+    Attributes:
+    - average_clustering (float): Estimated mean local clustering coefficient.
+    - transitivity (float): Estimated global coefficient.
+    - epsilon (float): Additive error bound of both estimates.
+    - delta (float): Probability that an estimate falls outside the error bound.
+    - n_samples (int): Number of wedges sampled for each estimate.
+    """
+    __slots__ = ('average_clustering', 'transitivity', 'epsilon', 'delta', 'n_samples')
+
+    def __init__(self, average_clustering, transitivity, epsilon, delta, n_samples):
+        self.average_clustering = average_clustering
+        self.transitivity = transitivity
+        self.epsilon = epsilon
+        self.delta = delta
+        self.n_samples = n_samples
+
+    def __repr__(self):
+        return "ClusteringEstimate(average_clustering={:.4f}, transitivity={:.4f}, epsilon={}, delta={})".format(
+            self.average_clustering, self.transitivity, self.epsilon, self.delta)
+
+
+def _closed_fraction(csr, arc_keys, centers, rng):
+    # Pick two distinct random neighbours of each center and check whether they are adjacent
+    degree = csr.degree()[centers]
+    first = rng.integers(0, degree)
+    second = rng.integers(0, degree - 1)
+    second += second >= first
+    a = csr.indices[csr.indptr[centers] + first]
+    b = csr.indices[csr.indptr[centers] + second]
+    keys = a * csr.n_nodes + b
+    position = np.minimum(np.searchsorted(arc_keys, keys), len(arc_keys) - 1)
+    return arc_keys[position] == keys
+
+
+def estimate_clustering(csr, epsilon=0.01, delta=0.01, seed=None) -> ClusteringEstimate:
+    """
+    Estimate the clustering coefficients by sampling wedges (paths of length two) and checking if they close.
+
+    Both estimates are means of [0, 1] samples, so by Hoeffding's inequality ceil(ln(2 / delta) / (2 * epsilon^2))
+    samples keep each within epsilon of the exact value with probability at least 1 - delta, whatever the graph
+    size.
+
+    Parameters:
+    - csr (CSRGraph): The graph; directed graphs are treated as undirected.
+    - epsilon (float): Additive error bound.
+    - delta (float): Allowed failure probability.
+    - seed (int): Seed of the random generator, for reproducible estimates.
+
+    Returns:
+    - ClusteringEstimate: Estimated average clustering and transitivity.
+    """
+    csr = undirected_csr(csr)
+    rng = np.random.default_rng(seed)
+    n_samples = math.ceil(math.log(2 / delta) / (2 * epsilon ** 2))
+    degree = csr.degree()
+    wedges = degree * (degree - 1) / 2
+    if csr.n_nodes == 0 or wedges.sum() == 0:
+        return ClusteringEstimate(0.0, 0.0, epsilon, delta, 0)
+    # CSR arcs are sorted by (source, target), so source * n + target is a sorted key array for adjacency tests
+    arc_keys = np.repeat(np.arange(csr.n_nodes), degree) * csr.n_nodes + csr.indices
+
+    # Transitivity: wedges sampled uniformly, i.e. centers drawn proportionally to their wedge count
+    centers = rng.choice(csr.n_nodes, size=n_samples, p=wedges / wedges.sum())
+    transitivity = float(_closed_fraction(csr, arc_keys, centers, rng).mean())
+
+    # Average clustering: vertices drawn uniformly, those of degree below 2 contribute 0
+    centers = rng.integers(0, csr.n_nodes, size=n_samples)
+    centers = centers[degree[centers] >= 2]
+    closed = _closed_fraction(csr, arc_keys, centers, rng).sum() if len(centers) > 0 else 0
+    return ClusteringEstimate(float(closed / n_samples), transitivity, epsilon, delta, n_samples)